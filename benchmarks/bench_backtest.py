@@ -0,0 +1,77 @@
+"""
+Time the batched backtest against replaying StockPredictor one day at a time.
+
+Synthetic tickers (benchmarks/synthetic.py) are backtested with the BMW.DE
+model. The one-day-at-a-time replay fits a StockPredictor on each day's history
+and calls get_last_actual_and_predictions / recommend, which is what a naive
+backtest would do; it is timed on a sample of days and extrapolated. Run from
+the repository root:
+
+    python benchmarks/bench_backtest.py [n_tickers] [years]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import synthetic
+from utils.backtest import recommend_codes, score
+from utils.batch_inference import window_forecasts
+from utils.forecast_cache import ForecastCache
+from utils.lstm_predictor import StockPredictor
+from utils.model_registry import ModelRegistry
+
+MODEL_PATH = 'utils/models/lstm_model_BMW.DE.h5'
+SAMPLE_DAYS = 20
+
+
+def main(n_tickers, years):
+    df = synthetic.generate(n_tickers, years)
+    registry = ModelRegistry(backend='numpy')
+    model = registry.get(MODEL_PATH)
+
+    start = time.perf_counter()
+    for _, ticker_df in df.groupby('Ticker'):
+        closes = ticker_df['Close'].to_numpy(dtype=np.float64)
+        origins, forecasts = window_forecasts(model, closes)
+        for risk_profile in ('high', 'low'):
+            codes = recommend_codes(closes[origins], forecasts[:, 0], forecasts[:, 1], risk_profile)
+            score(ticker_df['Date'].to_numpy()[origins], closes[origins], codes)
+    batched = time.perf_counter() - start
+    days = len(origins)
+
+    # One StockPredictor per day, on a sample of days of the first ticker
+    ticker_df = df[df['Ticker'] == df['Ticker'].iloc[0]]
+    sample = np.linspace(50, len(ticker_df) - 1, SAMPLE_DAYS).astype(int)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ForecastCache(os.path.join(tmp, 'memo'))
+        # A bare copy of the .h5 file, so each day's predictor fits its scaler on that day's history
+        model_path = shutil.copy(MODEL_PATH, tmp)
+        start = time.perf_counter()
+        for day in sample:
+            predictor = StockPredictor(model_path, ticker_df.iloc[:day + 1], registry=registry, cache=cache)
+            last_actual, predictions = predictor.get_last_actual_and_predictions()
+            for risk_profile in ('high', 'low'):
+                predictor.recommend(risk_profile, last_actual, predictions)
+        per_day = (time.perf_counter() - start) / SAMPLE_DAYS
+
+        # The batched forecasts are what the replay would have produced
+        origins, forecasts = window_forecasts(model, ticker_df['Close'].to_numpy(dtype=np.float64))
+        replay = StockPredictor(model_path, ticker_df.iloc[:sample[-1] + 1], registry=registry, cache=cache)
+        assert np.allclose(forecasts[sample[-1] - 49], replay.get_last_actual_and_predictions()[1])
+
+    replay_total = per_day * days * n_tickers
+    print(f"{n_tickers} tickers x {years} years ({days} signal days each)")
+    print(f"batched backtest:        {batched:10.1f} s")
+    print(f"day-by-day (estimated):  {replay_total:10.1f} s  ({per_day * 1000:.1f} ms per day)")
+    print(f"speedup:                 {replay_total / batched:10.0f}x")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [20, 10][len(args):]))
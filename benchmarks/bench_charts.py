@@ -0,0 +1,60 @@
+"""
+Measure chart payload size and build time with and without downsampling.
+
+"Before" draws every daily point as the pages used to (px.line / go.Scatter);
+"after" uses plot_functions.line_chart. The payload is the figure JSON that
+Streamlit sends to the browser, and the time covers building and serializing
+the figure, which is the server-side part of rendering. Run from the
+repository root:
+
+    python benchmarks/bench_charts.py
+"""
+import os
+import statistics
+import sys
+import time
+
+import plotly.express as px
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import synthetic
+from utils.plot_functions import line_chart
+
+REPEAT = 5
+CASES = [  # (name, tickers, years)
+    ('1 ticker, 5 years', 1, 5),
+    ('1 ticker, 20 years', 1, 20),
+    ('10 tickers, 20 years', 10, 20),
+]
+
+
+def full_resolution(df):
+    return px.line(df, x='Date', y='Close', color='Ticker')
+
+
+def downsampled(df):
+    return line_chart({ticker: group for ticker, group in df.groupby('Ticker')}, "Close")
+
+
+def measure(build, df):
+    times, payload = [], None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        payload = build(df).to_json()
+        times.append(time.perf_counter() - start)
+    return len(payload), statistics.median(times)
+
+
+def main():
+    print(f"{'case':<22}{'points':>8}{'before (KB)':>13}{'after (KB)':>12}{'before (ms)':>13}{'after (ms)':>12}")
+    for name, n_tickers, years in CASES:
+        df = synthetic.generate(n_tickers, years)[['Ticker', 'Date', 'Close']]
+        before_bytes, before_time = measure(full_resolution, df)
+        after_bytes, after_time = measure(downsampled, df)
+        print(f"{name:<22}{len(df):>8}{before_bytes / 1024:>13.0f}{after_bytes / 1024:>12.0f}"
+              f"{before_time * 1000:>13.1f}{after_time * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Per-process memory of the price table: decoded from Parquet vs. the memory-mapped compact copy.
+
+A synthetic price store (benchmarks/synthetic.py, with the processed date
+columns) is written to a temporary directory. Several processes then load the
+full table at the same time, the way Streamlit sessions in separate server
+processes or the backtest workers do, and report their resident set size (RSS)
+before and after loading, and their proportional set size (PSS, which splits
+shared pages between the processes that map them). Linux only. Run from the
+repository root:
+
+    python benchmarks/bench_compact_prices.py [n_tickers] [years] [processes]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def memory_mb():
+    """Current RSS and PSS of this process in MB, from /proc."""
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:'):
+                values[parts[0][:-1]] = int(parts[1]) / 1024
+    return values['Rss'], values['Pss']
+
+
+def child(mode, root):
+    """Load the table, touch every column, then wait for the parent before measuring."""
+    import numpy as np
+
+    from utils import compact_prices
+    from utils.price_index import PriceIndex
+    from utils.price_store import PriceStore
+
+    store = PriceStore(root)
+    before, _ = memory_mb()
+    df = compact_prices.load(store) if mode == 'compact' else store.read()
+    for name in df.columns:
+        column = df[name]
+        values = column.cat.codes.to_numpy() if hasattr(column, 'cat') else column.to_numpy()
+        if values.dtype.kind in 'iuf':
+            np.add.reduce(values, dtype=np.float64)
+    PriceIndex(df)
+    print('ready', flush=True)
+    sys.stdin.readline()
+    after, pss = memory_mb()
+    print(before, after, pss, flush=True)
+
+
+def main(n_tickers, years, processes):
+    from benchmarks import synthetic
+    from utils import compact_prices
+    from utils.price_store import PriceStore
+    from utils.share_price_processor import SharePriceProcessor
+
+    with tempfile.TemporaryDirectory() as tmp:
+        df = synthetic.generate(n_tickers, years).drop(columns=['Dividend'])
+        SharePriceProcessor().extract_date_features(df)
+        store = PriceStore(os.path.join(tmp, 'processed'))
+        store.write(df)
+        compact_prices.load(store)
+        print(f"{n_tickers} tickers x {years} years ({len(df)} rows), {processes} processes at once")
+        print(f"{'table':<9}{'RSS before (MB)':>17}{'RSS after (MB)':>16}{'RSS added (MB)':>16}{'PSS (MB)':>10}")
+
+        for mode in ('parquet', 'compact'):
+            children = [subprocess.Popen([sys.executable, __file__, '--child', mode, store.root],
+                                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                        for _ in range(processes)]
+            if not all(proc.stdout.readline().strip() == 'ready' for proc in children):
+                for proc in children:
+                    proc.kill()
+                sys.exit(f"A {mode} process failed to load the table (out of memory?). Try fewer tickers or processes.")
+            results = [proc.communicate('\n')[0].split() for proc in children]
+            before, after, pss = (sum(float(r[i]) for r in results) / processes for i in range(3))
+            print(f"{mode:<9}{before:>17.0f}{after:>16.0f}{after - before:>16.0f}{pss:>10.0f}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--child']:
+        child(sys.argv[2], sys.argv[3])
+    else:
+        args = [int(arg) for arg in sys.argv[1:]]
+        main(*(args + [200, 20, 4][len(args):]))
@@ -0,0 +1,42 @@
+"""
+Time window-recompute and incremental multi-day forecasts for every saved model.
+
+For each horizon this prints the latency of both modes. That the two agree is
+checked by tests/test_incremental_forecast.py. Run from the repository root:
+
+    python benchmarks/bench_incremental_forecast.py
+"""
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import data_access
+from utils.lstm_predictor import StockPredictor
+
+HORIZONS = [2, 30, 60, 90]
+
+
+def main():
+    print(f"{'ticker':<10}{'days':>6}{'recompute (ms)':>16}{'incremental (ms)':>18}")
+    for model_path in sorted(glob.glob('utils/models/lstm_model_*.h5')):
+        ticker = os.path.basename(model_path)[len('lstm_model_'):-len('.h5')]
+        predictor = StockPredictor(model_path, data_access.prices_for(ticker))
+        predictor.predict_multiple_days_incremental(1)  # build the decoder outside the timings
+
+        for days in HORIZONS:
+            start = time.perf_counter()
+            predictor.predict_multiple_days(days)
+            recompute_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            predictor.predict_multiple_days(days, incremental=True)
+            incremental_time = time.perf_counter() - start
+
+            print(f"{ticker:<10}{days:>6}{recompute_time * 1000:>16.1f}{incremental_time * 1000:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
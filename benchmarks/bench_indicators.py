@@ -0,0 +1,73 @@
+"""
+Time the batch and streaming indicator computations.
+
+Synthetic tickers (benchmarks/synthetic.py) get their indicators computed three
+ways: per ticker with pandas groupby (what recomputing the full history looks
+like), in one batch over all tickers, and by streaming one new day of every
+ticker from the batch state before it. tests/test_indicators.py checks that
+streaming and batch agree. Run from the repository root:
+
+    python benchmarks/bench_indicators.py [n_tickers] [years]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import synthetic
+from utils.indicators import compute_indicators
+
+
+def pandas_indicators(df):
+    """SMA, EMA, RSI, Bollinger, ATR and volume average with one pandas groupby per indicator."""
+    grouped = df.groupby('Ticker')
+    close = grouped['Close']
+    out = pd.DataFrame({'SMA_20': close.transform(lambda s: s.rolling(20).mean()),
+                        'SMA_50': close.transform(lambda s: s.rolling(50).mean()),
+                        'EMA_12': close.transform(lambda s: s.ewm(span=12, adjust=False).mean()),
+                        'EMA_26': close.transform(lambda s: s.ewm(span=26, adjust=False).mean())})
+    std = close.transform(lambda s: s.rolling(20).std())
+    out['BB_Upper'] = out['SMA_20'] + 2 * std
+    out['BB_Lower'] = out['SMA_20'] - 2 * std
+    change = close.diff()
+    gain = change.clip(lower=0).groupby(df['Ticker']).transform(lambda s: s.ewm(alpha=1 / 14, adjust=False).mean())
+    loss = (-change).clip(lower=0).groupby(df['Ticker']).transform(lambda s: s.ewm(alpha=1 / 14, adjust=False).mean())
+    out['RSI_14'] = 100 - 100 / (1 + gain / loss)
+    previous = close.shift()
+    true_range = np.maximum(df['High'] - df['Low'],
+                            np.maximum((df['High'] - previous).abs(), (df['Low'] - previous).abs()))
+    out['ATR_14'] = true_range.groupby(df['Ticker']).transform(lambda s: s.ewm(alpha=1 / 14, adjust=False).mean())
+    out['Volume_SMA_20'] = grouped['Volume'].transform(lambda s: s.rolling(20).mean())
+    return out
+
+
+def main(n_tickers, years):
+    df = synthetic.generate(n_tickers, years)
+
+    start = time.perf_counter()
+    pandas_indicators(df)
+    groupby_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compute_indicators(df)
+    batch_time = time.perf_counter() - start
+
+    last_day = df['Date'] == df['Date'].max()
+    _, streaming = compute_indicators(df[~last_day], with_state=True)
+    start = time.perf_counter()
+    streaming.update_frame(df[last_day])
+    stream_time = time.perf_counter() - start
+
+    print(f"{n_tickers} tickers x {years} years ({len(df)} rows)")
+    print(f"pandas groupby per indicator: {groupby_time:8.2f} s")
+    print(f"batch, all tickers at once:   {batch_time:8.2f} s")
+    print(f"streaming one new day:        {stream_time:8.4f} s ({stream_time / n_tickers * 1e6:.1f} us per ticker)")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [200, 10][len(args):]))
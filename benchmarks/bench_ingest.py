@@ -0,0 +1,84 @@
+"""
+Measure peak memory of the in-memory SimFin ingest against the streaming ingest.
+
+A SimFin-format share price file is synthesized by replicating the raw share
+prices under renamed tickers. Each ingest runs in its own interpreter and
+reports its peak RSS (Linux/macOS only). Run from the repository root:
+
+    python benchmarks/bench_ingest.py [scale ...]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+RAW_PATH = 'utils/data/raw/de_share_prices_data_RAW.csv'
+COMPANIES_PATH = 'utils/data/raw/de_companies_data_RAW.csv'
+SIMFIN_COLUMNS = ['Ticker', 'SimFinId', 'Date', 'Open', 'High', 'Low', 'Close', 'Adj. Close',
+                  'Volume', 'Dividend', 'Shares Outstanding']
+
+
+def write_simfin_file(path, scale):
+    """Write the raw prices `scale` times, in SimFin's semicolon format, one copy at a time."""
+    import pandas as pd
+    raw = pd.read_csv(RAW_PATH)[SIMFIN_COLUMNS]
+    for i in range(scale):
+        copy = raw.copy()
+        copy['Ticker'] = copy['Ticker'] + (f'_{i}' if i else '')
+        copy.to_csv(path, sep=';', index=False, header=(i == 0), mode='w' if i == 0 else 'a')
+    return len(raw) * scale
+
+
+def company_lookup(scale):
+    import pandas as pd
+    companies = pd.read_csv(COMPANIES_PATH)
+    names = {}
+    for i in range(scale):
+        suffix = f'_{i}' if i else ''
+        names.update({ticker + suffix: name for ticker, name in zip(companies['Ticker'], companies['Company Name'])})
+    return names
+
+
+def ingest_in_memory(prices_path, scale, output_dir):
+    """What SimFinAPI.get_share_prices + process_and_save_data do: load everything, merge, write one file."""
+    import pandas as pd
+    prices = pd.read_csv(prices_path, sep=';', parse_dates=['Date'])
+    companies = pd.DataFrame(list(company_lookup(scale).items()), columns=['Ticker', 'Company Name'])
+    updated_prices = prices.merge(companies, on='Ticker', how='left')
+    updated_prices.to_csv(os.path.join(output_dir, 'share_prices.csv'), index=False)
+
+
+def ingest_streaming(prices_path, scale, output_dir):
+    from utils.apiclass2 import stream_share_prices
+    stream_share_prices(prices_path, company_lookup(scale), os.path.join(output_dir, 'share_prices'))
+
+
+CASES = {'in-memory': ingest_in_memory, 'streaming': ingest_streaming}
+
+
+def main(scales):
+    print(f"{'scale':>6}{'rows':>12}{'path':>12}{'time (s)':>10}{'peak RSS (MB)':>15}")
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            prices_path = os.path.join(tmp, 'de-shareprices-daily.csv')
+            rows = write_simfin_file(prices_path, scale)
+            for name in CASES:
+                out = subprocess.run(
+                    [sys.executable, __file__, '--case', name, prices_path, str(scale), tmp],
+                    capture_output=True, text=True, check=True,
+                ).stdout.split()
+                elapsed, peak_mb = float(out[-2]), float(out[-1])
+                print(f"{scale:>6}{rows:>12}{name:>12}{elapsed:>10.1f}{peak_mb:>15.0f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 6 and sys.argv[1] == '--case':
+        start = time.perf_counter()
+        CASES[sys.argv[2]](sys.argv[3], int(sys.argv[4]), sys.argv[5])
+        print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [1, 10, 100])
@@ -0,0 +1,60 @@
+"""
+Cost of a timing span, and of sampling a thread's stack while it works.
+
+An empty block is timed bare, inside a span and inside a disabled span, and a
+NumPy loop is timed with and without the SamplingProfiler running. Run from
+the repository root:
+
+    python benchmarks/bench_instrumentation.py [n_spans]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import instrumentation
+
+
+def per_call_us(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def empty():
+    pass
+
+
+def in_span():
+    with instrumentation.span('bench.empty', ticker='BMW.DE'):
+        pass
+
+
+def work():
+    values = np.arange(20000, dtype=np.float64)
+    for _ in range(200):
+        np.sqrt(values).sum()
+
+
+def main(n_spans):
+    instrumentation.metrics.reset()
+    bare = per_call_us(empty, n_spans)
+    spanned = per_call_us(in_span, n_spans)
+    instrumentation.ENABLED = False
+    disabled = per_call_us(in_span, n_spans)
+    instrumentation.ENABLED = True
+    print(f"{n_spans} spans: bare {bare:.2f} us, span {spanned:.2f} us, disabled span {disabled:.2f} us per call")
+
+    plain = min(per_call_us(work, 1) for _ in range(5))
+    with instrumentation.SamplingProfiler() as profiler:
+        profiled = min(per_call_us(work, 1) for _ in range(5))
+    print(f"work: {plain / 1000:.1f} ms plain, {profiled / 1000:.1f} ms while sampled "
+          f"({profiler.samples} samples, {100 * (profiled / plain - 1):+.1f}%)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
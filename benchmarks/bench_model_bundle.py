@@ -0,0 +1,80 @@
+"""
+Compare StockPredictor on the .npz model bundles with the .h5 files alone.
+
+For every model, a predictor on a copy of the bare .h5 file (NumPy backend,
+scaler refitted on the full history) and one on the bundle are built from the
+same prices. The forecasts must match; the cold load of the model file and the
+per-request construction of the predictor are timed. Exits non-zero if the
+forecasts differ. Run from the repository root:
+
+    python benchmarks/bench_model_bundle.py
+"""
+import glob
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import data_access
+from utils.forecast_cache import ForecastCache
+from utils.forecast_job import ticker_from_model_path
+from utils.lstm_predictor import StockPredictor
+from utils.model_bundle import bundle_path_for
+from utils.model_registry import ModelRegistry
+
+TOLERANCE = 1e-9
+REPEAT = 20
+
+
+def median_time(fn):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    failed = False
+    print(f"{'ticker':<10}{'cold load h5 (ms)':>19}{'cold load npz (ms)':>20}"
+          f"{'predictor h5 (ms)':>19}{'predictor npz (ms)':>20}{'max diff':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ForecastCache(os.path.join(tmp, 'memo'))
+        for model_path in sorted(glob.glob('utils/models/lstm_model_*.h5')):
+            bundle_path = bundle_path_for(model_path)
+            if not os.path.exists(bundle_path):
+                print(f"{model_path}: no bundle, run python -m utils.model_bundle first")
+                failed = True
+                continue
+            bare_path = shutil.copy(model_path, tmp)
+            # The exact closes, which the bundles' scalers are fitted on
+            prices = data_access.exact_prices_for(ticker_from_model_path(model_path), columns=['Close'])
+
+            h5_load = median_time(lambda: ModelRegistry()._load(bare_path, 'numpy'))
+            npz_load = median_time(lambda: ModelRegistry()._load(bundle_path, 'numpy'))
+
+            registry = ModelRegistry(backend='numpy')
+            h5_init = median_time(lambda: StockPredictor(bare_path, prices, registry=registry, cache=cache))
+            npz_init = median_time(lambda: StockPredictor(model_path, prices, registry=registry, cache=cache))
+
+            legacy = StockPredictor(bare_path, prices, registry=registry, cache=cache)
+            bundled = StockPredictor(model_path, prices, registry=registry, cache=cache)
+            diff = np.max(np.abs(np.array(legacy.predict_multiple_days(2))
+                                 - np.array(bundled.predict_multiple_days(2))))
+            failed |= diff > TOLERANCE
+            print(f"{ticker_from_model_path(model_path):<10}{h5_load * 1000:>19.2f}{npz_load * 1000:>20.2f}"
+                  f"{h5_init * 1000:>19.3f}{npz_init * 1000:>20.3f}{diff:>10.1e}")
+    if failed:
+        print("Bundle forecasts differ from the .h5 forecasts.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
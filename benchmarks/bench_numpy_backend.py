@@ -0,0 +1,97 @@
+"""
+Compare the cost of the NumPy inference backend and Keras for every saved model.
+
+Each backend loads every model and serves a 2-day forecast in its own
+interpreter, which reports the import + load time, the per-forecast latency,
+the peak RSS (Linux/macOS only) and the resident memory per loaded model
+relative to its weights (Linux only), which ModelRegistry.RESIDENT_FACTORS
+holds. That both backends predict the same is
+checked by tests/test_numpy_backend.py. Run from the repository root:
+
+    python benchmarks/bench_numpy_backend.py
+"""
+import glob
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+MODEL_PATHS = sorted(glob.glob('utils/models/lstm_model_*.h5'))
+
+
+def ticker_of(model_path):
+    return os.path.basename(model_path)[len('lstm_model_'):-len('.h5')]
+
+
+def current_rss():
+    """Resident set size of this process in bytes (Linux only, None elsewhere)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return None
+
+
+def resident_factor(backend, copies=10):
+    """
+    Resident memory per loaded model relative to its weight bytes, as ModelRegistry estimates it.
+
+    One model is loaded first, so the one-off import and setup cost of the
+    backend is not counted, then every model is loaded `copies` more times.
+    """
+    from utils.model_bundle import bundle_path_for
+    from utils.model_registry import ModelRegistry
+
+    # What the pool loads for each backend: the .h5 for Keras, the bundle for NumPy
+    paths = MODEL_PATHS if backend == 'keras' else [bundle_path_for(path) for path in MODEL_PATHS]
+    kept = [ModelRegistry._load(paths[0], backend)]
+    before = current_rss()
+    if before is None:
+        return float('nan')
+    kept += [ModelRegistry._load(path, backend) for _ in range(copies) for path in paths]
+    weights = sum(ModelRegistry._weight_bytes(model) for model in kept[1:])
+    return (current_rss() - before) / weights
+
+
+def serve(backend):
+    """Load every model with one backend and time 2-day forecasts. Runs in a fresh interpreter."""
+    start = time.perf_counter()
+    from utils import data_access
+    from utils.lstm_predictor import StockPredictor
+
+    predictors = [StockPredictor(path, data_access.prices_for(ticker_of(path)), backend=backend)
+                  for path in MODEL_PATHS]
+    load_time = time.perf_counter() - start
+    factor = resident_factor(backend)
+
+    latencies = []
+    for predictor in predictors:
+        for _ in range(5):
+            t = time.perf_counter()
+            predictor.predict_multiple_days(2)
+            latencies.append(time.perf_counter() - t)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(load_time, np.median(latencies), peak_mb, factor, 'tensorflow' in sys.modules)
+
+
+def main():
+    print(f"{'backend':<8}{'import + load (s)':>19}{'2-day forecast (ms)':>21}{'peak RSS (MB)':>15}"
+          f"{'RSS / weights':>15}{'imports TF':>12}")
+    for backend in ('keras', 'numpy'):
+        out = subprocess.run([sys.executable, __file__, '--serve', backend],
+                             capture_output=True, text=True, check=True).stdout.split()
+        load_time, latency, peak_mb, factor, imports_tf = (float(out[-5]), float(out[-4]), float(out[-3]),
+                                                           float(out[-2]), out[-1])
+        print(f"{backend:<8}{load_time:>19.2f}{latency * 1000:>21.2f}{peak_mb:>15.0f}{factor:>15.1f}{imports_tf:>12}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == '--serve':
+        serve(sys.argv[2])
+    else:
+        main()
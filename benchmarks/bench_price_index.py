@@ -0,0 +1,80 @@
+"""
+Time one-ticker lookups with a boolean mask against the PriceIndex slice index.
+
+For each table size, a ticker is selected and filtered to its last month of
+prices both ways, on synthetic data with a growing number of tickers. The mask
+cost grows with the table; the index lookup should stay flat, and so should a
+`data_access.prices_for` call on a written price store, which also checks
+whether the store changed. Run from the repository root:
+
+    python benchmarks/bench_price_index.py [n_tickers ...]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import synthetic
+from utils import data_access
+from utils.price_index import PriceIndex
+from utils.price_store import PriceStore
+
+YEARS = 5
+REPEAT = 50
+
+
+def median_time(fn):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def mask_lookup(df, name):
+    company_df = df[df['Company Name'] == name].sort_values('Date')
+    cutoff = company_df['Date'].max() - pd.Timedelta(days=30)
+    return company_df[company_df['Date'] >= cutoff]
+
+
+def index_lookup(index, name):
+    return index.last(index.ticker_for(name), pd.Timedelta(days=30))
+
+
+def main(sizes):
+    print(f"{'tickers':>8}{'rows':>11}{'index build (ms)':>18}{'mask (ms)':>11}{'index (us)':>12}"
+          f"{'prices_for (us)':>17}")
+    for n_tickers in sizes:
+        df = synthetic.generate(n_tickers, YEARS)
+        name = df['Company Name'].iloc[len(df) // 2]
+
+        start = time.perf_counter()
+        index = PriceIndex(df)
+        build_time = time.perf_counter() - start
+
+        assert index_lookup(index, name).equals(mask_lookup(df, name))
+        mask_time = median_time(lambda: mask_lookup(df, name))
+        index_time = median_time(lambda: index_lookup(index, name))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = PriceStore(os.path.join(tmp, 'processed'))
+            store.write(df)
+            data_access.set_price_store(store)
+            ticker = index.ticker_for(name)
+            cutoff = df['Date'].max() - pd.Timedelta(days=30)
+            data_access.prices_for(ticker, start=cutoff)  # load the table and index once
+            access_time = median_time(lambda: data_access.prices_for(ticker, start=cutoff))
+            data_access.set_price_store(PriceStore())
+
+        print(f"{n_tickers:>8}{len(df):>11}{build_time * 1000:>18.1f}{mask_time * 1000:>11.2f}"
+              f"{index_time * 1e6:>12.1f}{access_time * 1e6:>17.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000])
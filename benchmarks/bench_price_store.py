@@ -0,0 +1,76 @@
+"""
+Compare loading share prices from the processed CSV against the columnar price store.
+
+"Cold" is the first load in a fresh interpreter, "warm" is the median of the
+following loads in the same interpreter. Run from the repository root:
+
+    python benchmarks/bench_price_store.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+CSV_PATH = 'utils/data/processed/de_share_prices_processed.csv'
+TICKERS = ['BMW.DE', 'MBG.DE', 'VOW.DE']
+REPEATS = 5
+
+
+def load_csv():
+    import pandas as pd
+    df = pd.read_csv(CSV_PATH)
+    df['Date'] = pd.to_datetime(df['Date'])
+    return df[df['Ticker'].isin(TICKERS)][['Ticker', 'Date', 'Close']]
+
+
+def load_store():
+    from utils.price_store import PriceStore
+    return PriceStore().read(columns=['Close'], tickers=TICKERS)
+
+
+CASES = {'csv': load_csv, 'store': load_store}
+
+
+def time_case(name):
+    """Return (cold, warm) load times in seconds for one case, run in this process."""
+    load = CASES[name]
+    start = time.perf_counter()
+    load()
+    cold = time.perf_counter() - start
+
+    warm = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        load()
+        warm.append(time.perf_counter() - start)
+    return cold, statistics.median(warm)
+
+
+def main():
+    if not os.path.exists(CSV_PATH):
+        print(f"{CSV_PATH} not found. Run `python -m utils.share_price_processor` first.")
+        return
+
+    from utils.price_store import PriceStore
+    if not PriceStore().exists():
+        PriceStore.from_csv(CSV_PATH)
+
+    print(f"{'path':<8}{'cold (ms)':>12}{'warm (ms)':>12}")
+    for name in CASES:
+        # Each case runs in its own interpreter so the cold number includes imports and first file access.
+        out = subprocess.run(
+            [sys.executable, __file__, '--case', name],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        cold, warm = float(out[0]), float(out[1])
+        print(f"{name:<8}{cold * 1000:>12.1f}{warm * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == '--case':
+        print(*time_case(sys.argv[2]))
+    else:
+        main()
@@ -0,0 +1,110 @@
+"""
+Time SharePriceProcessor.transform_data against the previous per-ticker loop.
+
+The raw share prices are replicated under renamed tickers to reach 10x and 100x
+the current row count. tests/test_transform.py checks that both give identical
+output. Run from the repository root:
+
+    python benchmarks/bench_transform.py [scale ...]
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.share_price_processor import SharePriceProcessor
+
+RAW_PATH = 'utils/data/raw/de_share_prices_data_RAW.csv'
+
+
+def legacy_transform(processor):
+    """The per-ticker transform that SharePriceProcessor.transform_data replaced."""
+    processor.fill_missing_values()
+    processor.extract_date_features(processor.raw_prices)
+    rolling_window = 5
+
+    def categorize_change(change, percentile_25, percentile_50, percentile_75):
+        if change >= percentile_75:
+            return 'High Rise'
+        elif percentile_50 <= change < percentile_75:
+            return 'Low Rise'
+        elif -0.5 <= change <= 0.5:
+            return 'Stay'
+        elif percentile_25 <= change < percentile_50:
+            return 'Low Fall'
+        else:
+            return 'High Fall'
+
+    processed_data = []
+    for ticker, group in processor.raw_prices.groupby('Ticker'):
+        group = group.sort_values(by="Date")
+        group['Price_Change'] = group['Close'].pct_change() * 100
+        group['25th_Percentile'] = group['Price_Change'].rolling(window=rolling_window).quantile(0.25)
+        group['50th_Percentile'] = group['Price_Change'].rolling(window=rolling_window).quantile(0.50)
+        group['75th_Percentile'] = group['Price_Change'].rolling(window=rolling_window).quantile(0.75)
+        group['Category'] = group.apply(
+            lambda row: categorize_change(
+                row['Price_Change'], row['25th_Percentile'], row['50th_Percentile'], row['75th_Percentile']
+            ),
+            axis=1
+        )
+        processed_data.append(group)
+    processor.raw_prices = pd.concat(processed_data, ignore_index=True)
+
+
+def legacy_mode_shares(processor):
+    """The per-group mode that SharePriceProcessor.calculate_mode_shares replaced."""
+    processor.mode_shares = (
+        processor.raw_prices.groupby(['Ticker', 'Year', 'Month'])['Shares Outstanding']
+        .apply(lambda x: x.mode().iloc[0] if not x.mode().empty else None)
+    )
+
+
+def scaled_raw(raw, scale):
+    """Replicate the raw data `scale` times under distinct ticker names."""
+    copies = []
+    for i in range(scale):
+        copy = raw.copy()
+        copy['Ticker'] = copy['Ticker'] + (f'_{i}' if i else '')
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def prepared_processor(raw):
+    processor = SharePriceProcessor()
+    processor.raw_prices = raw.copy()
+    processor.extract_date_features(processor.raw_prices)
+    processor.drop_columns()
+    return processor
+
+
+def run(processor, mode_fn, transform_fn):
+    start = time.perf_counter()
+    mode_fn(processor)
+    processor.fill_missing_values()
+    transform_fn(processor)
+    return time.perf_counter() - start
+
+
+def main(scales):
+    raw = pd.read_csv(RAW_PATH, parse_dates=['Date'])
+    print(f"{'scale':>6}{'rows':>12}{'loop (s)':>12}{'vectorized (s)':>16}{'speedup':>10}")
+    for scale in scales:
+        data = scaled_raw(raw, scale)
+
+        legacy = prepared_processor(data)
+        legacy_time = run(legacy, legacy_mode_shares, legacy_transform)
+
+        vectorized = prepared_processor(data)
+        vectorized_time = run(vectorized, SharePriceProcessor.calculate_mode_shares,
+                              SharePriceProcessor.transform_data)
+
+        print(f"{scale:>6}{len(data):>12}{legacy_time:>12.2f}{vectorized_time:>16.2f}"
+              f"{legacy_time / vectorized_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 10, 100])
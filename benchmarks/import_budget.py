@@ -0,0 +1,85 @@
+"""
+Import-time budget for the Streamlit pages.
+
+For every page script, runs the page's top-level imports in a fresh interpreter
+and reports the cold-start import time. A page fails the budget if its imports
+take longer than --budget seconds or pull in a heavy dependency (TensorFlow,
+scikit-learn, simfin) that should only load on first use. Run from the
+repository root:
+
+    python benchmarks/import_budget.py --budget 2.0
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HEAVY_MODULES = ['tensorflow', 'keras', 'sklearn', 'simfin']
+
+# Executed in the child interpreter: time each import statement, then report what got loaded
+PROBE = """
+import json, sys, time
+statements = json.loads(sys.argv[1])
+heavy = json.loads(sys.argv[2])
+timings, missing = {}, []
+start = time.perf_counter()
+for statement in statements:
+    t = time.perf_counter()
+    try:
+        exec(statement, {})
+    except ImportError as e:
+        missing.append(e.name or statement)
+    timings[statement] = time.perf_counter() - t
+total = time.perf_counter() - start
+print(json.dumps({'total_s': total, 'timings': timings, 'missing': missing,
+                  'heavy': [m for m in heavy if m in sys.modules]}))
+"""
+
+
+def top_level_imports(path):
+    """Return the source of the module-level import statements of a script."""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    tree = ast.parse(source)
+    return [ast.get_source_segment(source, node) for node in tree.body
+            if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def measure(path):
+    """Run a page's imports in a fresh interpreter and return the probe's report."""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE, json.dumps(top_level_imports(path)), json.dumps(HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+        env={**os.environ, 'PYTHONPATH': ROOT},
+    )
+    return json.loads(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the cold-start import time of each page.")
+    parser.add_argument('--budget', type=float, default=2.0, help="seconds allowed per page")
+    parser.add_argument('--verbose', action='store_true', help="show the time of every import")
+    args = parser.parse_args()
+
+    pages = [os.path.join(ROOT, 'Home.py')] + sorted(glob.glob(os.path.join(ROOT, 'pages', '*.py')))
+    failed = False
+    for path in pages:
+        report = measure(path)
+        over = report['total_s'] > args.budget
+        ok = not over and not report['heavy']
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {os.path.relpath(path, ROOT):<36}{report['total_s'] * 1000:>9.1f} ms"
+              + (f"  heavy: {', '.join(report['heavy'])}" if report['heavy'] else "")
+              + (f"  not installed: {', '.join(report['missing'])}" if report['missing'] else ""))
+        if args.verbose:
+            for statement, seconds in sorted(report['timings'].items(), key=lambda kv: -kv[1]):
+                print(f"       {seconds * 1000:>9.1f} ms  {statement}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+End-to-end benchmark suite on synthetic market data.
+
+Times raw/processed loading (CSV and price store), ticker filtering,
+SharePriceProcessor, StockPredictor model loading and prediction, and sector
+aggregation. Results are written to benchmarks/results/<commit>-<tickers>x<years>y.json
+so runs from different commits can be compared. Run from the repository root:
+
+    python benchmarks/run_suite.py --tickers 500 --years 20
+    python benchmarks/run_suite.py --compare benchmarks/results/A.json benchmarks/results/B.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import synthetic
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+MODEL_PATH = 'utils/models/lstm_model_BMW.DE.h5'
+
+
+def timed(fn, repeat=1):
+    """Run fn `repeat` times and return (median seconds, last result)."""
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def sector_aggregation(sector_df, n_days=5):
+    """The former per-sector pages' 'Total Market Movement' (summed Close) for a 'Last N Days' filter."""
+    sector_df = sector_df.groupby('Ticker').apply(lambda x: x.tail(n_days)).reset_index(drop=True)
+    latest_dates = sector_df.groupby('Ticker')['Date'].max().reset_index()
+    latest_vals = pd.merge(sector_df, latest_dates, on=['Ticker', 'Date'], how='inner')
+    prev_vals = sector_df.groupby('Ticker').first().reset_index()
+    return (latest_vals['Close'].sum() - prev_vals['Close'].sum()) / prev_vals['Close'].sum() * 100
+
+
+def run(n_tickers, years, seed, with_models=True):
+    from utils import data_access
+    from utils.price_store import PriceStore
+    from utils.share_price_processor import SharePriceProcessor
+    from utils.sector_index import compute_sector_indices
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = os.path.join(tmp, 'raw.csv')
+        results['generate_raw_csv'], rows = timed(lambda: synthetic.write_csv(raw_path, n_tickers, years, seed))
+        print(f"Generated {rows} rows for {n_tickers} tickers x {years} years")
+
+        # Preprocessing
+        store = PriceStore(os.path.join(tmp, 'processed'))
+        processor = SharePriceProcessor(raw_path, store)
+        results['processor_load_raw_csv'], _ = timed(processor.load_data)
+        processor.extract_date_features(processor.raw_prices)
+        processor.drop_columns()
+        results['processor_mode_shares'], _ = timed(processor.calculate_mode_shares)
+        processor.fill_missing_values()
+        results['processor_transform'], _ = timed(processor.transform_data)
+        csv_path = os.path.join(tmp, 'processed.csv')
+        results['processor_save'], _ = timed(lambda: processor.save_data(csv_path))
+
+        # Loading the processed data
+        tickers = synthetic.ticker_names(n_tickers)[:3]
+
+        def load_csv():
+            df = pd.read_csv(csv_path)
+            df['Date'] = pd.to_datetime(df['Date'])
+            return df
+        results['load_processed_csv'], full = timed(load_csv)
+        results['load_store_all'], _ = timed(store.read)
+        results['load_store_projected_3_tickers'], _ = timed(
+            lambda: store.read(columns=['Close'], tickers=tickers), repeat=3)
+
+        # Ticker filtering on an in-memory table
+        results['filter_mask_one_ticker'], _ = timed(
+            lambda: full[full['Ticker'] == tickers[0]].sort_values('Date'), repeat=5)
+        data_access.set_price_store(store)
+        data_access.prices()
+        results['filter_data_access_one_ticker'], _ = timed(lambda: data_access.prices_for(tickers[0]), repeat=5)
+
+        # Sector aggregation over 10 tickers
+        sector_df = full[full['Ticker'].isin(synthetic.ticker_names(n_tickers)[:10])]
+        results['sector_aggregation_10_tickers'], _ = timed(lambda: sector_aggregation(sector_df), repeat=5)
+        # Market-cap-weighted indices of every sector in one pass
+        companies = synthetic.companies(n_tickers)
+        results['sector_indices_all_sectors'], _ = timed(lambda: compute_sector_indices(full, companies), repeat=3)
+
+        # StockPredictor
+        if with_models and os.path.exists(MODEL_PATH):
+            from utils.lstm_predictor import StockPredictor
+            from utils.model_registry import ModelRegistry
+
+            ticker_df = data_access.prices_for(tickers[0])
+            registry = ModelRegistry()
+            results['predictor_init_cold'], predictor = timed(
+                lambda: StockPredictor(MODEL_PATH, ticker_df, registry=registry))
+            results['predictor_init_warm'], _ = timed(
+                lambda: StockPredictor(MODEL_PATH, ticker_df, registry=registry), repeat=3)
+            results['predict_2_days'], _ = timed(lambda: predictor.predict_multiple_days(2), repeat=3)
+            results['predict_2_days_incremental'], _ = timed(
+                lambda: predictor.predict_multiple_days(2, incremental=True), repeat=3)
+
+        data_access.set_price_store(PriceStore())
+    return results
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{'benchmark':<36}{old['commit']:>12}{new['commit']:>12}{'change':>10}")
+    for name, new_time in new['timings'].items():
+        old_time = old['timings'].get(name)
+        if old_time is None:
+            print(f"{name:<36}{'-':>12}{new_time:>12.4f}{'':>10}")
+            continue
+        change = (new_time - old_time) / old_time * 100 if old_time else 0.0
+        print(f"{name:<36}{old_time:>12.4f}{new_time:>12.4f}{change:>+9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite on synthetic data.")
+    parser.add_argument('--tickers', type=int, default=100)
+    parser.add_argument('--years', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-models', action='store_true', help="skip the StockPredictor benchmarks")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    timings = run(args.tickers, args.years, args.seed, with_models=not args.no_models)
+    result = {
+        'commit': git_commit(),
+        'created': pd.Timestamp.now().isoformat(),
+        'params': {'tickers': args.tickers, 'years': args.years, 'seed': args.seed},
+        'timings': timings,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{result['commit']}-{args.tickers}x{args.years}y.json")
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=2)
+
+    for name, seconds in timings.items():
+        print(f"{name:<36}{seconds * 1000:>12.1f} ms")
+    print(f"Results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Deterministic synthetic share prices in the schema of de_share_prices_data_RAW.csv.
+
+Prices follow a geometric random walk per ticker over business days. The same
+(n_tickers, years, seed) always gives the same data, and tickers are generated
+in chunks so thousands of tickers x 20 years never sit in memory at once.
+"""
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['Ticker', 'Date', 'SimFinId', 'Open', 'High', 'Low', 'Close', 'Adj. Close',
+           'Volume', 'Dividend', 'Shares Outstanding', 'Company Name']
+
+
+def ticker_names(n_tickers):
+    """Return synthetic ticker symbols, e.g. 'SYN0001.DE'."""
+    return [f"SYN{i:04d}.DE" for i in range(n_tickers)]
+
+
+def generate_chunks(n_tickers=100, years=20, seed=0, end_date='2024-12-31', chunk_tickers=100):
+    """
+    Yield the synthetic share prices a chunk of tickers at a time.
+
+    Args:
+        n_tickers (int): Number of tickers.
+        years (int): Length of every ticker's history.
+        seed (int): Random seed.
+        end_date (str): Last trading day.
+        chunk_tickers (int): Tickers per yielded DataFrame.
+
+    Yields:
+        pd.DataFrame: Rows sorted by Ticker and Date, with the raw CSV columns.
+    """
+    dates = pd.bdate_range(end=end_date, periods=int(years * 261))
+    n_days = len(dates)
+    names = ticker_names(n_tickers)
+
+    for first in range(0, n_tickers, chunk_tickers):
+        tickers = names[first:first + chunk_tickers]
+        # One generator per chunk, so a chunk does not depend on the chunk size before it
+        rng = np.random.default_rng([seed, first])
+        n = len(tickers)
+
+        start_price = rng.uniform(10, 300, size=(n, 1))
+        drift = rng.normal(0.0002, 0.0003, size=(n, 1))
+        volatility = rng.uniform(0.01, 0.03, size=(n, 1))
+        returns = drift + volatility * rng.standard_normal((n, n_days))
+        close = start_price * np.exp(np.cumsum(returns, axis=1))
+
+        open_ = close * np.exp(volatility * 0.3 * rng.standard_normal((n, n_days)))
+        spread = np.abs(volatility * rng.standard_normal((n, n_days))) * close
+        high = np.maximum(open_, close) + spread * 0.5
+        low = np.minimum(open_, close) - spread * 0.5
+        volume = rng.lognormal(13, 0.5, size=(n, n_days)).astype(np.int64)
+        shares = np.repeat(rng.integers(50_000_000, 2_000_000_000, size=(n, 1)), n_days, axis=1).astype(float)
+
+        dividend = np.full((n, n_days), np.nan)
+        dividend[:, ::261] = np.round(close[:, ::261] * 0.02, 2)
+
+        yield pd.DataFrame({
+            'Ticker': np.repeat(tickers, n_days),
+            'Date': np.tile(dates.values, n),
+            'SimFinId': np.repeat(np.arange(first, first + n) + 900_000, n_days),
+            'Open': np.round(open_, 2).ravel(),
+            'High': np.round(high, 2).ravel(),
+            'Low': np.round(low, 2).ravel(),
+            'Close': np.round(close, 2).ravel(),
+            'Adj. Close': np.round(close * 0.9, 2).ravel(),
+            'Volume': volume.ravel(),
+            'Dividend': dividend.ravel(),
+            'Shares Outstanding': shares.ravel(),
+            'Company Name': np.repeat([f"Synthetic Company {t[3:7]}" for t in tickers], n_days),
+        }, columns=COLUMNS)
+
+
+def companies(n_tickers=100):
+    """Return a company table for the synthetic tickers, spread evenly over the 12 SimFin sectors."""
+    tickers = ticker_names(n_tickers)
+    return pd.DataFrame({
+        'Ticker': tickers,
+        'SimFinId': np.arange(n_tickers) + 900_000,
+        'Company Name': [f"Synthetic Company {t[3:7]}" for t in tickers],
+        'IndustryId': (100 + np.arange(n_tickers) % 12) * 1000 + 1,
+    })
+
+
+def generate(n_tickers=100, years=20, seed=0, end_date='2024-12-31'):
+    """Return all synthetic share prices in one DataFrame."""
+    return pd.concat(generate_chunks(n_tickers, years, seed, end_date), ignore_index=True)
+
+
+def write_csv(path, n_tickers=100, years=20, seed=0, end_date='2024-12-31'):
+    """
+    Write the synthetic share prices to a raw-format CSV, one chunk at a time.
+
+    Returns:
+        int: Number of rows written.
+    """
+    rows = 0
+    for i, chunk in enumerate(generate_chunks(n_tickers, years, seed, end_date)):
+        chunk.to_csv(path, index=False, header=(i == 0), mode='w' if i == 0 else 'a')
+        rows += len(chunk)
+    return rows
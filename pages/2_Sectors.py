@@ -0,0 +1,257 @@
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from utils.model_registry import model_registry
+from utils.forecast_cache import forecast_cache
+from utils.sector_forecasts import forecast_tickers
+from utils import data_access, instrumentation
+from utils.sector_index import SECTOR_NAMES, movement, sector_name
+from utils.plot_functions import line_chart
+from datetime import timedelta
+
+# ─── Styling ───────────────────────────────────────────────
+st.set_page_config(page_title="Sector Analysis", layout="wide")
+
+# Timed for the Debug page; ?profile=1 also samples where this run spends its time.
+# The with block closes the request even if the script raises or Streamlit stops it.
+with instrumentation.begin_request("Sectors", profile=st.query_params.get("profile") == "1"):
+    st.markdown("""
+        <style>
+        html, body, [class*="css"] {
+            font-family: 'Source Sans Pro', sans-serif !important;
+        }
+        .arrow-up {
+            animation: wiggle-up 1s infinite;
+        }
+        .arrow-down {
+            animation: wiggle-down 1s infinite;
+        }
+        @keyframes wiggle-up {
+            0% { transform: translateY(0); }
+            50% { transform: translateY(-3px); }
+            100% { transform: translateY(0); }
+        }
+        @keyframes wiggle-down {
+            0% { transform: translateY(0); }
+            50% { transform: translateY(3px); }
+            100% { transform: translateY(0); }
+        }
+        </style>
+    """, unsafe_allow_html=True)
+
+    # ─── Sector Selection ───────────────────────────────────────
+    # The sector can be linked directly, e.g. /Sectors?sector=106
+    sector_index_df = data_access.sector_indices()
+    sectors = [s for s in SECTOR_NAMES if s in set(sector_index_df['Sector'])]
+    default_sector = st.query_params.get('sector', '103')
+    default_sector = int(default_sector) if default_sector.isdigit() else 103
+    sector = st.sidebar.selectbox("Sector", sectors, index=sectors.index(default_sector) if default_sector in sectors else 0,
+                                  format_func=sector_name)
+    st.query_params['sector'] = str(sector)
+
+    # ─── Title ──────────────────────────────────────────────────
+    st.markdown(f"""
+        <h1 style='
+            font-size: 48px;
+            color: #e0e0e0;
+            font-family: "Source Sans Pro", sans-serif;
+            margin-bottom: 10px;
+        '>{sector_name(sector)} Sector Analysis</h1>
+    """, unsafe_allow_html=True)
+
+    # ─── Load Data ──────────────────────────────────────────────
+    tickers = data_access.sector_tickers(sector)
+    index_df = data_access.sector_index(sector)
+
+    # ─── Time Filter ────────────────────────────────────────────
+    time_filter = st.selectbox("Select Time Range", ["Daily (default)", "Last 5 Days", "Last Month", "Last Year", "All Time"])
+
+    if time_filter == "Daily (default)":
+        period_df = index_df.tail(2)
+    elif time_filter == "Last 5 Days":
+        period_df = index_df.tail(5)
+    elif time_filter == "Last Month":
+        period_df = index_df[index_df['Date'] >= index_df['Date'].max() - pd.Timedelta(days=30)]
+    elif time_filter == "Last Year":
+        period_df = index_df[index_df['Date'] >= index_df['Date'].max() - pd.Timedelta(days=365)]
+    else:  # All Time
+        period_df = index_df
+
+    start_date = period_df['Date'].min()
+    end_date = period_df['Date'].max()
+
+    # ─── Sector Metric Card ─────────────────────────────────────
+    # Market-cap-weighted, so large companies move the sector more than small ones
+    sector_pct = movement(index_df, start_date)
+    arrow = "🡅" if sector_pct >= 0 else "🡇"
+    color = "#00FF00" if sector_pct >= 0 else "#FF4C4C"
+    arrow_class = "arrow-up" if sector_pct >= 0 else "arrow-down"
+
+    st.markdown(f"""
+        <div style="
+            background-color: #1c1c1c;
+            border: 1px solid #444;
+            border-radius: 10px;
+            padding: 20px;
+            font-size: 22px;
+            color: #e0e0e0;
+            text-align: center;
+            margin-bottom: 20px;
+            font-family: 'Source Sans Pro', sans-serif;
+        ">
+            <b>{start_date.date()} → {end_date.date()}</b><br>
+            Total Market Movement: <span style='color:{color}; font-weight:bold;' class='{arrow_class}'>{arrow} {sector_pct:.2f}%</span>
+        </div>
+    """, unsafe_allow_html=True)
+
+    # ─── Index Chart ────────────────────────────────────────────
+    fig_index = line_chart({sector_name(sector): period_df}, "Sector Index (market-cap weighted, start = 100)",
+                           y='Index', yaxis_title="Index")
+    with instrumentation.span('chart.render', page="Sectors"):
+        st.plotly_chart(fig_index, use_container_width=True)
+
+    # ─── Line Chart ─────────────────────────────────────────────
+    fig = line_chart({ticker: data_access.prices_for(ticker, start=start_date) for ticker in tickers}, "Sector Time Series")
+    with instrumentation.span('chart.render', page="Sectors"):
+        st.plotly_chart(fig, use_container_width=True)
+
+    # ─── Sidebar Risk Preference ────────────────────────────────
+    st.sidebar.header("Risk Preference")
+    risk_profile = st.sidebar.selectbox("Choose your risk profile", ["High", "Low"])
+
+    # ─── Predict & Recommend ────────────────────────────────────
+    def render_forecast(container, result):
+        """Draws one ticker's forecast cards, recommendation and chart into its container."""
+        company_name = result['company_name']
+        predicted_closes = result['predicted_closes']
+        recommendation = result['recommendation']
+        future_dates = [result['last_date'] + timedelta(days=i+1) for i in range(2)]
+        change = ((predicted_closes[1] - predicted_closes[0]) / predicted_closes[0]) * 100
+        arrow = "🡅" if change >= 0 else "🡇"
+        color = "#00FF00" if change >= 0 else "#FF4C4C"
+        arrow_class = "arrow-up" if change >= 0 else "arrow-down"
+
+        container.markdown(f"""
+            <h3 style='
+                font-size: 28px;
+                color: #e0e0e0;
+                font-family: "Source Sans Pro", sans-serif;
+                margin-top: 40px;
+            '>{company_name}</h3>
+        """, unsafe_allow_html=True)
+
+        # ── Prediction Cards ──
+        col1, col2, col3 = container.columns(3)
+
+        col1.markdown(f"""
+            <div style="
+                background-color: #1c1c1c;
+                border: 1px solid #444;
+                border-radius: 10px;
+                padding: 16px;
+                font-size: 18px;
+                color: #e0e0e0;
+                text-align: center;
+            ">
+                <b>{future_dates[0].date()}</b><br>{predicted_closes[0]:.2f} $
+            </div>
+        """, unsafe_allow_html=True)
+
+        col2.markdown(f"""
+            <div style="
+                background-color: #1c1c1c;
+                border: 1px solid #444;
+                border-radius: 10px;
+                padding: 16px;
+                font-size: 18px;
+                color: #e0e0e0;
+                text-align: center;
+            ">
+                <b>{future_dates[1].date()}</b><br>{predicted_closes[1]:.2f} $
+            </div>
+        """, unsafe_allow_html=True)
+
+        col3.markdown(f"""
+            <div style="
+                background-color: #1c1c1c;
+                border: 1px solid #444;
+                border-radius: 10px;
+                padding: 16px;
+                font-size: 18px;
+                text-align: center;
+                color: {color};
+            ">
+                <b>Change</b><br><span class='{arrow_class}'>{arrow} {change:.2f}%</span>
+            </div>
+        """, unsafe_allow_html=True)
+
+        # ── Recommendation ──
+        container.markdown(f"""
+            <div style="
+                background-color: #1c1c1c;
+                border: 2px solid #00ffcc;
+                border-radius: 10px;
+                padding: 20px;
+                margin-top: 10px;
+                font-size: 20px;
+                color: #e0e0e0;
+                font-weight: bold;
+                text-align: center;
+            ">
+                 <b>Recommendation:</b> <span style="color:#00ffcc;">{recommendation}</span>
+            </div>
+        """, unsafe_allow_html=True)
+
+        # ── Prediction Plot ──
+        last_5 = result['history'].copy()
+        pred_df_plot = pd.DataFrame({'Date': future_dates, 'Close': predicted_closes})
+        combined = pd.concat([last_5, pred_df_plot], ignore_index=True)
+
+        fig_pred = go.Figure()
+        fig_pred.add_trace(go.Scatter(x=combined['Date'], y=combined['Close'], mode='lines+markers', name='Close'))
+        fig_pred.add_trace(go.Scatter(x=pred_df_plot['Date'], y=pred_df_plot['Close'],
+                                      mode='lines+markers', marker=dict(color='red'), name='Predicted'))
+
+        fig_pred.update_layout(title=f"{company_name}: Last 5 Days + 2-Day Forecast", xaxis_title="Date", yaxis_title="Close ($)")
+        with instrumentation.span('chart.render', page="Sectors"):
+            container.plotly_chart(fig_pred, use_container_width=True)
+
+
+    def render_error(container, ticker, message):
+        """Replaces a ticker's placeholder with an error card."""
+        container.markdown(f"""
+            <div style="
+                background-color: #1c1c1c;
+                border: 1px solid #FF4C4C;
+                border-radius: 10px;
+                padding: 16px;
+                margin-top: 40px;
+                font-size: 18px;
+                color: #e0e0e0;
+                text-align: center;
+            ">
+                <b>{ticker}</b><br>{message}
+            </div>
+        """, unsafe_allow_html=True)
+
+
+    if st.button("🚀 Run Daytrading Predictions"):
+        st.subheader("2-Day Forecast & Recommendation")
+        # One slot per ticker in sector order, filled as each forecast arrives
+        slots = {ticker: st.container() for ticker in tickers}
+        placeholders = {ticker: slot.empty() for ticker, slot in slots.items()}
+        for ticker, placeholder in placeholders.items():
+            placeholder.info(f"Forecasting {ticker}...")
+
+        for ticker, result, error in forecast_tickers(tickers, risk_profile.lower()):
+            placeholders[ticker].empty()
+            if error is not None:
+                render_error(slots[ticker], ticker, error)
+            else:
+                render_forecast(slots[ticker], result)
+
+    # ─── Model Pool Stats ───────────────────────────────────────
+    with st.sidebar.expander("Model pool"):
+        st.dataframe(model_registry.stats(), hide_index=True)
+    with st.sidebar.expander("Forecast cache"):
+        st.dataframe(forecast_cache.stats(), hide_index=True)
@@ -0,0 +1,51 @@
+import streamlit as st
+import plotly.graph_objects as go
+from utils import instrumentation
+
+st.set_page_config(page_title="Debug - FinPulse", layout="wide")
+
+# Title
+st.markdown("""
+    <h1 style='
+        font-size: 48px;
+        color: #e0e0e0;
+        font-family: "Source Sans Pro", sans-serif;
+        margin-bottom: 10px;
+    '>Debug</h1>
+""", unsafe_allow_html=True)
+
+st.caption("Timings of every session served by this process. Add ?profile=1 to a page URL to sample where that run spends its time.")
+
+metrics = instrumentation.metrics
+if st.button("Reset metrics"):
+    metrics.reset()
+    instrumentation.recent_profiles.clear()
+
+# ─── Per-stage latency ──────────────────────────────────────
+summary = metrics.summary()
+st.subheader("Latency per stage")
+if summary.empty:
+    st.info("No spans recorded yet. Open another page first.")
+else:
+    st.dataframe(summary, hide_index=True, use_container_width=True)
+
+    stage = st.selectbox("Histogram", summary['stage'])
+    histogram = metrics.histogram(stage)
+    labels = [f"≤ {le:g} ms" if le != float('inf') else f"> {histogram['le_ms'].iloc[-2]:g} ms"
+              for le in histogram['le_ms']]
+    fig = go.Figure(go.Bar(x=labels, y=histogram['count']))
+    fig.update_layout(title=f"{stage} duration", xaxis_title="Duration", yaxis_title="Spans")
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Recent spans")
+    st.dataframe(metrics.recent(100), hide_index=True, use_container_width=True)
+
+# ─── Profiles ───────────────────────────────────────────────
+st.subheader("Profiled page runs")
+if not instrumentation.recent_profiles:
+    st.info("No profiled runs yet.")
+for i, profile in enumerate(reversed(instrumentation.recent_profiles)):
+    with st.expander(f"{profile.label}: {profile.samples} samples in {profile.duration:.2f}s", expanded=i == 0):
+        st.dataframe(profile.top(25), hide_index=True, use_container_width=True)
+        st.download_button("Collapsed stacks (for flame graphs)", profile.collapsed(),
+                           file_name=f"profile-{profile.label}-{int(profile.started_at)}.txt", key=f"profile-{i}")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the app's modules the same way the pages do, from the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from utils.downsampling import lttb_indices, minmax_indices
+
+
+@pytest.mark.parametrize('n', [5, 101, 1000, 4099])
+@pytest.mark.parametrize('n_out', [4, 5, 50, 333])
+def test_minmax_keeps_the_endpoints_within_budget(n, n_out):
+    y = np.random.RandomState(n).randn(n).cumsum()
+    kept = minmax_indices(y, n_out)
+
+    assert len(kept) <= n_out
+    assert kept[0] == 0 and kept[-1] == n - 1
+    assert np.all(np.diff(kept) > 0)
+
+
+def test_minmax_keeps_the_extremes():
+    y = np.sin(np.linspace(0, 20, 5000))
+    y[1234], y[3210] = 5.0, -5.0
+    kept = minmax_indices(y, 200)
+
+    assert 1234 in kept and 3210 in kept
+
+
+def test_minmax_skips_missing_values():
+    y = np.arange(1000, dtype=np.float64)
+    y[100:400] = np.nan
+    kept = minmax_indices(y, 20)
+
+    assert len(kept) <= 20
+    assert not np.isnan(y[kept[1:-1]]).any()
+
+
+@pytest.mark.parametrize('n_out', [3, 10, 500])
+def test_lttb_returns_exactly_n_out(n_out):
+    y = np.random.RandomState(0).randn(2000).cumsum()
+    kept = lttb_indices(np.arange(2000), y, n_out)
+
+    assert len(kept) == n_out
+    assert kept[0] == 0 and kept[-1] == 1999
+
+
+
+@pytest.mark.parametrize('n_out, expected', [(0, []), (1, [99]), (2, [0, 99]), (3, [0, 99])])
+def test_minmax_tiny_budgets_keep_at_most_the_endpoints(n_out, expected):
+    y = np.random.RandomState(3).randn(100)
+    assert list(minmax_indices(y, n_out)) == expected
+
+
+@pytest.mark.parametrize('n_out, expected', [(0, []), (1, [99]), (2, [0, 99])])
+def test_lttb_tiny_budgets_keep_at_most_the_endpoints(n_out, expected):
+    y = np.random.RandomState(3).randn(100)
+    assert list(lttb_indices(np.arange(100), y, n_out)) == expected
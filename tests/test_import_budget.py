@@ -0,0 +1,33 @@
+import glob
+import os
+
+import pytest
+
+from benchmarks.import_budget import ROOT, measure, top_level_imports
+
+PAGES = [os.path.join(ROOT, 'Home.py')] + sorted(glob.glob(os.path.join(ROOT, 'pages', '*.py')))
+# Must only load on first use, never when a page is imported
+DEFERRED = ['tensorflow', 'keras', 'sklearn', 'simfin']
+
+
+def imported_module(statement):
+    """The top-level package an 'import x' or 'from x import y' statement loads."""
+    return statement.split()[1].split('.')[0]
+
+
+@pytest.mark.parametrize('page', PAGES, ids=lambda path: os.path.relpath(path, ROOT))
+def test_page_imports_do_not_load_heavy_modules(page):
+    # measure runs the page's imports in a fresh interpreter and lists what is in sys.modules afterwards
+    report = measure(page)
+
+    assert [name for name in DEFERRED if name in report['heavy']] == []
+    # An import may only be skipped for its own missing package (streamlit where it is not installed),
+    # never because a utils module failed on a missing dependency
+    skipped = [s for s in top_level_imports(page) if imported_module(s) in report['missing']]
+    assert len(skipped) == len(report['missing'])
+
+
+def test_heavy_modules_are_reported(tmp_path):
+    page = tmp_path / 'page.py'
+    page.write_text('import sklearn.preprocessing\n')
+    assert 'sklearn' in measure(str(page))['heavy']
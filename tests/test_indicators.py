@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic
+from utils.indicators import COLUMNS, append_indicators, build_indicators, compute_indicators, indicators_path
+
+# Days streamed per ticker, more than the longest window (SMA 50)
+STREAM_DAYS = 60
+# Rolling indicators use running sums when streaming; accepted gap relative to the value
+TOLERANCE = 1e-9
+
+
+def prices():
+    """Four synthetic tickers: two with a year of history, one too short for the longest window, and one that starts late."""
+    df = synthetic.generate(n_tickers=4, years=1)[['Ticker', 'Date', 'High', 'Low', 'Close', 'Volume']]
+    short = df['Ticker'] == 'SYN0002.DE'
+    df = df[~short | (df['Date'] >= df['Date'].max() - pd.offsets.BDay(30 + STREAM_DAYS))]
+    late = df['Ticker'] == 'SYN0003.DE'
+    return df[~late | (df['Date'] > df['Date'].max() - pd.offsets.BDay(STREAM_DAYS))].reset_index(drop=True)
+
+
+@pytest.mark.parametrize('days', [1, STREAM_DAYS])
+def test_streaming_matches_batch(tmp_path, days):
+    df = prices()
+    cutoff = df['Date'].drop_duplicates().nlargest(days).min()
+    history, new_days = df[df['Date'] < cutoff], df[df['Date'] >= cutoff]
+    store_root = str(tmp_path / 'store')
+
+    build_indicators(history, store_root)
+    # Streamed in several appends, as consecutive --incremental runs would
+    for _, rows in new_days.groupby('Date'):
+        append_indicators(rows, store_root)
+
+    actual = pd.read_parquet(indicators_path(store_root))
+    expected = compute_indicators(df)
+    pd.testing.assert_frame_equal(actual[['Ticker', 'Date']], expected[['Ticker', 'Date']])
+    for column in COLUMNS:
+        a, b = actual[column].to_numpy(), expected[column].to_numpy()
+        np.testing.assert_array_equal(np.isnan(a), np.isnan(b), err_msg=column)
+        defined = ~np.isnan(b)
+        scale = np.maximum(np.abs(b[defined]), 1.0)
+        assert np.max(np.abs(a[defined] - b[defined]) / scale, initial=0.0) <= TOLERANCE, column
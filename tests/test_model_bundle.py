@@ -0,0 +1,110 @@
+import glob
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from utils.forecast_cache import ForecastCache
+from utils.forecast_job import ForecastTable, model_version, run, served_model_version
+from utils.lstm_predictor import StockPredictor
+from utils.model_bundle import read_metadata
+from utils.model_registry import ModelRegistry
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+TICKER = 'BMW.DE'
+MODEL_PATH = os.path.join(ROOT, 'utils/models', f'lstm_model_{TICKER}.h5')
+
+
+def bundle_only_models_dir(tmp_path):
+    """A models directory holding only the ticker's .npz bundle."""
+    models_dir = tmp_path / 'models'
+    models_dir.mkdir()
+    shutil.copy(MODEL_PATH[:-len('.h5')] + '.npz', models_dir)
+    return str(models_dir)
+
+
+def ticker_prices():
+    prices = pd.read_csv(os.path.join(ROOT, 'utils/data/raw/de_share_prices_data_RAW.csv'), parse_dates=['Date'])
+    return prices[prices['Ticker'] == TICKER].sort_values('Date').reset_index(drop=True)
+
+
+def test_bundle_without_h5_keeps_the_h5_version(tmp_path):
+    model_path = os.path.join(bundle_only_models_dir(tmp_path), f'lstm_model_{TICKER}.h5')
+    assert served_model_version(model_path) == model_version(MODEL_PATH)
+
+
+def test_bundle_without_h5_serves_cached_forecasts(tmp_path):
+    model_path = os.path.join(bundle_only_models_dir(tmp_path), f'lstm_model_{TICKER}.h5')
+    cache = ForecastCache(root=str(tmp_path / 'memo'))
+    predictor = StockPredictor(model_path, ticker_prices(), registry=ModelRegistry(backend='numpy'), cache=cache)
+
+    first = predictor.get_last_actual_and_predictions()
+    second = predictor.get_last_actual_and_predictions()
+
+    assert first == second
+    assert cache.stats()['hits'].iloc[0] == 1
+
+
+def test_forecast_job_runs_from_bundles(tmp_path, monkeypatch):
+    from utils import data_access
+    from utils.forecast_cache import forecast_cache
+
+    prices = ticker_prices()
+    monkeypatch.setattr(data_access, 'prices_for', lambda ticker: prices if ticker == TICKER else prices.iloc[0:0])
+    monkeypatch.setattr(forecast_cache, 'root', str(tmp_path / 'memo'))
+    monkeypatch.setattr(forecast_cache, '_bytes', None)
+    table = ForecastTable(str(tmp_path / 'forecasts.parquet'))
+    rows = run(models_dir=bundle_only_models_dir(tmp_path), table=table)
+
+    assert list(rows['Ticker']) == [TICKER]
+    assert rows['Model_Version'].iloc[0] == model_version(MODEL_PATH)
+    model_path = os.path.join(str(tmp_path / 'models'), f'lstm_model_{TICKER}.h5')
+    assert table.lookup(TICKER, prices['Date'].iloc[-1], model_path) is not None
+
+
+def test_evaluation_and_backtest_run_from_bundles(tmp_path, monkeypatch):
+    from utils import data_access
+    from utils.backtest import backtest_ticker
+    from utils.evaluation import evaluate_model
+    from utils.forecast_job import model_paths
+
+    prices = ticker_prices().tail(300).reset_index(drop=True)
+    monkeypatch.setattr(data_access, 'prices_for', lambda ticker: prices)
+    (model_path,) = model_paths(bundle_only_models_dir(tmp_path))
+
+    summary, _ = evaluate_model(model_path)
+    rows, _ = backtest_ticker(TICKER, model_path)
+
+    assert set(summary['ticker']) == {TICKER}
+    assert summary['forecasts'].min() > 0
+    assert [row['ticker'] for row in rows] == [TICKER, TICKER]
+
+
+def test_model_scaling_matches_the_served_forecast():
+    from utils.batch_inference import window_forecasts
+    from utils.lstm_predictor import served_model
+
+    # A shorter history than the bundle's scaler was fitted on, so its min/max differ
+    prices = ticker_prices().head(600)
+    registry = ModelRegistry(backend='numpy')
+    model, bundle = served_model(MODEL_PATH, registry)
+    predictor = StockPredictor(MODEL_PATH, prices, registry=registry)
+    closes = prices['Close'].to_numpy()
+
+    _, forecasts = window_forecasts(model, closes, days=2, scaling='model', scaler=bundle.scaler)
+    _, refitted = window_forecasts(model, closes, days=2, scaling='full')
+
+    assert forecasts[-1] == pytest.approx(predictor.predict_multiple_days(2), rel=1e-9)
+    assert refitted[-1] != pytest.approx(forecasts[-1], rel=1e-4)
+
+
+@pytest.mark.parametrize('bundle_path', sorted(glob.glob(os.path.join(ROOT, 'utils/models', 'lstm_model_*.npz'))))
+def test_committed_bundles_scale_like_the_float64_closes(bundle_path):
+    metadata = read_metadata(bundle_path)
+    ticker = os.path.basename(bundle_path)[len('lstm_model_'):-len('.npz')]
+    prices = pd.read_csv(os.path.join(ROOT, 'utils/data/raw/de_share_prices_data_RAW.csv'), parse_dates=['Date'])
+    closes = prices.loc[(prices['Ticker'] == ticker) & (prices['Date'] <= metadata['fit_end']), 'Close']
+
+    # Exactly the float64 values the Keras path fits its MinMaxScaler on, not float32-rounded ones
+    assert (metadata['data_min'], metadata['data_max']) == (closes.min(), closes.max())
@@ -0,0 +1,27 @@
+import glob
+import os
+
+from utils.model_registry import ModelRegistry
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BUNDLE_PATHS = sorted(glob.glob(os.path.join(ROOT, 'utils/models', 'lstm_model_*.npz')))
+
+
+def test_cap_applies_to_the_estimated_resident_size(monkeypatch):
+    monkeypatch.setitem(ModelRegistry.RESIDENT_FACTORS, 'numpy', 3.0)
+    weight_bytes = ModelRegistry._weight_bytes(ModelRegistry._load(BUNDLE_PATHS[0], 'numpy'))
+    # Room for two models by their estimated size, though all of their weights would fit
+    registry = ModelRegistry(max_bytes=int(weight_bytes * 3.0 * 2.5), backend='numpy')
+    for path in BUNDLE_PATHS:
+        registry.get(path)
+
+    stats = registry.stats()
+    assert stats['resident'].sum() == 2
+    assert set(stats['est_resident_kb']) == {round(weight_bytes * 3.0 / 1024, 1)}
+    assert registry.resident_bytes() <= registry.max_bytes
+
+
+def test_bundles_are_estimated_as_numpy_models():
+    factors = ModelRegistry.RESIDENT_FACTORS
+    assert ModelRegistry._resident_bytes(1000, 'lstm_model_X.npz', 'keras') == 1000 * factors['numpy']
+    assert ModelRegistry._resident_bytes(1000, 'lstm_model_X.h5', 'keras') == 1000 * factors['keras']
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from utils.numpy_lstm import NumpyLSTM
+
+SEQUENCE_LENGTH = 50
+UNITS = 8
+# Accepted gap between the NumPy backend (float64) and Keras (float32) on scaled outputs
+TOLERANCE = 1e-5
+
+
+def test_numpy_backend_matches_keras(tmp_path):
+    keras = pytest.importorskip('tensorflow').keras
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([
+        keras.layers.Input((SEQUENCE_LENGTH, 1)),
+        keras.layers.LSTM(UNITS, return_sequences=True),
+        keras.layers.Dropout(0.2),
+        keras.layers.LSTM(UNITS),
+        keras.layers.Dropout(0.2),
+        keras.layers.Dense(1),
+    ])
+    model_path = str(tmp_path / 'lstm_model_TEST.h5')
+    model.save(model_path)
+
+    windows = np.random.RandomState(1).uniform(0, 1, (64, SEQUENCE_LENGTH, 1))
+    expected = model.predict(windows, verbose=0)
+    actual = NumpyLSTM.from_h5(model_path).predict(windows)
+
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=TOLERANCE)
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from utils.price_store import PriceStore
+
+
+def prices(ticker, start, days):
+    dates = pd.bdate_range(start, periods=days)
+    return pd.DataFrame({'Date': dates, 'Ticker': ticker, 'Close': 100.0 + pd.RangeIndex(days)})
+
+
+def test_appends_with_the_same_timestamp_keep_both_parts(tmp_path, monkeypatch):
+    # Two appends in the same microsecond used to get the same part name, and
+    # 'overwrite_or_ignore' silently replaced the first one
+    frozen = pd.Timestamp('2024-01-02 03:04:05.678901')
+    monkeypatch.setattr(pd.Timestamp, 'now', classmethod(lambda cls, tz=None: frozen))
+    store = PriceStore(str(tmp_path / 'store'))
+
+    store.append(prices('BMW.DE', '2024-01-01', 5))
+    store.append(prices('BMW.DE', '2024-01-08', 5))
+
+    df = store.read(tickers=['BMW.DE'])
+    assert len(df) == 10
+    assert df['Date'].is_unique
@@ -0,0 +1,115 @@
+import datetime
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.apiclass import SimFinAPI, SnapshotCache
+from utils.price_store import PriceStore
+
+TICKERS = ['BMW.DE', 'MBG.DE', 'VOW.DE']
+# Column order of sf.load_shareprices(...).reset_index()
+SIMFIN_COLUMNS = ['Ticker', 'Date', 'SimFinId', 'Open', 'High', 'Low', 'Close', 'Adj. Close',
+                  'Volume', 'Dividend', 'Shares Outstanding']
+
+
+def simfin_prices(days):
+    """A small share price table shaped like a SimFin download."""
+    dates = pd.bdate_range('2023-01-02', periods=days)
+    rows = []
+    for i, ticker in enumerate(TICKERS):
+        close = 100.0 + i * 10 + np.arange(days)
+        rows.append(pd.DataFrame({
+            'Ticker': ticker, 'Date': dates, 'SimFinId': 1000 + i, 'Open': close - 0.5,
+            'High': close + 1, 'Low': close - 1, 'Close': close, 'Adj. Close': close * 0.9,
+            'Volume': 1000 + np.arange(days), 'Dividend': np.nan, 'Shares Outstanding': 5e8,
+        }))
+    return pd.concat(rows, ignore_index=True)[SIMFIN_COLUMNS]
+
+
+class FixtureLoader:
+    """Loader that serves a fixture table and counts the downloads."""
+
+    def __init__(self, days=20):
+        self.days = days
+        self.calls = 0
+
+    def __call__(self, market, variant):
+        self.calls += 1
+        return simfin_prices(self.days)
+
+
+def age_snapshot(cache, hours):
+    """Move the current snapshot's creation time `hours` into the past."""
+    path = os.path.join(cache._key_dir('de', 'daily'), 'CURRENT.json')
+    with open(path) as f:
+        current = json.load(f)
+    current['created'] = (datetime.datetime.now() - datetime.timedelta(hours=hours)).isoformat()
+    with open(path, 'w') as f:
+        json.dump(current, f)
+
+
+@pytest.fixture
+def loader():
+    return FixtureLoader()
+
+
+@pytest.fixture
+def cache(tmp_path, loader):
+    return SnapshotCache(root=str(tmp_path), ttl=datetime.timedelta(hours=1), loader=loader)
+
+
+def test_snapshot_is_reused_within_ttl(cache, loader):
+    cache.read('de', 'daily')
+    cache.read('de', 'daily')
+    assert loader.calls == 1
+
+
+def test_stale_snapshot_is_reloaded(cache, loader):
+    first = cache.read('de', 'daily')
+    old_version = cache.current('de', 'daily')['version']
+
+    age_snapshot(cache, hours=2)
+    loader.days = 25
+    second = cache.read('de', 'daily')
+
+    assert loader.calls == 2
+    assert len(second) == len(first) + 5 * len(TICKERS)
+    current = cache.current('de', 'daily')
+    assert current['version'] != old_version
+    assert not os.path.exists(os.path.join(cache._key_dir('de', 'daily'), old_version))
+
+
+def test_filters_are_pushed_down_to_the_store(cache, monkeypatch):
+    calls = []
+    read = PriceStore.read
+
+    def spy(self, *args, **kwargs):
+        calls.append(kwargs)
+        return read(self, *args, **kwargs)
+
+    monkeypatch.setattr(PriceStore, 'read', spy)
+    df = cache.read('de', 'daily', tickers=['BMW.DE'], start_date='2023-01-10', end_date='2023-01-20')
+
+    assert calls == [{'tickers': ['BMW.DE'], 'start_date': '2023-01-10', 'end_date': '2023-01-20'}]
+    assert set(df['Ticker']) == {'BMW.DE'}
+    assert df['Date'].min() >= pd.Timestamp('2023-01-10')
+    assert df['Date'].max() <= pd.Timestamp('2023-01-20')
+    expected = simfin_prices(20)
+    expected = expected[(expected['Ticker'] == 'BMW.DE') & expected['Date'].between('2023-01-10', '2023-01-20')]
+    assert len(df) == len(expected)
+
+
+def test_share_prices_keep_the_old_column_order(cache):
+    # Skip __init__, which needs SimFin credentials; get_share_prices only uses the cache
+    api = SimFinAPI.__new__(SimFinAPI)
+    api.cache = cache
+    df = api.get_share_prices(tickers=['BMW.DE', 'VOW.DE'], start_date='2023-01-05')
+
+    # The previous implementation returned the Date index first, the SimFin
+    # columns in download order and the Ticker merged in last
+    assert list(df.columns) == ['Date'] + SIMFIN_COLUMNS[2:] + ['Ticker']
+    assert set(df['Ticker']) == {'BMW.DE', 'VOW.DE'}
+    assert df['Date'].min() == pd.Timestamp('2023-01-05')
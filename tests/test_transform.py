@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_transform import legacy_mode_shares, legacy_transform
+from utils.share_price_processor import SharePriceProcessor, rolling_quantiles
+
+
+def raw_prices():
+    """Raw prices of three tickers, out of order, with gaps, a one-row ticker and tied modes."""
+    dates = pd.bdate_range('2023-01-02', periods=45)
+    close = 100 + np.random.RandomState(0).randn(len(dates)).cumsum()
+    close[[3, 4, 20]] = np.nan
+    # Small moves so some changes fall in the 'Stay' band
+    close[30:36] = close[29] + np.array([0.1, -0.2, 0.3, 0.0, 0.2, -0.1])
+    gappy = pd.DataFrame({'Ticker': 'AAA.DE', 'Date': dates, 'Close': close,
+                          'Shares Outstanding': 5e8, 'Dividend': np.nan})
+    gappy.loc[[0, 1, 25], 'Shares Outstanding'] = np.nan
+
+    single = pd.DataFrame({'Ticker': 'BBB.DE', 'Date': [dates[10]], 'Close': [42.0],
+                           'Shares Outstanding': [1e6], 'Dividend': [0.5]})
+
+    # Two share counts appear equally often in January; the mode is the smaller one
+    tied = pd.DataFrame({'Ticker': 'CCC.DE', 'Date': dates[:30], 'Close': np.linspace(50, 60, 30),
+                         'Shares Outstanding': np.r_[[2e6, 1e6] * 11, [3e6] * 8], 'Dividend': np.nan})
+    tied.loc[[5, 17], 'Close'] = np.nan
+
+    raw = pd.concat([tied, gappy, single], ignore_index=True)
+    return raw.sample(frac=1, random_state=1).reset_index(drop=True)
+
+
+def processed(mode_fn, transform_fn):
+    processor = SharePriceProcessor()
+    processor.raw_prices = raw_prices()
+    processor.extract_date_features(processor.raw_prices)
+    processor.drop_columns()
+    mode_fn(processor)
+    processor.fill_missing_values()
+    transform_fn(processor)
+    return processor
+
+
+def test_vectorized_transform_matches_the_per_ticker_loop():
+    legacy = processed(legacy_mode_shares, legacy_transform)
+    vectorized = processed(SharePriceProcessor.calculate_mode_shares, SharePriceProcessor.transform_data)
+
+    pd.testing.assert_frame_equal(legacy.raw_prices, vectorized.raw_prices)
+    assert set(vectorized.raw_prices['Category']) >= {'Stay', 'High Rise', 'High Fall'}
+
+
+def test_vectorized_mode_shares_matches_series_mode():
+    legacy = processed(legacy_mode_shares, legacy_transform)
+    vectorized = processed(SharePriceProcessor.calculate_mode_shares, SharePriceProcessor.transform_data)
+
+    pd.testing.assert_series_equal(legacy.mode_shares, vectorized.mode_shares,
+                                   check_names=False, check_dtype=False)
+    assert vectorized.mode_shares[('CCC.DE', 2023, 1)] == 1e6
+
+
+@pytest.mark.parametrize('window', [1, 3, 5])
+def test_rolling_quantiles_match_pandas(window):
+    values = np.random.RandomState(2).randn(60)
+    values[[0, 7, 8, 30]] = np.nan
+    values[40:45] = 1.5  # ties inside a window
+    quantiles = [0.0, 0.25, 0.5, 0.75, 1.0]
+
+    actual = rolling_quantiles(values, window, quantiles)
+
+    for q, result in zip(quantiles, actual):
+        expected = pd.Series(values).rolling(window).quantile(q).to_numpy()
+        np.testing.assert_allclose(result, expected, rtol=1e-12, equal_nan=True)
+
+
+def test_rolling_quantiles_of_a_short_series_are_nan():
+    (result,) = rolling_quantiles(np.array([1.0, 2.0]), 5, [0.5])
+    assert np.isnan(result).all()
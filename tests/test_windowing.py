@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from utils.windowing import multi_ticker_datasets, multi_ticker_starts, split_starts
+
+SEQUENCE_LENGTH = 10
+# Includes a ticker too short for a single window
+LENGTHS = [120, 57, 8, 300]
+
+
+def ticker_of(positions):
+    """Index of the series each position of the concatenated array belongs to."""
+    return np.searchsorted(np.cumsum(LENGTHS), positions, side='right')
+
+
+def test_windows_never_cross_tickers():
+    for starts in multi_ticker_starts(LENGTHS, SEQUENCE_LENGTH):
+        # The target sits sequence_length after the start, in the same ticker
+        assert np.array_equal(ticker_of(starts), ticker_of(starts + SEQUENCE_LENGTH))
+
+
+def test_split_is_applied_per_ticker():
+    train, test, val = multi_ticker_starts(LENGTHS, SEQUENCE_LENGTH)
+    offsets = np.r_[0, np.cumsum(LENGTHS)[:-1]]
+    for ticker, (n_values, offset) in enumerate(zip(LENGTHS, offsets)):
+        expected = split_starts(n_values, SEQUENCE_LENGTH)
+        for starts, own in zip((train, test, val), expected):
+            assert np.array_equal(starts[ticker_of(starts) == ticker] - offset, own)
+
+
+def test_datasets_gather_each_tickers_own_windows():
+    pytest.importorskip('tensorflow')
+    series_list = [np.full(n, ticker, dtype=np.float32) + np.arange(n) / 1000 for ticker, n in enumerate(LENGTHS)]
+    train, test, val = multi_ticker_datasets(series_list, SEQUENCE_LENGTH, batch_size=16, seed=0)
+
+    expected = multi_ticker_starts(LENGTHS, SEQUENCE_LENGTH)
+    for dataset, starts in zip((train, test, val), expected):
+        inputs, targets = (np.concatenate(parts) for parts in zip(*dataset.as_numpy_iterator()))
+        assert inputs.shape == (len(starts), SEQUENCE_LENGTH, 1)
+        # Every value of a window and its target carry the same ticker number
+        tickers = np.floor(inputs[..., 0])
+        assert np.all(tickers == np.floor(targets)[:, None])
+    # Shuffled training batches mix tickers
+    first_batch = next(iter(train.as_numpy_iterator()))[1]
+    assert len(np.unique(np.floor(first_batch))) > 1
@@ -0,0 +1,7 @@
+"""
+FinPulse data, model and plotting helpers.
+
+Importing a module from this package never reads files or calls the network,
+and TensorFlow, scikit-learn and simfin are only imported inside the functions
+that need them, so a page only pays for them once a model or download is used.
+"""
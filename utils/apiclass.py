@@ -3,34 +3,123 @@ warnings.filterwarnings("ignore")
 
 import json
 
-import numpy as np
 import pandas as pd
 
-import plotly.express as px
+import os
+import shutil
+import datetime
 
-import simfin as sf
+from utils.price_store import PriceStore
 
-from simfin.names import *
+class SnapshotCache:
+    """
+    Versioned local snapshots of SimFin share prices, one per (market, variant).
+
+    Each snapshot is a Parquet dataset partitioned by ticker, so filtered reads
+    only open the requested tickers' files and skip row groups outside the date
+    range. A snapshot is downloaded again only once it is older than the TTL.
+    """
+
+    def __init__(self, root='~/simfin_data/snapshots', ttl=datetime.timedelta(days=1), loader=None):
+        """
+        Initialize the cache.
+
+        Args:
+            root (str): Directory holding the snapshots.
+            ttl (datetime.timedelta): Age after which a snapshot is refreshed.
+            loader (callable): loader(market, variant) returning the full share price
+                table with Ticker and Date columns. Defaults to a SimFin download.
+        """
+        self.root = os.path.expanduser(root)
+        self.ttl = ttl
+        self.loader = loader or self.__download
+
+    @staticmethod
+    def __download(market, variant):
+        import simfin as sf
+        return sf.load_shareprices(market=market, variant=variant).reset_index()
+
+    def _key_dir(self, market, variant):
+        return os.path.join(self.root, f"{market}-{variant}")
+
+    def current(self, market, variant):
+        """
+        Return the metadata of the current snapshot, or None if there is none.
+        """
+        path = os.path.join(self._key_dir(market, variant), 'CURRENT.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def is_stale(self, market, variant):
+        """
+        Return True if there is no snapshot or it is older than the TTL.
+        """
+        current = self.current(market, variant)
+        if current is None:
+            return True
+        created = datetime.datetime.fromisoformat(current['created'])
+        return datetime.datetime.now() - created > self.ttl
+
+    def refresh(self, market, variant):
+        """
+        Download a new snapshot, make it current and delete the older ones.
+
+        Returns:
+            dict: Metadata of the new snapshot.
+        """
+        df = self.loader(market, variant)
+        now = datetime.datetime.now()
+        version = now.strftime('%Y%m%dT%H%M%S%f')
+        key_dir = self._key_dir(market, variant)
+        PriceStore(os.path.join(key_dir, version)).write(df)
+
+        current = {'version': version, 'created': now.isoformat(), 'rows': len(df)}
+        tmp_path = os.path.join(key_dir, 'CURRENT.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(current, f)
+        os.replace(tmp_path, os.path.join(key_dir, 'CURRENT.json'))
+
+        for name in os.listdir(key_dir):
+            if name != version and os.path.isdir(os.path.join(key_dir, name)):
+                shutil.rmtree(os.path.join(key_dir, name), ignore_errors=True)
+        return current
+
+    def read(self, market, variant, tickers=None, start_date=None, end_date=None):
+        """
+        Read share prices from the current snapshot, refreshing it first if it is stale.
+
+        Args:
+            market (str): SimFin market, e.g. 'de'.
+            variant (str): SimFin share price variant, e.g. 'daily'.
+            tickers (list): Tickers to load. Loads all tickers if None.
+            start_date (str or datetime): Inclusive lower bound on Date.
+            end_date (str or datetime): Inclusive upper bound on Date.
+
+        Returns:
+            pd.DataFrame: Rows sorted by Ticker and Date.
+        """
+        current = self.refresh(market, variant) if self.is_stale(market, variant) else self.current(market, variant)
+        store = PriceStore(os.path.join(self._key_dir(market, variant), current['version']))
+        return store.read(tickers=tickers, start_date=start_date, end_date=end_date)
 
-import os
-from time import sleep
-from dotenv import load_dotenv
-import datetime
-import requests
-import json
-from functools import reduce
 
 class SimFinAPI:
-    def __init__(self):
+    def __init__(self, cache=None):
+        import simfin as sf
         self.__load_dotenv()
         self.__token = os.getenv("API_KEY")
         sf.set_api_key(self.__token)
         sf.set_data_dir('~/simfin_data/')
+        self.cache = cache or SnapshotCache()
 
     def __load_dotenv(self):
+        from dotenv import load_dotenv
         load_dotenv()
 
     def get_companies(self, market='de'):
+        import simfin as sf
         try:
             # Load company data for the specified market
             df_companies = sf.load_companies(market=market)
@@ -42,43 +131,25 @@ class SimFinAPI:
 
     def get_share_prices(self, market='de', variant='daily', tickers=None, start_date=None, end_date=None):
         try:
-            # Load share prices for the specified market and variant
-            df_prices = sf.load_shareprices(market=market, variant=variant)
-            
-           # Filter for the specified tickers
-            if tickers:
-                df_prices = df_prices.loc[df_prices.index.get_level_values('Ticker').isin(tickers)]
-            
-            # Convert index to datetime if not already in datetime format
-            df_prices.index = pd.to_datetime(df_prices.index.get_level_values('Date'))
-            
-            # Filter by date range if provided
-            if start_date:
-                start_date = pd.to_datetime(start_date)
-                df_prices = df_prices[df_prices.index >= start_date]
-            if end_date:
-                end_date = pd.to_datetime(end_date)
-                df_prices = df_prices[df_prices.index <= end_date]
-
-
-            # Load company data to map SimFinId to Ticker
-            df_companies = self.get_companies(market)
-            df_prices = df_prices.reset_index() 
-            if df_companies is not None:
-                df_prices = df_prices.merge(df_companies, on='SimFinId', how='left')
-            
-            return df_prices
+            # Read only the requested tickers and dates from the local snapshot
+            df_prices = self.cache.read(market, variant, tickers=tickers, start_date=start_date, end_date=end_date)
+
+            # Same column order as before: Date first, Ticker last
+            columns = ['Date'] + [c for c in df_prices.columns if c not in ('Date', 'Ticker')] + ['Ticker']
+            return df_prices[columns]
         except Exception as e:
             print(f"Error fetching share prices: {e}")
             return None
 
-# Create an instance of the SimFinAPI class
-simfin_api = SimFinAPI()
+if __name__ == "__main__":
+    # Create an instance of the SimFinAPI class
+    simfin_api = SimFinAPI()
 
-# Define the start date, end date and tickers
-start_date = '2023-01-01'
-end_date = '2023-12-31'
-tickers = ['MBG.DE', 'BMW.DE', 'VOW.DE']
+    # Define the start date, end date and tickers
+    start_date = '2023-01-01'
+    end_date = '2023-12-31'
+    tickers = ['MBG.DE', 'BMW.DE', 'VOW.DE']
 
-# Get share prices for the tickers
-ticker_prices = simfin_api.get_share_prices(tickers=tickers, start_date=start_date, end_date=end_date)
\ No newline at end of file
+    # Get share prices for the tickers
+    ticker_prices = simfin_api.get_share_prices(tickers=tickers, start_date=start_date, end_date=end_date)
+    print(ticker_prices)
@@ -1,7 +1,53 @@
 import os
 import pandas as pd
-from dotenv import load_dotenv
-import simfin as sf
+import pyarrow as pa
+from utils.price_store import PriceStore
+
+# Column types of the raw SimFin share price file, fixed so every chunk writes the same schema
+SHARE_PRICE_SCHEMA = pa.schema([
+    ('Ticker', pa.string()),
+    ('Date', pa.timestamp('ns')),
+    ('SimFinId', pa.int64()),
+    ('Open', pa.float64()),
+    ('High', pa.float64()),
+    ('Low', pa.float64()),
+    ('Close', pa.float64()),
+    ('Adj. Close', pa.float64()),
+    ('Volume', pa.int64()),
+    ('Dividend', pa.float64()),
+    ('Shares Outstanding', pa.float64()),
+    ('Company Name', pa.string()),
+])
+
+# Where the streaming ingest writes by default, relative to the repository root
+RAW_DIR = 'utils/data/raw'
+
+
+def download_share_price_file(market='de', variant='daily', refresh_days=1):
+    """
+    Make sure the raw SimFin share price CSV is on disk, downloading it if it is
+    missing or older than `refresh_days`, without parsing it.
+
+    simfin's public loaders (sf.load_shareprices and sf.load) always parse the
+    whole file into a DataFrame, which is what streaming avoids. The download
+    step on its own is only available as simfin.download._maybe_download_dataset,
+    so simfin is pinned in requirements.txt to a version it was checked against
+    (1.0.1). If a later simfin drops it, the public loader is used instead: the
+    file is still streamed afterwards, but the download parses it once.
+
+    Returns:
+        str: Path of the semicolon-separated CSV in the SimFin data directory.
+    """
+    import simfin as sf
+    try:
+        from simfin.download import _maybe_download_dataset
+    except ImportError:
+        print("simfin has no download-only helper. Downloading through sf.load_shareprices instead.")
+        sf.load_shareprices(market=market, variant=variant, refresh_days=refresh_days)
+    else:
+        _maybe_download_dataset(refresh_days=refresh_days, dataset='shareprices', variant=variant, market=market)
+    return os.path.join(sf.get_data_dir(), f"{market}-shareprices-{variant}.csv")
+
 
 class SimFinAPI:
     """
@@ -9,6 +55,7 @@ class SimFinAPI:
     """
 
     def __init__(self):  # ✅ Fixed constructor name
+        import simfin as sf
         self.__load_dotenv()
         self.__token = os.getenv("API_KEY")
         sf.set_api_key(self.__token)
@@ -19,9 +66,11 @@ class SimFinAPI:
         self.share_prices_path = r'C:\Users\Paulm\Desktop\My Files\IE\Courses\Python For data Analysis 2\PyGroupProject\utils\data\raw\de_share_prices_RAW.csv'
 
     def __load_dotenv(self):
-        load_dotenv() 
+        from dotenv import load_dotenv
+        load_dotenv()
 
     def get_companies(self, market='de'):
+        import simfin as sf
         try:
             df_companies = sf.load_companies(market=market)
             df_companies = df_companies.reset_index()
@@ -31,6 +80,7 @@ class SimFinAPI:
             return None
 
     def get_share_prices(self, market='de', variant='daily'):
+        import simfin as sf
         try:
             df_prices = sf.load_shareprices(market=market, variant=variant)
             df_prices = df_prices.reset_index()
@@ -49,6 +99,77 @@ class SimFinAPI:
         companies.to_csv(self.companies_path, index=False)
         print(f"Updated files saved: {self.companies_path} and {self.share_prices_path}")
 
+    def stream_process_and_save(self, market='de', variant='daily', chunksize=250_000,
+                                prices_path=None, output_dir=None, companies_path=None):
+        """
+        Stream the raw SimFin share price file into a Parquet dataset partitioned by
+        ticker, adding company names on the way. See stream_share_prices.
+
+        Args:
+            market (str): SimFin market, e.g. 'de'.
+            variant (str): SimFin share price variant, e.g. 'daily'.
+            chunksize (int): Rows read per chunk.
+            prices_path (str): Raw SimFin CSV to read. Downloaded to the SimFin
+                data directory if None (see download_share_price_file).
+            output_dir (str): Dataset directory. Defaults to
+                'utils/data/raw/<market>_share_prices_RAW'.
+            companies_path (str): Where the company table is saved. Defaults to
+                'utils/data/raw/<market>_companies_data_RAW.csv'.
+
+        Returns:
+            int: Number of rows written.
+        """
+        companies = self.get_companies(market)
+        if companies is None:
+            print("Company data is missing. Skipping processing.")
+            return 0
+
+        if prices_path is None:
+            prices_path = download_share_price_file(market, variant)
+        if output_dir is None:
+            output_dir = os.path.join(RAW_DIR, f"{market}_share_prices_RAW")
+        if companies_path is None:
+            companies_path = os.path.join(RAW_DIR, f"{market}_companies_data_RAW.csv")
+
+        rows = stream_share_prices(prices_path, dict(zip(companies['Ticker'], companies['Company Name'])),
+                                   output_dir, chunksize)
+        companies.to_csv(companies_path, index=False)
+        return rows
+
+
+def stream_share_prices(prices_path, company_names, output_dir, chunksize=250_000):
+    """
+    Read a raw SimFin share price CSV in chunks and append each chunk, with its
+    company names, to a Parquet dataset partitioned by ticker.
+
+    Only one chunk and the ticker -> company name lookup are held in memory, so
+    peak memory depends on the chunk size, not on the length of the history.
+
+    Args:
+        prices_path (str): Semicolon-separated SimFin share price file.
+        company_names (dict): Ticker -> company name.
+        output_dir (str): Dataset directory. Its previous contents are replaced.
+        chunksize (int): Rows read per chunk.
+
+    Returns:
+        int: Number of rows written.
+    """
+    store = PriceStore(output_dir)
+    store.write(pd.DataFrame())  # clear the previous snapshot
+    numeric = {name: 'float64' for name in SHARE_PRICE_SCHEMA.names
+               if SHARE_PRICE_SCHEMA.field(name).type == pa.float64()}
+    reader = pd.read_csv(prices_path, sep=';', chunksize=chunksize, parse_dates=['Date'],
+                         dtype={'Ticker': str, 'SimFinId': 'Int64', 'Volume': 'Int64', **numeric})
+    rows = 0
+    for chunk in reader:
+        chunk['Company Name'] = chunk['Ticker'].map(company_names)
+        store.append(chunk[SHARE_PRICE_SCHEMA.names], schema=SHARE_PRICE_SCHEMA)
+        rows += len(chunk)
+
+    print(f"Streamed {rows} rows to {output_dir}")
+    return rows
+
+
 # ✅ Run the code
 if __name__ == "__main__":
     simfin_api = SimFinAPI()
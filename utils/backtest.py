@@ -0,0 +1,225 @@
+"""
+Historical backtest of the StockPredictor recommendations.
+
+For every ticker with a model, the 2-day forecast that would have been made on
+each past trading day is computed in batched model calls (see
+utils.batch_inference, no look-ahead in the scaling). The recommendation logic
+of StockPredictor.recommend is then applied to all days at once for both risk
+profiles, and the resulting positions are scored with vectorized P&L, drawdown
+and hit-rate computations. Tickers are sharded across processes.
+
+Positions are taken at a day's close and earn the next day's return:
+BUY and "BUY and SELL next day" go long, SELL goes flat, and HOLD keeps the
+current position, except that it closes the one-day position opened by a
+"BUY and SELL next day" signal.
+
+    python -m utils.backtest --workers 4
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from utils import data_access
+from utils.batch_inference import window_forecasts
+from utils.forecast_job import RISK_PROFILES, model_paths, ticker_from_model_path
+from utils.workers import init_worker
+
+ACTIONS = np.array(["HOLD", "BUY", "SELL", "BUY and SELL next day"])
+HOLD, BUY, SELL, BUY_AND_SELL = range(4)
+TRADING_DAYS = 252
+
+
+def recommend_codes(p0, p1, p2, risk_profile):
+    """
+    Vectorized StockPredictor.recommend.
+
+    Args:
+        p0 (np.ndarray): Last actual closes.
+        p1 (np.ndarray): Day 1 forecasts.
+        p2 (np.ndarray): Day 2 forecasts.
+        risk_profile (str): 'high' or 'low'.
+
+    Returns:
+        np.ndarray: Action codes; ACTIONS[codes] gives the action names.
+    """
+    risky = BUY_AND_SELL if risk_profile == "high" else HOLD
+    rising, falling = (p1 > p0), (p1 < p0)
+    return np.select(
+        [
+            rising & (p2 > p1),
+            rising & (p2 < p1) & (p2 < p0),
+            rising & (p2 < p1),
+            falling & (p2 < p1),
+            falling & (p2 > p1) & (p2 > p0),
+            falling & (p2 > p1),
+        ],
+        [BUY, HOLD, risky, SELL, BUY, risky],
+        default=HOLD,
+    )
+
+
+def positions_from_codes(codes):
+    """
+    Turn one ticker's daily action codes into held positions (1 long, 0 flat).
+    """
+    explicit = np.full(len(codes), np.nan)
+    explicit[(codes == BUY) | (codes == BUY_AND_SELL)] = 1.0
+    explicit[codes == SELL] = 0.0
+    after_round_trip = np.r_[False, codes[:-1] == BUY_AND_SELL] & (codes == HOLD)
+    explicit[after_round_trip] = 0.0
+    return pd.Series(explicit).ffill().fillna(0.0).to_numpy()
+
+
+def score(dates, closes, codes, cost_bps=0.0):
+    """
+    Score one ticker's signals.
+
+    Args:
+        dates (np.ndarray): Signal dates.
+        closes (np.ndarray): Closes on those dates.
+        codes (np.ndarray): Action codes on those dates.
+        cost_bps (float): Cost per unit of position change, in basis points.
+
+    Returns:
+        tuple: A dict of summary metrics and a DataFrame with the daily position,
+            strategy return and equity.
+    """
+    positions = positions_from_codes(codes)
+    next_return = np.r_[closes[1:] / closes[:-1] - 1, 0.0]
+    turnover = np.abs(np.diff(np.r_[0.0, positions]))
+    strategy = positions * next_return - turnover * cost_bps / 10_000
+    equity = np.cumprod(1 + strategy)
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+
+    # A signal is right if the close two days later moved the way it bet
+    later = np.r_[closes[2:], np.full(2, np.nan)]
+    directional = (codes == BUY) | (codes == SELL)
+    correct = np.where(codes == BUY, later > closes, later < closes)
+    scored = directional & ~np.isnan(later)
+
+    in_market = positions > 0
+    daily_std = strategy.std()
+    metrics = {
+        'days': len(codes),
+        'trades': int((turnover > 0).sum()),
+        'exposure': float(in_market.mean()) if len(codes) else 0.0,
+        'total_return': float(equity[-1] - 1) if len(codes) else 0.0,
+        'buy_and_hold_return': float(closes[-1] / closes[0] - 1) if len(codes) else 0.0,
+        'sharpe': float(strategy.mean() / daily_std * np.sqrt(TRADING_DAYS)) if daily_std > 0 else 0.0,
+        'max_drawdown': float(drawdown.min()) if len(codes) else 0.0,
+        'hit_rate': float((strategy[in_market] > 0).mean()) if in_market.any() else float('nan'),
+        'signal_accuracy': float(correct[scored].mean()) if scored.any() else float('nan'),
+    }
+    daily = pd.DataFrame({
+        'Date': dates, 'Close': closes, 'Action': ACTIONS[codes], 'Position': positions,
+        'Strategy_Return': strategy, 'Equity': equity,
+    })
+    return metrics, daily
+
+
+def backtest_ticker(ticker, model_path, backend='numpy', cost_bps=0.0, scaling='model'):
+    """
+    Backtest both risk profiles for one ticker.
+
+    With 'model' scaling every day is forecast with the scaler the model is
+    served with today (see batch_inference.window_forecasts); 'expanding'
+    rescales by the history up to each day instead, with no look-ahead.
+
+    Returns:
+        tuple: Summary rows (one per risk profile) and the daily frame.
+    """
+    from utils.lstm_predictor import served_model
+
+    df = data_access.prices_for(ticker)
+    closes = df['Close'].to_numpy(dtype=np.float64)
+    model, bundle = served_model(model_path, backend=backend)
+    origins, forecasts = window_forecasts(model, closes, days=2, scaling=scaling,
+                                          scaler=bundle.scaler if bundle is not None else None)
+    p0 = closes[origins]
+    dates = df['Date'].to_numpy()[origins]
+
+    rows, frames = [], []
+    for risk_profile in RISK_PROFILES:
+        codes = recommend_codes(p0, forecasts[:, 0], forecasts[:, 1], risk_profile)
+        metrics, daily = score(dates, p0, codes, cost_bps)
+        rows.append({'ticker': ticker, 'risk_profile': risk_profile, **metrics})
+        daily.insert(0, 'Risk_Profile', risk_profile)
+        daily.insert(0, 'Ticker', ticker)
+        frames.append(daily)
+    return rows, pd.concat(frames, ignore_index=True)
+
+
+def backtest_shard(jobs, backend='numpy', cost_bps=0.0, scaling='model'):
+    """
+    Backtest a list of (ticker, model_path) pairs in one process.
+    """
+    rows, frames = [], []
+    for ticker, model_path in jobs:
+        ticker_rows, daily = backtest_ticker(ticker, model_path, backend, cost_bps, scaling)
+        rows.extend(ticker_rows)
+        frames.append(daily)
+    return rows, frames
+
+
+def run_backtest(models_dir='utils/models', workers=None, backend='numpy', cost_bps=0.0, threads_per_worker=1,
+                 scaling='model'):
+    """
+    Backtest every ticker that has a model, sharding the tickers across processes.
+
+    Args:
+        models_dir (str): Directory holding lstm_model_<TICKER>.h5 files or their .npz bundles.
+        workers (int): Number of processes. Defaults to cpu_count // threads_per_worker.
+        backend (str): Model backend, 'numpy' or 'keras'.
+        cost_bps (float): Transaction cost per position change, in basis points.
+        threads_per_worker (int): BLAS/TensorFlow threads per process.
+        scaling (str): 'model', 'expanding' or 'full', see batch_inference.window_forecasts.
+
+    Returns:
+        tuple: The summary DataFrame (one row per ticker and risk profile) and
+            the daily DataFrame.
+    """
+    jobs = [(ticker_from_model_path(path), path) for path in model_paths(models_dir)]
+    jobs = [(ticker, path) for ticker, path in jobs if not data_access.prices_for(ticker).empty]
+    workers = max(1, min(workers or (os.cpu_count() or 1) // threads_per_worker, len(jobs) or 1))
+    shards = [jobs[i::workers] for i in range(workers) if jobs[i::workers]]
+
+    rows, frames = [], []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=init_worker, initargs=(threads_per_worker,)) as pool:
+        futures = [pool.submit(backtest_shard, shard, backend, cost_bps, scaling) for shard in shards]
+        for future in as_completed(futures):
+            shard_rows, shard_frames = future.result()
+            rows.extend(shard_rows)
+            frames.extend(shard_frames)
+
+    summary = pd.DataFrame(rows).sort_values(['ticker', 'risk_profile']).reset_index(drop=True)
+    daily = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return summary, daily
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest the trading recommendations on history.")
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: cores / threads)")
+    parser.add_argument('--threads', type=int, default=1, help="BLAS/TensorFlow threads per process")
+    parser.add_argument('--backend', default='numpy', choices=['numpy', 'keras'])
+    parser.add_argument('--cost-bps', type=float, default=0.0, help="cost per position change in basis points")
+    parser.add_argument('--scaling', default='model', choices=['model', 'expanding', 'full'],
+                        help="scale windows like the served model, by the history up to each day, "
+                             "or by the whole history")
+    parser.add_argument('--models-dir', default='utils/models')
+    parser.add_argument('--out-dir', default='utils/data/backtest')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary, daily = run_backtest(args.models_dir, args.workers, args.backend, args.cost_bps, args.threads,
+                                  args.scaling)
+    os.makedirs(args.out_dir, exist_ok=True)
+    summary.to_csv(os.path.join(args.out_dir, 'summary.csv'), index=False)
+    daily.to_parquet(os.path.join(args.out_dir, 'daily.parquet'), index=False)
+    print(summary.to_string(index=False))
+    print(f"Backtested {summary['ticker'].nunique()} tickers in {time.perf_counter() - start:.1f}s")
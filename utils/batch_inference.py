@@ -0,0 +1,71 @@
+"""
+Forecasts from every historical window of a price series in a few batched calls.
+
+StockPredictor forecasts from the latest 50 closes only. Backtests and
+evaluations need the forecast that would have been made on every past date,
+so here all windows of a series are scaled and predicted together: one batched
+model call per forecast day instead of one call per window and day.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+SEQUENCE_LENGTH = 50
+
+
+def window_forecasts(model, closes, days=2, sequence_length=SEQUENCE_LENGTH, scaling='expanding',
+                     batch_size=4096, scaler=None):
+    """
+    Forecast `days` closes ahead from every `sequence_length`-day window of a series.
+
+    Multi-day forecasts feed each prediction back into the window, like
+    StockPredictor.predict_multiple_days.
+
+    Args:
+        model: A Keras model or NumpyLSTM (anything with `predict(x, batch_size=...)`).
+        closes (np.ndarray): 1-D closes, oldest first.
+        days (int): Forecast horizon.
+        sequence_length (int): Window length the model was trained on.
+        scaling (str): 'expanding' scales each window by the min/max of the closes
+            up to its last day, i.e. what a StockPredictor without a bundle would
+            have fitted on that day, with no look-ahead. 'full' uses the min/max of
+            the whole series. 'model' uses `scaler`, the one StockPredictor
+            forecasts with today: the bundle's scaler, or without a bundle, the
+            same as 'full'.
+        batch_size (int): Windows per model call.
+        scaler: For 'model' scaling, a fitted scaler with `data_min_` and `data_max_`,
+            e.g. ModelBundle.scaler. None if the model has no bundle.
+
+    Returns:
+        tuple: origins, the index of each window's last close, shape (n,), and
+            forecasts, the predicted closes for the following days, shape (n, days).
+    """
+    closes = np.asarray(closes, dtype=np.float64).reshape(-1)
+    n_windows = len(closes) - sequence_length + 1
+    if n_windows <= 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, days))
+
+    if scaling == 'expanding':
+        low = np.minimum.accumulate(closes)[sequence_length - 1:]
+        high = np.maximum.accumulate(closes)[sequence_length - 1:]
+    elif scaling == 'full' or (scaling == 'model' and scaler is None):
+        low = np.full(n_windows, closes.min())
+        high = np.full(n_windows, closes.max())
+    elif scaling == 'model':
+        low = np.full(n_windows, float(scaler.data_min_[0]))
+        high = np.full(n_windows, float(scaler.data_max_[0]))
+    else:
+        raise ValueError(f"Unknown scaling: {scaling}")
+    # MinMaxScaler leaves a constant series unscaled instead of dividing by zero
+    span = np.where(high > low, high - low, 1.0)
+
+    windows = (sliding_window_view(closes, sequence_length) - low[:, None]) / span[:, None]
+    forecasts = np.empty((n_windows, days))
+    for day in range(days):
+        pred = np.asarray(model.predict(windows[:, :, None], batch_size=batch_size, verbose=0),
+                          dtype=np.float64).reshape(-1)
+        forecasts[:, day] = pred
+        if day + 1 < days:
+            windows = np.concatenate([windows[:, 1:], pred[:, None]], axis=1)
+
+    origins = np.arange(sequence_length - 1, len(closes))
+    return origins, forecasts * span[:, None] + low[:, None]
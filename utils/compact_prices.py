@@ -0,0 +1,205 @@
+"""
+Compact, memory-mapped copy of the processed price table.
+
+The Parquet store decodes into a DataFrame with Python string objects for
+Ticker, Company Name, Day_of_Week and Category and 8-byte numbers elsewhere,
+and every process that reads it holds its own copy. Here the table is written
+once as one .npy file per column, in compact types:
+
+- string columns become dictionary codes (int8/int16/int32) plus a category list,
+- Open, High, Low, Close and Adj. Close become float32 when every value still
+  rounds to the same cent,
+- integer columns get the smallest integer type that holds them,
+- Date becomes int32 days since 1970-01-01.
+
+`open_frame` maps the files read-only and wraps them in a DataFrame without
+copying them (Date is the one column converted, to datetime64), so every Streamlit
+session and worker process on the machine shares the same pages of the OS page
+cache. The copy is rebuilt when the price store changes.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_COLUMNS = ('Ticker', 'Company Name', 'Day_of_Week', 'Category')
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Adj. Close')
+INT_TYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def compact_path(store_root):
+    """Directory of the compact copy belonging to a price store."""
+    return store_root + '_compact'
+
+
+def source_signature(store_root):
+    """
+    Short hash identifying the contents of a price store: its version stamp, or
+    for a store written without one, the names, mtimes and sizes of its files.
+    """
+    from utils.price_store import PriceStore
+
+    version = PriceStore(store_root).version()
+    if version is not None:
+        return hashlib.sha256(version.encode()).hexdigest()[:16]
+    entries = []
+    for dirpath, _, filenames in os.walk(store_root):
+        for filename in filenames:
+            full = os.path.join(dirpath, filename)
+            stat = os.stat(full)
+            entries.append(f"{os.path.relpath(full, store_root)}:{stat.st_mtime_ns}:{stat.st_size}")
+    return hashlib.sha256('\n'.join(sorted(entries)).encode()).hexdigest()[:16]
+
+
+def _smallest_int(values):
+    if len(values) == 0:
+        return np.int8
+    low, high = values.min(), values.max()
+    return next(t for t in INT_TYPES if np.iinfo(t).min <= low and high <= np.iinfo(t).max)
+
+
+def encode(df):
+    """
+    Convert a price table to compact column arrays.
+
+    Args:
+        df (pd.DataFrame): Processed share prices.
+
+    Returns:
+        tuple: A dict of column name -> NumPy array, and the column metadata
+            (kind, and the categories of categorical columns) in column order.
+    """
+    arrays, columns = {}, []
+    for name in df.columns:
+        series = df[name]
+        column = {'name': name}
+        if name == 'Date':
+            days = series.to_numpy().astype('datetime64[D]').astype(np.int64)
+            arrays[name] = days.astype(np.int32)
+            column['kind'] = 'date'
+        elif name in CATEGORICAL_COLUMNS or series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype):
+            categorical = pd.Categorical(series)
+            arrays[name] = categorical.codes
+            column['kind'] = 'category'
+            column['categories'] = [str(c) for c in categorical.categories]
+        elif pd.api.types.is_bool_dtype(series):
+            arrays[name] = series.to_numpy(dtype=np.bool_)
+            column['kind'] = 'number'
+        elif pd.api.types.is_integer_dtype(series):
+            values = series.to_numpy()
+            arrays[name] = values.astype(_smallest_int(values))
+            column['kind'] = 'number'
+        else:
+            values = series.to_numpy(dtype=np.float64)
+            narrow = values.astype(np.float32)
+            fits = name in PRICE_COLUMNS and np.array_equal(
+                np.round(narrow.astype(np.float64), 2), np.round(values, 2), equal_nan=True)
+            arrays[name] = narrow if fits else values
+            column['kind'] = 'number'
+        columns.append(column)
+    return arrays, columns
+
+
+def write(df, root, signature):
+    """
+    Write the compact copy of a price table under `root/<signature>`.
+
+    The files are written to a temporary directory that is then renamed, so a
+    reader never maps a partial copy. Copies of older signatures are removed;
+    processes that still map them keep their pages until they let go.
+    """
+    arrays, columns = encode(df)
+    os.makedirs(root, exist_ok=True)
+    target = os.path.join(root, signature)
+    tmp = os.path.join(root, f".tmp-{os.getpid()}-{signature}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for i, column in enumerate(columns):
+        column['file'] = f"{i:03d}.npy"
+        np.save(os.path.join(tmp, column['file']), arrays[column['name']])
+    with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+        json.dump({'signature': signature, 'rows': len(df), 'columns': columns}, f)
+    try:
+        os.rename(tmp, target)
+    except OSError:
+        # Another process wrote the same copy first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    for name in os.listdir(root):
+        if name != signature and not name.startswith('.tmp-'):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def open_frame(root, signature, columns=None):
+    """
+    Map a compact copy into a DataFrame.
+
+    Args:
+        root (str): Directory of the compact copies.
+        signature (str): source_signature of the store the copy must match.
+        columns (list): Columns to map. All if None.
+
+    Returns:
+        pd.DataFrame or None: A read-only frame backed by the mapped files, or
+            None if there is no copy for this signature.
+    """
+    target = os.path.join(root, signature)
+    meta_path = os.path.join(target, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    data = {}
+    for column in meta['columns']:
+        if columns is not None and column['name'] not in columns:
+            continue
+        values = np.load(os.path.join(target, column['file']), mmap_mode='r')
+        if column['kind'] == 'date':
+            data[column['name']] = values.astype('datetime64[D]').astype('datetime64[ns]')
+        elif column['kind'] == 'category':
+            data[column['name']] = pd.Categorical.from_codes(values, categories=column['categories'], validate=False)
+        else:
+            data[column['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def load(store):
+    """
+    Return the price store's table as a mapped compact frame, writing the compact copy first if it is missing or stale.
+
+    Args:
+        store (PriceStore): The source store.
+    """
+    root = compact_path(store.root)
+    signature = source_signature(store.root)
+    df = open_frame(root, signature)
+    if df is None:
+        write(store.read(), root, signature)
+        df = open_frame(root, signature)
+    return df
+
+
+def frame_nbytes(df):
+    """
+    Bytes held by a frame's columns, counting category lists but not the string
+    contents of object columns.
+    """
+    return int(df.memory_usage(index=False, deep=False).sum())
+
+
+if __name__ == "__main__":
+    from utils.price_store import PriceStore
+
+    store = PriceStore()
+    full = store.read()
+    compact = load(store)
+    print(f"{len(full)} rows written to {compact_path(store.root)}")
+    print(f"{'column':<20}{'store dtype':>14}{'compact dtype':>16}")
+    for name in full.columns:
+        print(f"{name:<20}{str(full[name].dtype):>14}{str(compact[name].dtype):>16}")
+    print(f"in-memory size: {full.memory_usage(index=False, deep=True).sum() / 1e6:.1f} MB decoded, "
+          f"{frame_nbytes(compact) / 1e6:.1f} MB compact")
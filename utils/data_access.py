@@ -0,0 +1,226 @@
+"""
+Process-wide access to the price and company tables.
+
+Streamlit re-runs page scripts for every interaction and every session, but
+imported modules live for the whole server process. The tables are therefore
+loaded once here and shared by all sessions. A table is reloaded when its file
+changes, or, for the price store, when a write replaces its version stamp.
+
+The returned DataFrames are shared: callers must treat them as read-only and
+``.copy()`` before modifying them. The price table is backed by read-only
+memory-mapped files, so writing to its arrays raises.
+"""
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from utils.instrumentation import span
+from utils.price_index import PriceIndex
+from utils.price_store import PriceStore
+
+COMPANIES_PATH = 'utils/data/raw/de_companies_data_RAW.csv'
+
+_lock = threading.RLock()  # reentrant: derived tables load their source tables
+_tables: Dict[str, Tuple[tuple, pd.DataFrame]] = {}
+_price_store = PriceStore()
+
+
+def _signature(path: str) -> tuple:
+    """
+    Cheap change marker for a file or a price store directory.
+
+    A file is identified by its inode, mtime and size. A directory is identified
+    by its PriceStore version stamp, which every write replaces, so checking it
+    costs one stat however many partition files the store has. Directories
+    without a stamp fall back to their own mtime.
+    """
+    for candidate in (os.path.join(path, PriceStore.VERSION_FILE), path):
+        try:
+            stat = os.stat(candidate)
+        except OSError:
+            continue
+        return candidate, stat.st_ino, stat.st_mtime_ns, stat.st_size
+    return path, None  # missing; the loader decides what that means
+
+
+def _cached(key: str, path: Union[str, Tuple[str, ...]], loader: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    paths = (path,) if isinstance(path, str) else path
+    signature = tuple(_signature(p) for p in paths)
+    entry = _tables.get(key)
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+
+    with _lock:
+        # Another session may have reloaded the table while we waited.
+        entry = _tables.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        with span('data.load', table=key):
+            df = loader()
+        _tables[key] = (signature, df)
+        return df
+
+
+def cached_table(path: str, loader: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """Load a table with `loader` once per process, reloading it when the file at `path` changes."""
+    return _cached(path, path, loader)
+
+
+def set_price_store(store: PriceStore) -> None:
+    """Point the access layer at a different price store and drop cached tables."""
+    global _price_store
+    with _lock:
+        _price_store = store
+        _tables.clear()
+
+
+def prices() -> pd.DataFrame:
+    """
+    All processed share prices, sorted by Ticker and Date.
+
+    The table is the memory-mapped compact copy of the price store (see
+    utils.compact_prices): string columns are categorical, prices float32 and
+    the arrays read-only, shared with every other process that maps them.
+    """
+    from utils import compact_prices
+
+    return _cached('prices', _price_store.root, lambda: compact_prices.load(_price_store))
+
+
+def price_index() -> PriceIndex:
+    """The per-ticker slice index over `prices()`."""
+    return _cached('price_index', _price_store.root, lambda: PriceIndex(prices()))
+
+
+def indicators() -> pd.DataFrame:
+    """
+    Technical indicators of all prices (see utils.indicators), sorted by Ticker and Date.
+
+    They are read from the table SharePriceProcessor writes next to the price
+    store, and only computed here if that table is missing.
+    """
+    from utils.indicators import compute_indicators, indicators_path
+
+    path = indicators_path(_price_store.root)
+
+    def load():
+        if os.path.exists(path):
+            return pd.read_parquet(path)
+        return compute_indicators(prices())
+
+    return _cached('indicators', (path, _price_store.root), load)
+
+
+def indicators_for(ticker: str, start: Optional[pd.Timestamp] = None,
+                   end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """
+    Technical indicators of one ticker, sorted by Date, as a view of the shared table.
+
+    Args:
+        ticker (str): Ticker symbol, e.g. 'BMW.DE'.
+        start: Inclusive lower bound on Date. No bound if None.
+        end: Inclusive upper bound on Date. No bound if None.
+    """
+    from utils.indicators import indicators_path
+
+    index = _cached('indicator_index', (indicators_path(_price_store.root), _price_store.root),
+                    lambda: PriceIndex(indicators()))
+    return index.slice(ticker, start, end)
+
+
+def companies() -> pd.DataFrame:
+    """The raw company table."""
+    return _cached('companies', COMPANIES_PATH, lambda: pd.read_csv(COMPANIES_PATH))
+
+
+def sector_indices() -> pd.DataFrame:
+    """Market-cap-weighted index series of every sector, recomputed when the prices or companies change."""
+    from utils.sector_index import compute_sector_indices
+
+    return _cached('sector_indices', (_price_store.root, COMPANIES_PATH),
+                   lambda: compute_sector_indices(prices(), companies()))
+
+
+def sector_index(sector: int) -> pd.DataFrame:
+    """The index series of one sector (IndustryId // 1000), sorted by Date."""
+    df = sector_indices()
+    return df[df['Sector'] == sector].reset_index(drop=True)
+
+
+def sector_tickers(sector: int) -> List[str]:
+    """Sorted tickers of a sector that have share prices."""
+    from utils.sector_index import sector_members
+
+    members = sector_members(companies())
+    tickers = members.loc[members['Sector'] == sector, 'Ticker']
+    return sorted(set(tickers) & set(prices()['Ticker'].unique()))
+
+
+def prices_for(ticker: str, start: Optional[pd.Timestamp] = None,
+               end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """
+    Share prices for one ticker, sorted by Date.
+
+    The result is a view of the shared table found by binary search, so the
+    lookup time does not grow with the number of tickers.
+
+    Args:
+        ticker (str): Ticker symbol, e.g. 'BMW.DE'.
+        start: Inclusive lower bound on Date. No bound if None.
+        end: Inclusive upper bound on Date. No bound if None.
+    """
+    with span('data.filter', ticker=ticker):
+        return price_index().slice(ticker, start, end)
+
+
+def exact_prices_for(ticker: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Share prices for one ticker read from the price store itself, with float64 prices.
+
+    prices_for serves the float32 compact copy, which is fine for charts and
+    forecasts. Anything fitted on the closes and stored, like a model's scaler,
+    should see the exact values instead. Not cached.
+
+    Args:
+        ticker (str): Ticker symbol, e.g. 'BMW.DE'.
+        columns (list): Columns to load besides Ticker and Date. All if None.
+    """
+    with span('data.read_exact', ticker=ticker):
+        return _price_store.read(columns=columns, tickers=[ticker])
+
+
+def prices_for_tickers(tickers: List[str], start: Optional[pd.Timestamp] = None,
+                       end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """
+    Share prices for several tickers, sorted by Ticker and Date.
+
+    Args:
+        tickers (list): Ticker symbols.
+        start: Inclusive lower bound on Date. No bound if None.
+        end: Inclusive upper bound on Date. No bound if None.
+    """
+    index = price_index()
+    with span('data.filter', tickers=len(tickers)):
+        slices = [index.slice(ticker, start, end) for ticker in sorted(set(tickers))]
+        if not slices:
+            return prices().iloc[0:0]
+        return pd.concat(slices, ignore_index=True)
+
+
+def company_names() -> List[str]:
+    """Sorted names of all companies that have share prices."""
+    return sorted(prices()['Company Name'].dropna().unique())
+
+
+def ticker_for(company_name: str) -> Optional[str]:
+    """The ticker of a company in the price table, or None if it is unknown."""
+    return price_index().ticker_for(company_name)
+
+
+def company_info(name: str) -> Optional[pd.Series]:
+    """The company table row for a company name, or None if it is unknown."""
+    df = companies()
+    rows = df[df['Company Name'] == name]
+    return rows.iloc[0] if not rows.empty else None
@@ -0,0 +1,137 @@
+"""
+Shape-preserving downsampling of price series for charts.
+
+A chart cannot show more points than it has pixel columns, so long histories
+are reduced before they are sent to the browser. Both methods return the
+positions of the points to keep, so any column of the original frame can be
+taken at the same rows, and both keep the first and last point whenever the
+budget allows two points.
+
+- LTTB (Largest-Triangle-Three-Buckets) keeps, per bucket, the point that
+  forms the largest triangle with its neighbours: the visual shape survives.
+- Min/max bucketing keeps each bucket's lowest and highest point: every peak
+  and trough survives.
+"""
+import numpy as np
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').astype(np.int64)
+    return x.astype(np.float64)
+
+
+def _endpoints(n, n_out):
+    """The first and last position, or only the last one (or none) if the budget is smaller."""
+    if n_out >= 2:
+        return np.array([0, n - 1])
+    return np.array([n - 1] if n_out == 1 else [], dtype=np.int64)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Pick `n_out` points with Largest-Triangle-Three-Buckets.
+
+    Args:
+        x (np.ndarray): Increasing x values (numbers or datetimes).
+        y (np.ndarray): y values.
+        n_out (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted positions of the kept points (all positions if the
+            series is no longer than `n_out`, only the endpoints if `n_out` < 3).
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return _endpoints(n, n_out)
+    x, y = _as_float(x), np.asarray(y, dtype=np.float64)
+
+    # n_out - 2 buckets over the points between the fixed first and last point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Third triangle corner of every bucket: the average of the next bucket, or the last point
+    cum_x = np.r_[0.0, np.cumsum(x)]
+    cum_y = np.r_[0.0, np.cumsum(y)]
+    next_start, next_stop = edges[1:-1], edges[2:]
+    avg_x = np.r_[(cum_x[next_stop] - cum_x[next_start]) / (next_stop - next_start), x[-1]].tolist()
+    avg_y = np.r_[(cum_y[next_stop] - cum_y[next_start]) / (next_stop - next_start), y[-1]].tolist()
+
+    # Only the chosen point carries over between buckets. Small buckets are scanned
+    # with Python floats, which beats NumPy's per-call overhead; large ones in NumPy.
+    x_list, y_list, edge_list = x.tolist(), y.tolist(), edges.tolist()
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edge_list[i], edge_list[i + 1]
+        xa, ya = x_list[a], y_list[a]
+        dx, dy = xa - avg_x[i], avg_y[i] - ya
+        if stop - start <= 64:
+            best = -1.0
+            for j in range(start, stop):
+                area = abs(dx * (y_list[j] - ya) - (xa - x_list[j]) * dy)
+                if area > best:
+                    best, a = area, j
+        else:
+            area = np.abs(dx * (y[start:stop] - ya) - (xa - x[start:stop]) * dy)
+            a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """
+    Keep the first and last point, and the lowest and highest point of each of
+    `(n_out - 2) // 2` equal buckets over the points in between.
+
+    Args:
+        y (np.ndarray): y values.
+        n_out (int): Maximum number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted, unique positions of the kept points.
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    # Two of the n_out slots are the endpoints, the rest are two per bucket
+    buckets = (n_out - 2) // 2
+    if buckets < 1:
+        return _endpoints(n, n_out)
+    inner = n - 2
+    size = -(-inner // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:inner] = y[1:-1]
+    padded = padded.reshape(buckets, size)
+    valid = ~np.isnan(padded).all(axis=1)
+    offsets = 1 + np.arange(buckets) * size
+    lows = offsets[valid] + np.nanargmin(padded[valid], axis=1)
+    highs = offsets[valid] + np.nanargmax(padded[valid], axis=1)
+    return np.unique(np.r_[0, lows, highs, n - 1])
+
+
+def downsample(df, max_points, x='Date', y='Close', method='lttb'):
+    """
+    Reduce a frame to at most `max_points` rows for plotting.
+
+    Args:
+        df (pd.DataFrame): Rows sorted by `x`.
+        max_points (int): Point budget, normally the chart width in pixels.
+        x (str): x column.
+        y (str): y column the shape is preserved for.
+        method (str): 'lttb' or 'minmax'.
+
+    Returns:
+        pd.DataFrame: `df` itself if it is within budget, else the kept rows.
+    """
+    if len(df) <= max_points:
+        return df
+    if method == 'lttb':
+        positions = lttb_indices(df[x].to_numpy(), df[y].to_numpy(), max_points)
+    elif method == 'minmax':
+        positions = minmax_indices(df[y].to_numpy(dtype=np.float64, na_value=np.nan), max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return df.iloc[positions]
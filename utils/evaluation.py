@@ -0,0 +1,193 @@
+"""
+Rolling-origin evaluation of the served LSTM models.
+
+Every historical 50-day window of a ticker is forecast in batched model calls
+(utils.batch_inference), giving the 1-day and 2-day forecasts that would have
+been made on each past trading day. These are compared with the closes that
+followed to report RMSE, MAPE and directional accuracy, both over the whole
+history and on a rolling window, so drifts in accuracy show up over time.
+Models are evaluated in parallel processes.
+
+    python -m utils.evaluation --window 63
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from utils import data_access
+from utils.batch_inference import window_forecasts
+from utils.forecast_job import model_paths, ticker_from_model_path
+from utils.workers import init_worker
+
+HORIZONS = (1, 2)
+
+
+def forecast_errors(dates, closes, origins, forecasts):
+    """
+    Line up each forecast with the close it predicted.
+
+    Args:
+        dates (np.ndarray): Dates of all closes.
+        closes (np.ndarray): All closes.
+        origins (np.ndarray): Index of the last close of each forecast window.
+        forecasts (np.ndarray): Forecast closes, shape (len(origins), max horizon).
+
+    Returns:
+        pd.DataFrame: One row per origin date and horizon whose target is known,
+            with the actual and predicted close and whether the direction was right.
+    """
+    frames = []
+    for horizon in HORIZONS:
+        known = origins + horizon < len(closes)
+        origin = origins[known]
+        actual = closes[origin + horizon]
+        predicted = forecasts[known, horizon - 1]
+        base = closes[origin]
+        frames.append(pd.DataFrame({
+            'Date': dates[origin],
+            'Horizon': horizon,
+            'Actual': actual,
+            'Predicted': predicted,
+            'Direction_Correct': np.sign(predicted - base) == np.sign(actual - base),
+        }))
+    df = pd.concat(frames, ignore_index=True)
+    df['Error'] = df['Predicted'] - df['Actual']
+    df['APE'] = np.abs(df['Error'] / df['Actual'])
+    return df
+
+
+def rolling_metrics(errors, window=63):
+    """
+    Rolling RMSE, MAPE (%) and directional accuracy per horizon.
+
+    Args:
+        errors (pd.DataFrame): Output of `forecast_errors`.
+        window (int): Forecasts per rolling window (63 is about a quarter).
+
+    Returns:
+        pd.DataFrame: Date, Horizon, RMSE, MAPE and Directional_Accuracy, with
+            NaN until a window is full.
+    """
+    errors = errors.sort_values(['Horizon', 'Date'])
+    grouped = errors.assign(Squared=errors['Error'] ** 2).groupby('Horizon')
+    return pd.DataFrame({
+        'Date': errors['Date'].to_numpy(),
+        'Horizon': errors['Horizon'].to_numpy(),
+        'RMSE': np.sqrt(grouped['Squared'].rolling(window).mean().to_numpy()),
+        'MAPE': grouped['APE'].rolling(window).mean().to_numpy() * 100,
+        'Directional_Accuracy': grouped['Direction_Correct'].rolling(window).mean().to_numpy(),
+    })
+
+
+def summarize(errors):
+    """
+    Whole-history RMSE, MAPE (%) and directional accuracy per horizon.
+    """
+    summary = errors.assign(Squared=errors['Error'] ** 2).groupby('Horizon').agg(
+        forecasts=('Error', 'size'),
+        rmse=('Squared', 'mean'),
+        mape=('APE', 'mean'),
+        directional_accuracy=('Direction_Correct', 'mean'),
+    ).reset_index()
+    summary['rmse'] = np.sqrt(summary['rmse'])
+    summary['mape'] = summary['mape'] * 100
+    return summary
+
+
+def evaluate_model(model_path, backend='numpy', window=63, scaling='model', batch_size=4096):
+    """
+    Evaluate one model over its ticker's whole history.
+
+    Args:
+        model_path (str): Path to an lstm_model_<TICKER>.h5 file. Its .npz bundle
+            is used when only that exists, as StockPredictor does.
+        backend (str): Model backend, 'numpy' or 'keras'.
+        window (int): Rolling window length.
+        scaling (str): 'model' (the scaler the model is served with), 'expanding'
+            (no look-ahead) or 'full', see window_forecasts.
+        batch_size (int): Windows per model call.
+
+    Returns:
+        tuple: Summary rows (one per horizon) and the rolling metrics frame,
+            both with a Ticker column.
+    """
+    from utils.lstm_predictor import served_model
+
+    ticker = ticker_from_model_path(model_path)
+    df = data_access.prices_for(ticker)
+    closes = df['Close'].to_numpy(dtype=np.float64)
+    model, bundle = served_model(model_path, backend=backend)
+
+    start = time.perf_counter()
+    origins, forecasts = window_forecasts(model, closes, days=max(HORIZONS), scaling=scaling, batch_size=batch_size,
+                                          scaler=bundle.scaler if bundle is not None else None)
+    inference_s = time.perf_counter() - start
+
+    errors = forecast_errors(df['Date'].to_numpy(), closes, origins, forecasts)
+    summary = summarize(errors)
+    summary.insert(0, 'ticker', ticker)
+    summary['inference_s'] = round(inference_s, 2)
+    rolling = rolling_metrics(errors, window)
+    rolling.insert(0, 'Ticker', ticker)
+    return summary, rolling
+
+
+def evaluate_all(models_dir='utils/models', workers=None, backend='numpy', window=63, scaling='model',
+                 threads_per_worker=1):
+    """
+    Evaluate every model in a directory, one process per model at a time.
+
+    Returns:
+        tuple: The summary DataFrame (one row per ticker and horizon) and the
+            rolling metrics DataFrame.
+    """
+    paths = [path for path in model_paths(models_dir)
+             if not data_access.prices_for(ticker_from_model_path(path)).empty]
+    workers = max(1, min(workers or (os.cpu_count() or 1) // threads_per_worker, len(paths) or 1))
+
+    summaries, rollings = [], []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=init_worker, initargs=(threads_per_worker,)) as pool:
+        futures = {pool.submit(evaluate_model, path, backend, window, scaling): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                summary, rolling = future.result()
+            except Exception as e:
+                print(f"{futures[future]}: error: {e}")
+                continue
+            summaries.append(summary)
+            rollings.append(rolling)
+
+    if not summaries:
+        return pd.DataFrame(), pd.DataFrame()
+    summary = pd.concat(summaries, ignore_index=True).sort_values(['ticker', 'Horizon']).reset_index(drop=True)
+    return summary, pd.concat(rollings, ignore_index=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rolling-origin evaluation of the saved LSTM models.")
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: cores / threads)")
+    parser.add_argument('--threads', type=int, default=1, help="BLAS/TensorFlow threads per process")
+    parser.add_argument('--backend', default='numpy', choices=['numpy', 'keras'])
+    parser.add_argument('--window', type=int, default=63, help="forecasts per rolling window")
+    parser.add_argument('--scaling', default='model', choices=['model', 'expanding', 'full'],
+                        help="scale windows like the served model, by the history up to each window, "
+                             "or by the whole history")
+    parser.add_argument('--models-dir', default='utils/models')
+    parser.add_argument('--out-dir', default='utils/data/evaluation')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary, rolling = evaluate_all(args.models_dir, args.workers, args.backend, args.window, args.scaling,
+                                    args.threads)
+    os.makedirs(args.out_dir, exist_ok=True)
+    summary.to_csv(os.path.join(args.out_dir, 'summary.csv'), index=False)
+    rolling.to_parquet(os.path.join(args.out_dir, 'rolling.parquet'), index=False)
+    print(summary.to_string(index=False))
+    print(f"Evaluated {summary['ticker'].nunique() if not summary.empty else 0} models "
+          f"in {time.perf_counter() - start:.1f}s")
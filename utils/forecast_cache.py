@@ -0,0 +1,175 @@
+"""
+Persistent memoization of live forecasts.
+
+A forecast depends only on the model file, the scaled input window (the last
+closes plus the scaler's min/max, which come from the whole history), the
+horizon and the inference backend. The cache keys results on a hash of those,
+stores each result as a small JSON file, and keeps the directory under a size
+cap by evicting the least recently used entries. Results survive server
+restarts and are shared by every process that uses the same directory.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.forecast_job import served_model_version
+
+
+class ForecastCache:
+    """
+    On-disk, size-capped store of forecasts keyed by model, input window and horizon.
+    """
+
+    def __init__(self, root='utils/data/forecasts/memo', max_bytes=None):
+        """
+        Initialize the cache. Nothing is read from disk until it is first used.
+
+        Args:
+            root (str): Directory the entries are stored in.
+            max_bytes (int): Cap on the summed size of the entry files. Defaults to
+                the FORECAST_CACHE_MAX_MB environment variable, or 64 MB.
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("FORECAST_CACHE_MAX_MB", 64)) * 1024 * 1024)
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes = None  # summed entry size, scanned on first use
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def key(model_path, window, scale, horizon, backend):
+        """
+        Return the cache key of a forecast.
+
+        Args:
+            model_path (str): The model file; its version (see served_model_version) is used, not its name.
+            window (np.ndarray): The raw input closes.
+            scale (tuple): The scaler's (data_min, data_max).
+            horizon (int): Number of days forecast.
+            backend (str): Name of the inference backend.
+
+        Returns:
+            str: A hex digest.
+        """
+        digest = hashlib.sha256()
+        digest.update(served_model_version(model_path).encode())
+        digest.update(np.ascontiguousarray(window, dtype=np.float64).tobytes())
+        digest.update(np.asarray(scale, dtype=np.float64).tobytes())
+        digest.update(f"{horizon}:{backend}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key + '.json')
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith('.json'):
+                    yield os.path.join(dirpath, filename)
+
+    def _scan(self):
+        if self._bytes is None:
+            self._bytes = sum(os.path.getsize(path) for path in self._entries())
+
+    def get(self, key):
+        """
+        Return the stored value for a key, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                value = json.load(f)
+            os.utime(path)  # mark as recently used for eviction
+        except (OSError, ValueError):
+            with self._lock:
+                self._stats['misses'] += 1
+            return None
+        with self._lock:
+            self._stats['hits'] += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store a JSON-serializable value, evicting old entries if the cache grows over its cap.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(value, f)
+        size = os.path.getsize(tmp_path)
+        with self._lock:
+            self._scan()
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._bytes += size - old_size
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the stored value for a key, computing and storing it on a miss.
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _evict(self):
+        # Drop least recently used entries until the cache is back under 90% of its cap
+        entries = []
+        for path in self._entries():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        self._bytes = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._bytes <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._bytes -= size
+            self._stats['evictions'] += 1
+
+    def clear(self):
+        """
+        Delete every entry. Statistics are kept.
+        """
+        with self._lock:
+            for path in list(self._entries()):
+                os.remove(path)
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Return hit/miss counts, hit rate, evictions and disk usage.
+
+        Returns:
+            pd.DataFrame: One row.
+        """
+        with self._lock:
+            self._scan()
+            requests = self._stats['hits'] + self._stats['misses']
+            return pd.DataFrame([{
+                'hits': self._stats['hits'],
+                'misses': self._stats['misses'],
+                'hit_rate': self._stats['hits'] / requests if requests else 0.0,
+                'evictions': self._stats['evictions'],
+                'size_kb': round(self._bytes / 1024, 1),
+                'max_kb': round(self.max_bytes / 1024, 1),
+            }])
+
+
+# Shared by every session of the Streamlit server process
+forecast_cache = ForecastCache()
@@ -0,0 +1,183 @@
+import glob
+import hashlib
+import os
+
+import pandas as pd
+
+from utils import data_access
+
+RISK_PROFILES = ['high', 'low']
+
+_version_cache = {}
+
+
+def model_version(model_path):
+    """
+    Return a short content hash identifying a model file.
+
+    The hash is cached per (mtime, size), so calling this on every page run is cheap.
+    """
+    stat = os.stat(model_path)
+    key = (os.path.abspath(model_path), stat.st_mtime_ns, stat.st_size)
+    if key not in _version_cache:
+        with open(model_path, 'rb') as f:
+            _version_cache[key] = hashlib.sha256(f.read()).hexdigest()[:12]
+    return _version_cache[key]
+
+
+def served_model_version(model_path):
+    """
+    Return the version of the model a forecast from `model_path` is served by.
+
+    That is the model_version of the .h5 file. When only its .npz bundle exists,
+    StockPredictor serves the bundle, and the version is the bundle's
+    source_version, i.e. that of the .h5 file it was built from. The same
+    model therefore keeps the same version whichever file is present.
+    """
+    from utils.model_bundle import bundle_path_for, read_metadata
+
+    if os.path.exists(model_path) and not model_path.endswith('.npz'):
+        return model_version(model_path)
+    bundle_path = bundle_path_for(model_path)
+    stat = os.stat(bundle_path)
+    key = ('bundle', os.path.abspath(bundle_path), stat.st_mtime_ns, stat.st_size)
+    if key not in _version_cache:
+        # Bundles written without an .h5 source are identified by their own content
+        _version_cache[key] = read_metadata(bundle_path)['source_version'] or model_version(bundle_path)
+    return _version_cache[key]
+
+
+def model_paths(models_dir='utils/models'):
+    """
+    Return the lstm_model_<TICKER>.h5 path of every model in a directory,
+    including models that are only present as an .npz bundle.
+    """
+    names = glob.glob(os.path.join(models_dir, 'lstm_model_*.h5')) + \
+        glob.glob(os.path.join(models_dir, 'lstm_model_*.npz'))
+    tickers = sorted({ticker_from_model_path(name) for name in names})
+    return [os.path.join(models_dir, f'lstm_model_{ticker}.h5') for ticker in tickers]
+
+
+def ticker_from_model_path(model_path):
+    """
+    Return the ticker encoded in a 'lstm_model_<TICKER>.h5' (or .npz) file name.
+    """
+    return os.path.splitext(os.path.basename(model_path))[0][len('lstm_model_'):]
+
+
+class ForecastTable:
+    """
+    Precomputed forecasts and recommendations keyed by (Ticker, As_Of, Model_Version).
+
+    As_Of is the date of the last actual close the forecast was made from.
+    """
+
+    COLUMNS = ['Ticker', 'As_Of', 'Model_Version', 'Last_Actual', 'Pred_Day1', 'Pred_Day2',
+               'Recommendation_high', 'Recommendation_low', 'Created_At']
+
+    def __init__(self, path='utils/data/forecasts/forecasts.parquet'):
+        """
+        Initialize the table.
+
+        Args:
+            path (str): Parquet file the forecasts are stored in.
+        """
+        self.path = path
+
+    def load(self):
+        """
+        Load all stored forecasts. Returns an empty frame if nothing has been written yet.
+        """
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=self.COLUMNS)
+        return data_access.cached_table(self.path, lambda: pd.read_parquet(self.path))
+
+    def upsert(self, rows):
+        """
+        Add forecasts, replacing existing rows with the same key.
+
+        Args:
+            rows (pd.DataFrame): Rows with the columns in COLUMNS.
+        """
+        df = pd.concat([self.load(), rows], ignore_index=True) if os.path.exists(self.path) else rows
+        df = df.drop_duplicates(['Ticker', 'As_Of', 'Model_Version'], keep='last')
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+
+    def lookup(self, ticker, as_of, model_path):
+        """
+        Return the stored forecast for a ticker, or None if it is missing or stale.
+
+        A forecast is stale when it was made from an older close than `as_of` or
+        by a different version of the model file.
+
+        Args:
+            ticker (str): Ticker symbol.
+            as_of (datetime): Date of the latest close available to the page.
+            model_path (str): Model file the page would use for live inference.
+
+        Returns:
+            pd.Series or None: The matching row.
+        """
+        from utils.model_bundle import bundle_path_for
+
+        df = self.load()
+        if df.empty or not (os.path.exists(model_path) or os.path.exists(bundle_path_for(model_path))):
+            return None
+        match = df[(df['Ticker'] == ticker)
+                   & (df['As_Of'] == pd.Timestamp(as_of))
+                   & (df['Model_Version'] == served_model_version(model_path))]
+        return match.iloc[-1] if not match.empty else None
+
+
+def run(models_dir='utils/models', table=None):
+    """
+    Forecast every ticker that has a model and store the results.
+
+    Args:
+        models_dir (str): Directory holding lstm_model_<TICKER>.h5 files or their .npz bundles.
+        table (ForecastTable): Where to store the results. Uses the default table if None.
+
+    Returns:
+        pd.DataFrame: The rows that were written.
+    """
+    # Imported here so the pages can read the table without loading TensorFlow.
+    from utils.lstm_predictor import StockPredictor
+
+    table = table or ForecastTable()
+    rows = []
+    for model_path in model_paths(models_dir):
+        ticker = ticker_from_model_path(model_path)
+        ticker_df = data_access.prices_for(ticker)
+        if ticker_df.empty:
+            print(f"No data found for {ticker}. Skipping...")
+            continue
+
+        predictor = StockPredictor(model_path, ticker_df)
+        last_actual, predictions = predictor.get_last_actual_and_predictions()
+        row = {
+            'Ticker': ticker,
+            'As_Of': ticker_df['Date'].iloc[-1],
+            'Model_Version': served_model_version(model_path),
+            'Last_Actual': float(last_actual),
+            'Pred_Day1': float(predictions[0]),
+            'Pred_Day2': float(predictions[1]),
+            'Created_At': pd.Timestamp.now(),
+        }
+        for risk_profile in RISK_PROFILES:
+            row[f'Recommendation_{risk_profile}'] = predictor.recommend(risk_profile, last_actual, predictions)
+        rows.append(row)
+        print(f"{ticker}: {row['Pred_Day1']:.2f}, {row['Pred_Day2']:.2f} "
+              f"({row['Recommendation_high']} / {row['Recommendation_low']})")
+
+    rows = pd.DataFrame(rows, columns=ForecastTable.COLUMNS)
+    if not rows.empty:
+        table.upsert(rows)
+        print(f"{len(rows)} forecasts saved to {table.path}")
+    return rows
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,355 @@
+"""
+Technical indicators of the processed share prices, in batch and streaming form.
+
+Batch mode computes SMA, EMA, RSI, Bollinger bands, ATR and the volume average
+for every ticker at once: the table is laid out as a (day of history x ticker)
+matrix, rolling windows are taken down its columns, and the recursive
+indicators step through the days with one vector operation over all tickers.
+
+Streaming mode keeps a small IndicatorState per ticker (the last 50 closes and
+20 volumes, running window sums, and the EMA / Wilder averages), so a new day
+is an O(1) update. The recursive indicators follow the exact same arithmetic in
+both modes; the rolling ones use running sums when streaming and agree with the
+batch values to rounding error (see tests/test_indicators.py).
+
+The indicators are written next to the price store by SharePriceProcessor and
+read through data_access.indicators_for, so pages and models never recompute
+them.
+"""
+import argparse
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+SMA_WINDOWS = (20, 50)
+EMA_SPANS = (12, 26)
+RSI_PERIOD = 14
+BOLLINGER_WINDOW = 20
+BOLLINGER_K = 2.0
+ATR_PERIOD = 14
+VOLUME_WINDOW = 20
+
+COLUMNS = ([f'SMA_{w}' for w in SMA_WINDOWS] + [f'EMA_{s}' for s in EMA_SPANS]
+           + [f'RSI_{RSI_PERIOD}', 'BB_Upper', 'BB_Lower', f'ATR_{ATR_PERIOD}', f'Volume_SMA_{VOLUME_WINDOW}'])
+
+_CLOSE_WINDOWS = tuple(sorted(set(SMA_WINDOWS) | {BOLLINGER_WINDOW}))
+_HISTORY = max(_CLOSE_WINDOWS)
+
+
+def indicators_path(store_root):
+    """Path of the indicator table belonging to a price store."""
+    return store_root + '_indicators.parquet'
+
+
+def state_path(store_root):
+    """Path of the streaming state belonging to a price store."""
+    return store_root + '_indicator_state.parquet'
+
+
+def _wilder(values, period, first):
+    """
+    Wilder's smoothing down the rows of a (day x ticker) matrix.
+
+    The first `period` values from row `first` are summed and averaged, then
+    avg = (avg * (period - 1) + value) / period.
+
+    Returns:
+        tuple: The averages (NaN before they are seeded) and the running state,
+            which holds the partial sum until the seed row and the average after.
+    """
+    state = np.zeros_like(values)
+    seed = first + period - 1
+    previous = np.zeros(values.shape[1])
+    for t in range(first, len(values)):
+        if t < seed:
+            previous = previous + values[t]
+        elif t == seed:
+            previous = (previous + values[t]) / period
+        else:
+            previous = (previous * (period - 1) + values[t]) / period
+        state[t] = previous
+    averages = state.copy()
+    averages[:seed] = np.nan
+    return averages, state
+
+
+def _rsi(gain, loss):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - 100 / (1 + gain / loss)
+    return np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), rsi)
+
+
+def compute_indicators(prices, with_state=False):
+    """
+    Compute every indicator for every ticker in one pass.
+
+    Args:
+        prices (pd.DataFrame): Ticker, Date, High, Low, Close and Volume columns.
+        with_state (bool): Also return the streaming state after each ticker's
+            last row, to continue from with StreamingIndicators.
+
+    Returns:
+        pd.DataFrame: Ticker, Date and the COLUMNS, sorted by Ticker and Date.
+            With `with_state`, a tuple of that and a StreamingIndicators.
+    """
+    df = prices[['Ticker', 'Date', 'High', 'Low', 'Close', 'Volume']].sort_values(
+        ['Ticker', 'Date'], kind='stable').reset_index(drop=True)
+    tickers = df['Ticker'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, tickers[1:] != tickers[:-1]]) if len(df) else np.array([], dtype=int)
+    lengths = np.diff(np.r_[starts, len(df)])
+    code = np.repeat(np.arange(len(starts)), lengths)
+    pos = np.arange(len(df)) - np.repeat(starts, lengths)
+    shape = (int(lengths.max()) if len(df) else 0, len(starts))
+
+    def wide(column):
+        matrix = np.full(shape, np.nan)
+        matrix[pos, code] = df[column].to_numpy(dtype=np.float64)
+        return matrix
+
+    high, low, close, volume = wide('High'), wide('Low'), wide('Close'), wide('Volume')
+    out = pd.DataFrame({'Ticker': df['Ticker'], 'Date': df['Date']})
+
+    # Rolling windows; the NaN padding after a short history never enters a window
+    close_frame = pd.DataFrame(close)
+    for window in SMA_WINDOWS:
+        out[f'SMA_{window}'] = close_frame.rolling(window).mean().to_numpy()[pos, code]
+    for span in EMA_SPANS:
+        alpha = 2 / (span + 1)
+        ema = np.empty(shape)
+        if shape[0]:
+            ema[0] = close[0]
+        for t in range(1, shape[0]):
+            ema[t] = alpha * close[t] + (1 - alpha) * ema[t - 1]
+        out[f'EMA_{span}'] = ema[pos, code]
+
+    previous_close = np.vstack([np.full((1, shape[1]), np.nan), close[:-1]])
+    change = close - previous_close
+    gain, gain_state = _wilder(np.maximum(change, 0), RSI_PERIOD, 1)
+    loss, loss_state = _wilder(np.maximum(-change, 0), RSI_PERIOD, 1)
+    rsi = _rsi(gain, loss)
+    rsi[:RSI_PERIOD] = np.nan
+    out[f'RSI_{RSI_PERIOD}'] = rsi[pos, code]
+
+    middle = close_frame.rolling(BOLLINGER_WINDOW).mean().to_numpy()
+    std = close_frame.rolling(BOLLINGER_WINDOW).std().to_numpy()
+    out['BB_Upper'] = (middle + BOLLINGER_K * std)[pos, code]
+    out['BB_Lower'] = (middle - BOLLINGER_K * std)[pos, code]
+
+    true_range = np.maximum(np.maximum(high - low, np.abs(high - previous_close)), np.abs(low - previous_close))
+    if shape[0]:
+        true_range[0] = high[0] - low[0]
+    atr, atr_state = _wilder(true_range, ATR_PERIOD, 0)
+    out[f'ATR_{ATR_PERIOD}'] = atr[pos, code]
+    out[f'Volume_SMA_{VOLUME_WINDOW}'] = pd.DataFrame(volume).rolling(VOLUME_WINDOW).mean().to_numpy()[pos, code]
+
+    if not with_state:
+        return out
+
+    streaming = StreamingIndicators()
+    for i, (ticker, start, length) in enumerate(zip(tickers[starts], starts, lengths)):
+        last = length - 1
+        tail = df.iloc[max(start, start + length - _HISTORY):start + length]
+        emas = [out[f'EMA_{span}'].iat[start + last] for span in EMA_SPANS]
+        streaming.states[ticker] = IndicatorState(
+            tail['Close'].to_numpy(dtype=np.float64), tail['Volume'].to_numpy(dtype=np.float64)[-VOLUME_WINDOW:],
+            int(length), emas, gain_state[last, i], loss_state[last, i], atr_state[last, i])
+    return out, streaming
+
+
+class IndicatorState:
+    """
+    The streaming state of one ticker.
+
+    Window sums are kept relative to a reference close, which keeps the running
+    sum of squares for the Bollinger bands well conditioned.
+    """
+
+    __slots__ = ('closes', 'volumes', 'count', 'emas', 'gain', 'loss', 'atr', 'ref', 'sums', 'squares',
+                 'volume_sum')
+
+    def __init__(self, closes=(), volumes=(), count=0, emas=None, gain=0.0, loss=0.0, atr=0.0):
+        """
+        Restore a state.
+
+        Args:
+            closes: Up to the last 50 closes, oldest first.
+            volumes: Up to the last 20 volumes, oldest first.
+            count (int): Rows seen so far.
+            emas (list): Current EMA per span in EMA_SPANS.
+            gain, loss, atr (float): Wilder partial sums while warming up, averages after.
+        """
+        self.closes = deque((float(c) for c in closes), maxlen=_HISTORY)
+        self.volumes = deque((float(v) for v in volumes), maxlen=VOLUME_WINDOW)
+        self.count = count
+        self.emas = list(emas) if emas is not None else [math.nan] * len(EMA_SPANS)
+        self.gain, self.loss, self.atr = float(gain), float(loss), float(atr)
+        self.ref = self.closes[-1] if self.closes else None
+        history = list(self.closes)
+        self.sums = {w: sum(c - self.ref for c in history[-w:]) for w in _CLOSE_WINDOWS}
+        self.squares = sum((c - self.ref) ** 2 for c in history[-BOLLINGER_WINDOW:])
+        self.volume_sum = sum(self.volumes)
+
+    def update(self, high, low, close, volume):
+        """
+        Add one day and return its indicator values, in COLUMNS order.
+        """
+        if self.ref is None:
+            self.ref = close
+        x = close - self.ref
+        for window in _CLOSE_WINDOWS:
+            if len(self.closes) >= window:
+                self.sums[window] -= self.closes[-window] - self.ref
+            self.sums[window] += x
+        if len(self.closes) >= BOLLINGER_WINDOW:
+            self.squares -= (self.closes[-BOLLINGER_WINDOW] - self.ref) ** 2
+        self.squares += x * x
+        if len(self.volumes) == VOLUME_WINDOW:
+            self.volume_sum -= self.volumes[0]
+        self.volume_sum += volume
+
+        previous = self.closes[-1] if self.closes else None
+        self.closes.append(close)
+        self.volumes.append(volume)
+        t = self.count
+        self.count += 1
+
+        values = [self.ref + self.sums[w] / w if self.count >= w else math.nan for w in SMA_WINDOWS]
+        for i, span in enumerate(EMA_SPANS):
+            alpha = 2 / (span + 1)
+            self.emas[i] = close if t == 0 else alpha * close + (1 - alpha) * self.emas[i]
+        values.extend(self.emas)
+
+        if previous is None:
+            values.append(math.nan)
+            true_range = high - low
+        else:
+            change = close - previous
+            self.gain = self._wilder(self.gain, max(change, 0.0), RSI_PERIOD, 1, t)
+            self.loss = self._wilder(self.loss, max(-change, 0.0), RSI_PERIOD, 1, t)
+            if t < RSI_PERIOD:
+                values.append(math.nan)
+            elif self.loss == 0:
+                values.append(50.0 if self.gain == 0 else 100.0)
+            else:
+                values.append(100 - 100 / (1 + self.gain / self.loss))
+            true_range = max(high - low, abs(high - previous), abs(low - previous))
+
+        if self.count >= BOLLINGER_WINDOW:
+            mean = self.sums[BOLLINGER_WINDOW] / BOLLINGER_WINDOW
+            variance = (self.squares - BOLLINGER_WINDOW * mean * mean) / (BOLLINGER_WINDOW - 1)
+            std = math.sqrt(max(variance, 0.0))
+            values.extend([self.ref + mean + BOLLINGER_K * std, self.ref + mean - BOLLINGER_K * std])
+        else:
+            values.extend([math.nan, math.nan])
+
+        self.atr = self._wilder(self.atr, true_range, ATR_PERIOD, 0, t)
+        values.append(self.atr if t >= ATR_PERIOD - 1 else math.nan)
+        values.append(self.volume_sum / VOLUME_WINDOW if self.count >= VOLUME_WINDOW else math.nan)
+        return values
+
+    @staticmethod
+    def _wilder(state, value, period, first, t):
+        seed = first + period - 1
+        if t < seed:
+            return state + value
+        if t == seed:
+            return (state + value) / period
+        return (state * (period - 1) + value) / period
+
+
+class StreamingIndicators:
+    """
+    Per-ticker IndicatorStates, updated one day at a time.
+    """
+
+    def __init__(self, states=None):
+        self.states = states if states is not None else {}
+
+    def update(self, ticker, high, low, close, volume):
+        """
+        Add one day of a ticker and return its indicator values as a dict.
+        """
+        state = self.states.get(ticker)
+        if state is None:
+            state = self.states[ticker] = IndicatorState()
+        return dict(zip(COLUMNS, state.update(float(high), float(low), float(close), float(volume))))
+
+    def update_frame(self, df):
+        """
+        Add the rows of a DataFrame, in Ticker and Date order.
+
+        Args:
+            df (pd.DataFrame): New rows with Ticker, Date, High, Low, Close and Volume,
+                all later than the rows seen so far for their ticker.
+
+        Returns:
+            pd.DataFrame: Ticker, Date and the COLUMNS of the new rows.
+        """
+        df = df.sort_values(['Ticker', 'Date'], kind='stable')
+        rows = []
+        for ticker, high, low, close, volume in zip(df['Ticker'], df['High'].astype(float), df['Low'].astype(float),
+                                                    df['Close'].astype(float), df['Volume'].astype(float)):
+            state = self.states.get(ticker)
+            if state is None:
+                state = self.states[ticker] = IndicatorState()
+            rows.append(state.update(high, low, close, volume))
+        out = pd.DataFrame(rows, columns=COLUMNS)
+        out.insert(0, 'Date', df['Date'].to_numpy())
+        out.insert(0, 'Ticker', df['Ticker'].to_numpy())
+        return out
+
+    def save(self, path):
+        """
+        Write the states to a Parquet file, one row per ticker.
+        """
+        pd.DataFrame([{
+            'Ticker': ticker, 'Closes': list(state.closes), 'Volumes': list(state.volumes), 'Count': state.count,
+            'EMAs': state.emas, 'Gain': state.gain, 'Loss': state.loss, 'ATR': state.atr,
+        } for ticker, state in self.states.items()]).to_parquet(path, index=False)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read states written by `save`.
+        """
+        df = pd.read_parquet(path)
+        return cls({row.Ticker: IndicatorState(row.Closes, row.Volumes, row.Count, row.EMAs, row.Gain, row.Loss,
+                                               row.ATR)
+                    for row in df.itertuples(index=False)})
+
+
+def build_indicators(prices, store_root):
+    """
+    Compute the indicators of a full price table in batch mode and save them,
+    with the streaming state, next to the price store.
+    """
+    table, streaming = compute_indicators(prices, with_state=True)
+    table.to_parquet(indicators_path(store_root), index=False)
+    streaming.save(state_path(store_root))
+    return table
+
+
+def append_indicators(new_rows, store_root):
+    """
+    Stream the indicators of newly appended price rows and add them to the saved table.
+    """
+    streaming = StreamingIndicators.load(state_path(store_root))
+    appended = streaming.update_frame(new_rows)
+    table = pd.concat([pd.read_parquet(indicators_path(store_root)), appended], ignore_index=True)
+    table.sort_values(['Ticker', 'Date'], kind='stable').to_parquet(indicators_path(store_root), index=False)
+    streaming.save(state_path(store_root))
+    return appended
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute the technical indicators of the price store.")
+    parser.parse_args()
+
+    from utils.price_store import PriceStore
+
+    store = PriceStore()
+    prices = store.read(columns=['Ticker', 'Date', 'High', 'Low', 'Close', 'Volume'])
+    table = build_indicators(prices, store.root)
+    print(f"Indicators of {table['Ticker'].nunique()} tickers saved to {indicators_path(store.root)}")
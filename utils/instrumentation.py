@@ -0,0 +1,398 @@
+"""
+Timing spans, per-stage latency histograms and an optional sampling profiler.
+
+Hot paths (data loading and filtering, sector aggregation, model loading,
+StockPredictor construction and predictions, chart building and rendering) are
+wrapped in spans:
+
+    with span('data.filter', ticker=ticker):
+        ...
+
+Every finished span is added to the process-wide `metrics`, which keeps a
+histogram and the latest durations per stage for p50/p95, and is logged as one
+JSON line on the 'finpulse.spans' logger. Set SPAN_LOG to a file path (or
+'stderr') to write those lines without configuring logging yourself, and
+INSTRUMENTATION=0 to turn spans off. The Debug page shows the metrics.
+
+A page run can also be profiled by sampling the stack of its thread, switched
+on per request with the ?profile=1 query parameter (see `begin_request`).
+
+    python -m utils.instrumentation --profile
+"""
+import argparse
+import bisect
+import collections
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+ENABLED = os.getenv("INSTRUMENTATION", "1") != "0"
+# Upper bucket bounds in milliseconds; the last bucket is open
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+WINDOW = 2048
+
+logger = logging.getLogger('finpulse.spans')
+_log_configured = False
+
+
+def _configure_log():
+    global _log_configured
+    _log_configured = True
+    target = os.getenv("SPAN_LOG")
+    if not target:
+        return
+    handler = logging.StreamHandler(sys.stderr) if target == 'stderr' else logging.FileHandler(target)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+class SpanMetrics:
+    """
+    Thread-safe aggregation of span durations per stage.
+
+    Each stage keeps a count, a total, a histogram over BUCKETS_MS and its last
+    WINDOW durations, from which the percentiles are read.
+    """
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._recent = collections.deque(maxlen=200)
+
+    def record(self, name, seconds, fields=None, error=False):
+        """
+        Add one finished span.
+
+        Args:
+            name (str): Stage name, e.g. 'predictor.predict'.
+            seconds (float): Duration.
+            fields (dict): Extra context, e.g. the ticker.
+            error (bool): Whether the span ended with an exception.
+        """
+        ms = seconds * 1000
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                stage = self._stages[name] = {
+                    'count': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'buckets': [0] * (len(BUCKETS_MS) + 1), 'samples': collections.deque(maxlen=self.window),
+                }
+            stage['count'] += 1
+            stage['errors'] += error
+            stage['total_ms'] += ms
+            stage['max_ms'] = max(stage['max_ms'], ms)
+            stage['buckets'][bisect.bisect_left(BUCKETS_MS, ms)] += 1
+            stage['samples'].append(ms)
+            self._recent.append((time.time(), name, ms, fields or {}, error))
+
+        if not _log_configured:
+            _configure_log()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({'span': name, 'ms': round(ms, 3), 'error': error,
+                                    'thread': threading.current_thread().name, **(fields or {})}, default=str))
+
+    def summary(self):
+        """
+        Return count, p50, p95, max and total time per stage, slowest p95 first.
+
+        Returns:
+            pd.DataFrame: One row per stage.
+        """
+        import numpy as np
+        import pandas as pd
+
+        with self._lock:
+            stages = {name: (dict(stage), list(stage['samples'])) for name, stage in self._stages.items()}
+        rows = []
+        for name, (stage, samples) in stages.items():
+            p50, p95 = np.percentile(samples, [50, 95])
+            rows.append({'stage': name, 'count': stage['count'], 'errors': stage['errors'],
+                         'p50_ms': round(float(p50), 3), 'p95_ms': round(float(p95), 3),
+                         'max_ms': round(stage['max_ms'], 3), 'total_s': round(stage['total_ms'] / 1000, 3)})
+        columns = ['stage', 'count', 'errors', 'p50_ms', 'p95_ms', 'max_ms', 'total_s']
+        df = pd.DataFrame(rows, columns=columns)
+        return df.sort_values('p95_ms', ascending=False).reset_index(drop=True)
+
+    def histogram(self, name):
+        """
+        Return the bucket counts of one stage.
+
+        Returns:
+            pd.DataFrame: 'le_ms' (the bucket's upper bound, inf for the last) and 'count'.
+        """
+        import pandas as pd
+
+        with self._lock:
+            stage = self._stages.get(name)
+            counts = list(stage['buckets']) if stage else [0] * (len(BUCKETS_MS) + 1)
+        return pd.DataFrame({'le_ms': list(BUCKETS_MS) + [float('inf')], 'count': counts})
+
+    def recent(self, n=50):
+        """
+        Return the last `n` spans, newest first.
+        """
+        import pandas as pd
+
+        with self._lock:
+            spans = list(self._recent)[-n:][::-1]
+        return pd.DataFrame([{'time': pd.Timestamp(t, unit='s'), 'stage': name, 'ms': round(ms, 3),
+                              'error': error, 'fields': json.dumps(fields, default=str)}
+                             for t, name, ms, fields, error in spans],
+                            columns=['time', 'stage', 'ms', 'error', 'fields'])
+
+    def reset(self):
+        """
+        Drop all recorded spans.
+        """
+        with self._lock:
+            self._stages.clear()
+            self._recent.clear()
+
+
+# Shared by every session of the Streamlit server process
+metrics = SpanMetrics()
+
+
+class _Span:
+    __slots__ = ('name', 'fields', 'start')
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if ENABLED:
+            metrics.record(self.name, time.perf_counter() - self.start, self.fields, exc_type is not None)
+        return False
+
+
+def span(name, **fields):
+    """
+    Time a block of code as one stage.
+
+    Args:
+        name (str): Stage name, e.g. 'data.filter'.
+        **fields: Context logged with the span, e.g. ticker='BMW.DE'.
+    """
+    return _Span(name, fields)
+
+
+def timed(name):
+    """
+    Decorator that times every call of a function as a span.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Span(name, None):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stack of one thread at a fixed interval.
+
+    A background thread reads the thread's current frame every `interval`
+    seconds, so the profiled code runs unmodified. The counts give each
+    function's share of the samples in which it was running (self) or on the
+    stack (total).
+    """
+
+    def __init__(self, interval=0.005, thread_id=None, max_duration=60.0):
+        """
+        Args:
+            interval (float): Seconds between samples.
+            thread_id (int): Thread to sample. Defaults to the thread that calls `start`.
+            max_duration (float): Sampling stops by itself after this many seconds.
+        """
+        self.interval = interval
+        self.thread_id = thread_id
+        self.max_duration = max_duration
+        self.samples = 0
+        self.stacks = collections.Counter()
+        self.label = None
+        self.started_at = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.thread_id = self.thread_id or threading.get_ident()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        deadline = time.perf_counter() + self.max_duration
+        while not self._stop.wait(self.interval) and time.perf_counter() < deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.time() - self.started_at if self.started_at else 0.0
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def top(self, n=20):
+        """
+        Return the `n` functions with the most samples on the stack.
+
+        Returns:
+            pd.DataFrame: function, self and total sample counts and percentages.
+        """
+        import pandas as pd
+
+        self_counts, total_counts = collections.Counter(), collections.Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for function in set(stack):
+                total_counts[function] += count
+        samples = max(self.samples, 1)
+        rows = [{'function': function, 'self': self_counts[function], 'total': total,
+                 'self_pct': round(100 * self_counts[function] / samples, 1),
+                 'total_pct': round(100 * total / samples, 1)}
+                for function, total in total_counts.most_common()]
+        df = pd.DataFrame(rows, columns=['function', 'self', 'total', 'self_pct', 'total_pct'])
+        return df.sort_values(['self', 'total'], ascending=False).head(n).reset_index(drop=True)
+
+    def collapsed(self):
+        """
+        Return the samples in collapsed-stack format ("a;b;c count" per line), for flame graph tools.
+        """
+        return '\n'.join(f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common())
+
+
+# The last profiled page runs, newest last
+recent_profiles = collections.deque(maxlen=10)
+
+
+# Streamlit ends a script run early by raising these; they are not failures
+_CONTROL_FLOW = ('StopException', 'RerunException')
+
+
+class PageRequest:
+    """
+    One run of a page script: timed as a 'page.render' span, and sampled by a
+    SamplingProfiler when profiling was asked for.
+
+    Use it as a context manager around the page body, so the span is recorded
+    and the profiler stopped even when the script raises or Streamlit stops it.
+    """
+
+    def __init__(self, page, profile=False):
+        self.page = page
+        self.profiler = SamplingProfiler().start() if profile else None
+        if self.profiler is not None:
+            self.profiler.label = page
+        self.start = time.perf_counter()
+
+    def finish(self, error=False):
+        """
+        Record the page span and keep the profile, if any, in `recent_profiles`.
+        Later calls do nothing.
+
+        Args:
+            error (bool): Whether the run ended with an exception.
+        """
+        if self.start is None:
+            return
+        if ENABLED:
+            metrics.record('page.render', time.perf_counter() - self.start, {'page': self.page}, error)
+        self.start = None
+        if self.profiler is not None:
+            recent_profiles.append(self.profiler.stop())
+            self.profiler = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(exc_type is not None and exc_type.__name__ not in _CONTROL_FLOW)
+        return False
+
+
+def begin_request(page, profile=False):
+    """
+    Start timing (and optionally profiling) a page run:
+
+        with begin_request('Sectors', profile=st.query_params.get('profile') == '1'):
+            ...
+
+    Args:
+        page (str): Page name.
+        profile (bool): Sample the page's stack, e.g. when ?profile=1 is in the URL.
+    """
+    return PageRequest(page, profile)
+
+
+def _workload():
+    """What a German Stocks and a Sectors page run do, without Streamlit."""
+    import pandas as pd
+
+    from utils import data_access
+    from utils.lstm_predictor import StockPredictor
+    from utils.plot_functions import line_chart
+
+    with begin_request('cli', profile=True):
+        name = data_access.company_names()[0]
+        ticker = data_access.ticker_for(name)
+        for period in (pd.Timedelta(days=30), pd.Timedelta(days=365)):
+            df = data_access.price_index().last(ticker, period)
+            fig = line_chart({name: df}, name)
+            with span('chart.render', page='cli'):
+                fig.to_json()
+        index = data_access.sector_index(103)
+        with span('chart.render', page='cli'):
+            line_chart({'Sector': index}, 'Sector', y='Index').to_json()
+        for model_ticker in ('BMW.DE', 'VOW.DE'):
+            predictor = StockPredictor(f'utils/models/lstm_model_{model_ticker}.h5',
+                                       data_access.prices_for(model_ticker))
+            predictor.predict_multiple_days(2)
+            predictor.predict_multiple_days_incremental(2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a page-like workload and print the time per stage.")
+    parser.add_argument('--profile', action='store_true', help="also print the functions with the most samples")
+    args = parser.parse_args()
+
+    # The instrumented modules record into utils.instrumentation, not this __main__ copy
+    from utils import instrumentation
+
+    instrumentation._workload()
+    print(instrumentation.metrics.summary().to_string(index=False))
+    if args.profile:
+        profile = instrumentation.recent_profiles[-1]
+        print(f"\n{profile.samples} samples in {profile.duration:.2f}s")
+        print(profile.top(15).to_string(index=False))
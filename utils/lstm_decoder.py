@@ -0,0 +1,136 @@
+import numpy as np
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def lstm_step(x_proj, h, c, recurrent_kernel, units):
+    """
+    Advance a Keras-style LSTM cell by one time step.
+
+    Args:
+        x_proj (np.ndarray): Input already multiplied by the kernel plus bias, shape (batch, 4 * units).
+        h (np.ndarray): Hidden state, shape (batch, units).
+        c (np.ndarray): Cell state, shape (batch, units).
+        recurrent_kernel (np.ndarray): Shape (units, 4 * units), gates ordered i, f, c, o.
+        units (int): Number of LSTM units.
+
+    Returns:
+        tuple: The new (h, c).
+    """
+    z = x_proj + h @ recurrent_kernel
+    i = _sigmoid(z[:, :units])
+    f = _sigmoid(z[:, units:2 * units])
+    g = np.tanh(z[:, 2 * units:3 * units])
+    o = _sigmoid(z[:, 3 * units:])
+    c = f * c + i * g
+    h = o * np.tanh(c)
+    return h, c
+
+
+class IncrementalDecoder:
+    """
+    Runs the stacked LSTM -> Dense forecaster in NumPy while keeping the recurrent state.
+
+    After the input window has been consumed once, every further forecast day costs
+    a single recurrent step per layer instead of a fresh pass over the whole window.
+    Dropout layers are inactive at inference time and are skipped.
+    """
+
+    def __init__(self, lstm_weights, dense_weights):
+        """
+        Initialize the decoder from raw weights.
+
+        Args:
+            lstm_weights (list): One (kernel, recurrent_kernel, bias) tuple per LSTM layer, in order.
+            dense_weights (tuple): (kernel, bias) of the output Dense layer.
+        """
+        self.lstm_weights = [tuple(np.asarray(w, dtype=np.float64) for w in layer) for layer in lstm_weights]
+        self.dense_kernel, self.dense_bias = (np.asarray(w, dtype=np.float64) for w in dense_weights)
+
+    @classmethod
+    def from_keras(cls, model):
+        """
+        Build a decoder from a loaded Keras model made of LSTM, Dropout and Dense layers.
+        """
+        lstm_weights, dense_weights = [], None
+        for layer in model.layers:
+            name = type(layer).__name__
+            if name == 'LSTM':
+                lstm_weights.append(layer.get_weights())
+            elif name == 'Dense':
+                dense_weights = layer.get_weights()
+        return cls(lstm_weights, dense_weights)
+
+    def _dense(self, h):
+        return h @ self.dense_kernel + self.dense_bias
+
+    def encode(self, windows):
+        """
+        Run a batch of input windows through all LSTM layers.
+
+        Args:
+            windows (np.ndarray): Scaled inputs, shape (batch, steps) or (batch, steps, 1).
+
+        Returns:
+            tuple: The next-step predictions, shape (batch,), and the final state,
+                a list of (h, c) per layer.
+        """
+        seq = np.asarray(windows, dtype=np.float64)
+        if seq.ndim == 2:
+            seq = seq[:, :, None]
+        batch, steps, _ = seq.shape
+
+        state = []
+        for kernel, recurrent_kernel, bias in self.lstm_weights:
+            units = recurrent_kernel.shape[0]
+            x_proj = seq @ kernel + bias  # whole sequence projected in one call
+            h = np.zeros((batch, units))
+            c = np.zeros((batch, units))
+            outputs = np.empty((batch, steps, units))
+            for t in range(steps):
+                h, c = lstm_step(x_proj[:, t], h, c, recurrent_kernel, units)
+                outputs[:, t] = h
+            state.append((h, c))
+            seq = outputs
+
+        return self._dense(seq[:, -1])[:, 0], state
+
+    def step(self, x, state):
+        """
+        Feed one new input value per batch row and advance every layer by one step.
+
+        Args:
+            x (np.ndarray): Scaled inputs, shape (batch,).
+            state (list): (h, c) per layer, as returned by encode or step.
+
+        Returns:
+            tuple: The next-step predictions, shape (batch,), and the new state.
+        """
+        out = np.asarray(x, dtype=np.float64).reshape(-1, 1)
+        new_state = []
+        for (kernel, recurrent_kernel, bias), (h, c) in zip(self.lstm_weights, state):
+            units = recurrent_kernel.shape[0]
+            h, c = lstm_step(out @ kernel + bias, h, c, recurrent_kernel, units)
+            new_state.append((h, c))
+            out = h
+        return self._dense(out)[:, 0], new_state
+
+    def forecast(self, windows, days):
+        """
+        Forecast several steps ahead, feeding each prediction back as the next input.
+
+        Args:
+            windows (np.ndarray): Scaled inputs, shape (batch, steps) or (batch, steps, 1).
+            days (int): Number of steps to forecast.
+
+        Returns:
+            np.ndarray: Scaled predictions, shape (batch, days).
+        """
+        pred, state = self.encode(windows)
+        predictions = [pred]
+        for _ in range(days - 1):
+            pred, state = self.step(pred, state)
+            predictions.append(pred)
+        return np.stack(predictions, axis=1)
@@ -1,33 +1,100 @@
+import os
+
 import numpy as np
-import  tensorflow
-import sklearn
-from sklearn.preprocessing import MinMaxScaler
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import LSTM,Dense,Dropout
+from utils.model_registry import model_registry
+from utils.model_bundle import bundle_path_for
+from utils.forecast_job import model_version
+from utils.lstm_decoder import IncrementalDecoder
+from utils.forecast_cache import forecast_cache
+from utils.instrumentation import timed
+
+
+def current_bundle(model_path, registry=None):
+    """The bundle of a model, or None if there is none or it was made from another version of the .h5 file."""
+    registry = registry or model_registry
+    bundle_path = bundle_path_for(model_path)
+    if not os.path.exists(bundle_path):
+        return None
+    bundle = registry.get(bundle_path, 'numpy')
+    if bundle_path != model_path and os.path.exists(model_path) and bundle.source_version != model_version(model_path):
+        print(f"{bundle_path} was built from another version of {model_path}. Ignoring it.")
+        return None
+    return bundle
+
+
+def served_model(model_path, registry=None, backend=None):
+    """
+    Load the model that forecasts for `model_path` are served by.
+
+    That is the current bundle for the 'numpy' backend, or whenever the .h5 file
+    is missing, and otherwise the .h5 file loaded with `backend`.
+
+    Returns:
+        tuple: The model, and the current ModelBundle (None if there is none).
+    """
+    registry = registry or model_registry
+    bundle = current_bundle(model_path, registry)
+    if bundle is not None and ((backend or registry.backend) == 'numpy' or not os.path.exists(model_path)):
+        return bundle, bundle
+    return registry.get(model_path, backend), bundle
 
 
 class StockPredictor:
-    def __init__(self, model_path, price_data):
-        self.model = load_model(model_path)
-        self.data = price_data[['Close']].copy()
-        self.scaler = MinMaxScaler()
-        self.scaler.fit(self.data)
+    @timed('predictor.init')
+    def __init__(self, model_path, price_data, registry=None, backend=None, cache=None):
+        """
+        Prefers the model's .npz bundle (see utils.model_bundle), which carries the
+        scaler fitted at training time, so only the last `sequence_length` closes
+        are kept. Without a current bundle, a scaler is fitted on the full history.
+
+        Args:
+            model_path (str): Path to the saved lstm_model_<TICKER>.h5 (or .npz bundle) file.
+            price_data (pd.DataFrame): Share prices with a 'Close' column, oldest first.
+            registry (ModelRegistry): Model pool to load from. Defaults to the shared pool.
+            backend (str): 'keras' or 'numpy'. Defaults to the pool's backend. A bundle
+                always serves the 'numpy' backend; for 'keras' only its scaler is used.
+            cache (ForecastCache): Where `get_last_actual_and_predictions` memoizes
+                its results. Defaults to the shared on-disk cache.
+        """
+        registry = registry or model_registry
+        self.model_path = model_path
+        self.cache = cache or forecast_cache
+        self._decoder = None
+
+        closes = price_data['Close'].to_numpy(dtype=np.float64)
+        self.model, bundle = served_model(model_path, registry, backend)
+        if bundle is not None:
+            self.scaler = bundle.scaler
+            self.sequence_length = bundle.sequence_length
+        else:
+            from sklearn.preprocessing import MinMaxScaler
 
+            self.scaler = MinMaxScaler()
+            self.scaler.fit(closes.reshape(-1, 1))
+            self.sequence_length = 50
+        self.closes = closes[-self.sequence_length:].copy()
+
+    def _scaled_window(self):
+        return self.scaler.transform(self.closes.reshape(-1, 1))
+
+    @timed('predictor.predict')
     def predict_next_day(self):
-        last_50 = self.data['Close'].values[-50:].reshape(-1, 1)
-        scaled = self.scaler.transform(last_50).reshape(1, 50, 1)
+        scaled = self._scaled_window().reshape(1, self.sequence_length, 1)
         pred_scaled = self.model.predict(scaled, verbose=0)[0, 0]
         return self.scaler.inverse_transform([[pred_scaled]])[0, 0]
     
     
     
-    def predict_multiple_days(self, days=2):
+    @timed('predictor.predict')
+    def predict_multiple_days(self, days=2, incremental=False):
+        if incremental:
+            return self.predict_multiple_days_incremental(days)
+
         predictions = []
-        last_50_days = self.data['Close'].values[-50:].reshape(-1, 1)
-        last_50_scaled = self.scaler.transform(last_50_days)
+        last_50_scaled = self._scaled_window()
 
         for _ in range(days):
-            input_data = last_50_scaled.reshape(1, 50, 1)
+            input_data = last_50_scaled.reshape(1, self.sequence_length, 1)
             next_pred_scaled = self.model.predict(input_data)[0, 0]
             next_pred = self.scaler.inverse_transform([[next_pred_scaled]])[0, 0]
             predictions.append(next_pred)
@@ -37,15 +104,48 @@ class StockPredictor:
 
         return predictions
 
+    @timed('predictor.predict_incremental')
+    def predict_multiple_days_incremental(self, days=2):
+        """Forecasts `days` ahead carrying the LSTM state forward, so each extra day costs one recurrent step.
+
+        Unlike `predict_multiple_days`, the oldest input is never dropped from the
+        state, so later days differ slightly from the window-recompute results. For
+        the saved models the accepted difference is 1e-3 of the price for horizons
+        up to 90 days; the largest seen is about 4e-4.
+        """
+        if self._decoder is None:
+            if isinstance(self.model, IncrementalDecoder):
+                self._decoder = self.model
+            else:
+                self._decoder = IncrementalDecoder.from_keras(self.model)
+        last_50_scaled = self._scaled_window().reshape(1, self.sequence_length)
+
+        preds_scaled = self._decoder.forecast(last_50_scaled, days)[0]
+        return list(self.scaler.inverse_transform(preds_scaled.reshape(-1, 1))[:, 0])
+
     
-    def get_last_actual_and_predictions(self):
-        """Returns the last actual closing price and the next two predicted closing prices."""
-        last_actual = self.data['Close'].iloc[-1]
-        predictions = self.predict_multiple_days(days=2)
+    @timed('predictor.forecast')
+    def get_last_actual_and_predictions(self, days=2):
+        """Returns the last actual closing price and the next `days` predicted closing prices.
+
+        Results are memoized on disk by model file, input window and horizon, so a
+        forecast is computed once however many sessions ask for it.
+        """
+        last_actual = self.closes[-1]
+        key = self.cache.key(self.model_path, self.closes,
+                             (self.scaler.data_min_, self.scaler.data_max_), days, type(self.model).__name__)
+        predictions = self.cache.get_or_compute(
+            key, lambda: [float(p) for p in self.predict_multiple_days(days=days)])
         return last_actual, predictions
     
-    def recommend(self, risk_profile):
-        last_actual, predicted_prices = self.get_last_actual_and_predictions()
+    def recommend(self, risk_profile, last_actual=None, predicted_prices=None):
+        """Returns the trading action for a risk profile ("high" or "low").
+
+        Pass `last_actual` and `predicted_prices` from `get_last_actual_and_predictions`
+        to reuse a forecast that has already been computed.
+        """
+        if last_actual is None or predicted_prices is None:
+            last_actual, predicted_prices = self.get_last_actual_and_predictions()
         p0 = last_actual
         p1 = predicted_prices[0]
         p2 = predicted_prices[1]
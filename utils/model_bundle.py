@@ -0,0 +1,212 @@
+"""
+Self-contained model artifacts.
+
+An lstm_model_<TICKER>.npz bundle holds everything inference needs: the LSTM
+and Dense weights, the fitted min/max scaler, the sequence length, the date
+range and a fingerprint of the history the scaler was fitted on, and the
+version of the .h5 file it was made from. It is read in one call, and
+StockPredictor then forecasts from the last `sequence_length` closes alone,
+without refitting a scaler on the full history.
+
+Bundles are written by StockPricePredictor.save_model next to the .h5 file,
+with the scaler and history of the training run (fit_source 'training'). For
+models trained before that, the training history is not known. Their bundles
+are built from the price history available when they are bundled, which is
+what the live predictor used to fit its scaler on (fit_source 'backfill'):
+
+    python -m utils.model_bundle
+"""
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+
+from utils.numpy_lstm import NumpyLSTM
+
+FORMAT_VERSION = 2
+FIT_SOURCES = ('training', 'backfill')
+
+
+def bundle_path_for(model_path):
+    """Return the bundle path belonging to an lstm_model_<TICKER>.h5 (or .npz) path."""
+    root, ext = os.path.splitext(model_path)
+    return model_path if ext == '.npz' else root + '.npz'
+
+
+def read_metadata(path):
+    """Return a bundle's metadata without reading its weights."""
+    with np.load(path) as arrays:
+        return json.loads(str(arrays['metadata']))
+
+
+def data_fingerprint(dates, closes):
+    """
+    Short hash of a price history, to tell which data a model was fitted on.
+
+    Args:
+        dates: Trading dates, oldest first.
+        closes: Closes on those dates.
+    """
+    digest = hashlib.sha256()
+    digest.update(np.asarray(dates, dtype='datetime64[ns]').astype(np.int64).tobytes())
+    digest.update(np.asarray(closes, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class MinMaxParams:
+    """
+    The transform of a fitted sklearn MinMaxScaler with feature_range (0, 1), for one feature.
+
+    It has the `data_min_`, `data_max_`, `transform` and `inverse_transform`
+    members StockPredictor uses, and computes them the same way sklearn does.
+    """
+
+    def __init__(self, data_min, data_max):
+        self.data_min_ = np.array([float(data_min)])
+        self.data_max_ = np.array([float(data_max)])
+        data_range = self.data_max_ - self.data_min_
+        # sklearn leaves a constant feature unscaled instead of dividing by zero
+        self.scale_ = 1.0 / np.where(data_range == 0, 1.0, data_range)
+        self.min_ = -self.data_min_ * self.scale_
+
+    def transform(self, X):
+        return np.asarray(X, dtype=np.float64) * self.scale_ + self.min_
+
+    def inverse_transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.min_) / self.scale_
+
+
+class ModelBundle(NumpyLSTM):
+    """
+    A NumpyLSTM with the scaler and metadata it was trained with.
+    """
+
+    def __init__(self, lstm_weights, dense_weights, data_min, data_max, sequence_length=50,
+                 fit_start=None, fit_end=None, fit_fingerprint=None, fit_source=None, source_version=None):
+        """
+        Args:
+            lstm_weights (list): One (kernel, recurrent_kernel, bias) tuple per LSTM layer.
+            dense_weights (tuple): (kernel, bias) of the output Dense layer.
+            data_min (float): Smallest close the scaler was fitted on.
+            data_max (float): Largest close the scaler was fitted on.
+            sequence_length (int): Input window length.
+            fit_start (str): First date of the history the scaler was fitted on, ISO format.
+            fit_end (str): Last date of that history, ISO format.
+            fit_fingerprint (str): data_fingerprint of that history.
+            fit_source (str): 'training' if that history is the model's training data,
+                'backfill' if it is the history available when the bundle was built.
+            source_version (str): forecast_job.model_version of the .h5 file.
+        """
+        super().__init__(lstm_weights, dense_weights)
+        self.scaler = MinMaxParams(data_min, data_max)
+        self.sequence_length = int(sequence_length)
+        self.fit_start = fit_start
+        self.fit_end = fit_end
+        self.fit_fingerprint = fit_fingerprint
+        self.fit_source = fit_source
+        self.source_version = source_version
+
+    @classmethod
+    def from_h5(cls, model_path, dates, closes, sequence_length=50, fit_source='training'):
+        """
+        Bundle a saved Keras model with a scaler fitted on a price history.
+
+        Args:
+            model_path (str): Path to an lstm_model_<TICKER>.h5 file.
+            dates: Dates of the history, oldest first.
+            closes: Closes of the history; the scaler is fitted on their min and max.
+            sequence_length (int): Input window length.
+            fit_source (str): 'training' if the history is the model's training data,
+                'backfill' otherwise.
+        """
+        if fit_source not in FIT_SOURCES:
+            raise ValueError(f"Unknown fit source: {fit_source}")
+        from utils.forecast_job import model_version
+
+        model = NumpyLSTM.from_h5(model_path)
+        dates = np.asarray(dates, dtype='datetime64[ns]')
+        closes = np.asarray(closes, dtype=np.float64)
+        return cls(model.lstm_weights, (model.dense_kernel, model.dense_bias), closes.min(), closes.max(),
+                   sequence_length, str(dates[0])[:10], str(dates[-1])[:10], data_fingerprint(dates, closes),
+                   fit_source, model_version(model_path))
+
+    def metadata(self):
+        """
+        Return the bundle metadata as a dict.
+        """
+        return {
+            'format_version': FORMAT_VERSION,
+            'layers': len(self.lstm_weights),
+            'data_min': float(self.scaler.data_min_[0]),
+            'data_max': float(self.scaler.data_max_[0]),
+            'sequence_length': self.sequence_length,
+            'fit_start': self.fit_start,
+            'fit_end': self.fit_end,
+            'fit_fingerprint': self.fit_fingerprint,
+            'fit_source': self.fit_source,
+            'source_version': self.source_version,
+        }
+
+    def save(self, path):
+        """
+        Write the bundle atomically, so readers never see a partially written file.
+        """
+        arrays = {'metadata': np.array(json.dumps(self.metadata()))}
+        for i, layer in enumerate(self.lstm_weights):
+            for name, weights in zip(('kernel', 'recurrent_kernel', 'bias'), layer):
+                arrays[f'lstm_{i}_{name}'] = weights.astype(np.float32)
+        arrays['dense_kernel'] = self.dense_kernel.astype(np.float32)
+        arrays['dense_bias'] = self.dense_bias.astype(np.float32)
+
+        tmp_path = os.path.join(os.path.dirname(path) or '.', f".tmp-{os.getpid()}-{os.path.basename(path)}")
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a bundle with a single file read.
+
+        Raises:
+            ValueError: If the bundle was written in another format version.
+        """
+        with open(path, 'rb') as f:
+            arrays = np.load(io.BytesIO(f.read()))
+        metadata = json.loads(str(arrays['metadata']))
+        if metadata['format_version'] != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported bundle format {metadata['format_version']}")
+        lstm_weights = [tuple(arrays[f'lstm_{i}_{name}'] for name in ('kernel', 'recurrent_kernel', 'bias'))
+                        for i in range(metadata['layers'])]
+        return cls(lstm_weights, (arrays['dense_kernel'], arrays['dense_bias']), metadata['data_min'],
+                   metadata['data_max'], metadata['sequence_length'], metadata['fit_start'],
+                   metadata['fit_end'], metadata['fit_fingerprint'], metadata['fit_source'],
+                   metadata['source_version'])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bundle the saved .h5 models with a scaler fitted on the current price history.")
+    parser.add_argument('--models-dir', default='utils/models')
+    args = parser.parse_args()
+
+    from utils import data_access
+    from utils.forecast_job import ticker_from_model_path
+
+    for model_path in sorted(glob.glob(os.path.join(args.models_dir, 'lstm_model_*.h5'))):
+        ticker = ticker_from_model_path(model_path)
+        df = data_access.exact_prices_for(ticker, columns=['Close'])
+        if df.empty:
+            print(f"No data found for {ticker}. Skipping...")
+            continue
+        # The training history of these models is unknown; the scaler is fitted on
+        # today's history, as the live predictor did before bundles existed
+        bundle = ModelBundle.from_h5(model_path, df['Date'].to_numpy(), df['Close'].to_numpy(),
+                                     fit_source='backfill')
+        bundle.save(bundle_path_for(model_path))
+        print(f"{ticker}: {bundle_path_for(model_path)} (scaler fitted on {bundle.fit_start} to "
+              f"{bundle.fit_end}, fingerprint {bundle.fit_fingerprint})")
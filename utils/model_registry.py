@@ -0,0 +1,191 @@
+import glob
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from utils.instrumentation import span
+
+
+class ModelRegistry:
+    """
+    A thread-safe LRU pool of loaded models shared by all sessions.
+
+    Models stay resident until their estimated resident size exceeds the
+    pool's cap, at which point the least recently used ones are dropped. A
+    model's resident size is estimated from its weight bytes and the
+    RESIDENT_FACTORS of its backend. A model is reloaded only when its file on
+    disk changes (mtime or size). Each file can be loaded with the
+    'keras' backend (a Keras model) or the 'numpy' backend (a NumpyLSTM, which
+    never imports TensorFlow).
+    """
+
+    BACKENDS = ('keras', 'numpy')
+    # Resident memory of a loaded model per byte of its weights, measured with
+    # benchmarks/bench_numpy_backend.py on the saved models. A Keras model also
+    # holds its layers, graph and TensorFlow state; a NumpyLSTM or bundle is
+    # little more than its weight arrays.
+    RESIDENT_FACTORS = {'keras': 5.5, 'numpy': 1.0}
+
+    def __init__(self, max_bytes=None, backend=None):
+        """
+        Initialize the pool.
+
+        Args:
+            max_bytes (int): Cap on the estimated resident size of all loaded
+                models (see RESIDENT_FACTORS). Defaults to the MODEL_POOL_MAX_MB
+                environment variable, or 512 MB.
+            backend (str): Default backend, 'keras' or 'numpy'. Defaults to the
+                MODEL_BACKEND environment variable, or 'keras'.
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("MODEL_POOL_MAX_MB", 512)) * 1024 * 1024)
+        backend = backend or os.getenv("MODEL_BACKEND", "keras")
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown model backend: {backend}")
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self._models = OrderedDict()  # (path, backend) -> (file signature, model, estimated resident bytes)
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._path_locks = {}
+
+    @staticmethod
+    def _file_signature(path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _weight_bytes(model):
+        return sum(weights.nbytes for weights in model.get_weights())
+
+    @classmethod
+    def _resident_bytes(cls, weight_bytes, path, backend):
+        # A bundle is a NumPy model whichever backend asked for it
+        return int(weight_bytes * cls.RESIDENT_FACTORS['numpy' if path.endswith('.npz') else backend])
+
+    def _stat(self, path):
+        return self._stats.setdefault(path, {
+            'hits': 0, 'misses': 0, 'loads': 0, 'load_time_s': 0.0, 'weight_bytes': 0, 'resident_bytes': 0,
+        })
+
+    @staticmethod
+    def _load(path, backend):
+        if path.endswith('.npz'):
+            # A bundle holds NumPy weights only, whatever the backend
+            from utils.model_bundle import ModelBundle
+            return ModelBundle.load(path)
+        if backend == 'numpy':
+            from utils.numpy_lstm import NumpyLSTM
+            return NumpyLSTM.from_h5(path)
+        # TensorFlow is only imported once the first Keras model is needed
+        from tensorflow.keras.models import load_model
+        return load_model(path)
+
+    def get(self, model_path, backend=None):
+        """
+        Return the loaded model for a file, loading it if needed.
+
+        Args:
+            model_path (str): Path to the saved .h5 model or .npz bundle.
+            backend (str): 'keras' or 'numpy'. Defaults to the pool's backend.
+
+        Returns:
+            The Keras model, NumpyLSTM or ModelBundle. It is shared, so do not train or modify it.
+        """
+        backend = backend or self.backend
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown model backend: {backend}")
+        path = os.path.abspath(model_path)
+        key = (path, backend)
+        signature = self._file_signature(path)
+
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None and entry[0] == signature:
+                self._models.move_to_end(key)
+                self._stat(key)['hits'] += 1
+                return entry[1]
+            path_lock = self._path_locks.setdefault(key, threading.Lock())
+
+        # Load outside the pool lock so other models stay available, but only once per file.
+        with path_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None and entry[0] == signature:
+                    self._models.move_to_end(key)
+                    self._stat(key)['hits'] += 1
+                    return entry[1]
+
+            start = time.perf_counter()
+            with span('model.load', model=os.path.basename(path), backend=backend):
+                model = self._load(path, backend)
+            elapsed = time.perf_counter() - start
+            weight_bytes = self._weight_bytes(model)
+            size = self._resident_bytes(weight_bytes, path, backend)
+
+            with self._lock:
+                stat = self._stat(key)
+                stat['misses'] += 1
+                stat['loads'] += 1
+                stat['load_time_s'] = elapsed
+                stat['weight_bytes'] = weight_bytes
+                stat['resident_bytes'] = size
+                self._models[key] = (signature, model, size)
+                self._models.move_to_end(key)
+                self._evict()
+            return model
+
+    def _evict(self):
+        while len(self._models) > 1 and self.resident_bytes() > self.max_bytes:
+            self._models.popitem(last=False)
+
+    def resident_bytes(self):
+        """
+        Return the estimated resident size of all loaded models, the number the cap applies to.
+        """
+        return sum(size for _, _, size in self._models.values())
+
+    def clear(self):
+        """
+        Drop all resident models. Statistics are kept.
+        """
+        with self._lock:
+            self._models.clear()
+
+    def stats(self):
+        """
+        Return per-model load time, hit rate, weight size and estimated resident size.
+
+        Returns:
+            pd.DataFrame: One row per model file seen by the pool.
+        """
+        with self._lock:
+            rows = []
+            for (path, backend), stat in self._stats.items():
+                requests = stat['hits'] + stat['misses']
+                rows.append({
+                    'model': os.path.basename(path),
+                    'backend': backend,
+                    'resident': (path, backend) in self._models,
+                    'loads': stat['loads'],
+                    'load_time_s': round(stat['load_time_s'], 3),
+                    'hit_rate': stat['hits'] / requests if requests else 0.0,
+                    'weights_kb': round(stat['weight_bytes'] / 1024, 1),
+                    'est_resident_kb': round(stat['resident_bytes'] / 1024, 1),
+                })
+        return pd.DataFrame(rows, columns=['model', 'backend', 'resident', 'loads', 'load_time_s', 'hit_rate',
+                                           'weights_kb', 'est_resident_kb'])
+
+
+# Shared by every session of the Streamlit server process
+model_registry = ModelRegistry()
+
+
+if __name__ == "__main__":
+    for path in sorted(glob.glob("utils/models/lstm_model_*.h5")):
+        model_registry.get(path)
+        model_registry.get(path)
+    print(model_registry.stats().to_string(index=False))
@@ -0,0 +1,182 @@
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+from utils import data_access
+from utils.windowing import split_starts, split_windows, window_dataset
+from utils.workers import init_worker
+
+
+class StockPricePredictor:
+    """Handles LSTM-based stock price prediction."""
+
+    def __init__(self, data, ticker):
+        from sklearn.preprocessing import MinMaxScaler
+
+        self.data = data
+        self.ticker = ticker
+        self.scaler = MinMaxScaler(feature_range=(0, 1))
+        self.model = None
+
+    def preprocess_data(self, sequence_length=50):
+        """Prepares data for training and testing. The returned windows are views of the scaled closes."""
+        self.sequence_length = sequence_length
+        self.scaled_data = self.scaler.fit_transform(self.data[['Close']].values).reshape(-1)
+        return split_windows(self.scaled_data, sequence_length)
+
+    def datasets(self, batch_size=32):
+        """tf.data pipelines over the train, test and validation windows, gathered one batch at a time."""
+        train, test, val = split_starts(len(self.scaled_data), self.sequence_length)
+        return (
+            window_dataset(self.scaled_data, train, self.sequence_length, batch_size, shuffle=True),
+            window_dataset(self.scaled_data, test, self.sequence_length, batch_size),
+            window_dataset(self.scaled_data, val, self.sequence_length, batch_size),
+        )
+
+    def build_model(self):
+        """Builds the LSTM model."""
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import Input, LSTM, Dense, Dropout
+
+        model = Sequential([
+            Input(shape=(50, 1)),
+            LSTM(50, return_sequences=True),
+            Dropout(0.2),
+            LSTM(50, return_sequences=False),
+            Dropout(0.2),
+            Dense(1)
+        ])
+        model.compile(optimizer='adam', loss='mean_squared_error')
+        self.model = model
+
+    def train_model(self, train_ds, val_ds, epochs=20, verbose=0):
+        """Trains the model on the datasets returned by `datasets`."""
+        if self.model is None:
+            self.build_model()
+
+        self.model.fit(train_ds, epochs=epochs, validation_data=val_ds, verbose=verbose)
+
+    def rmse(self, dataset, y):
+        """Root mean squared error in price units (EUR) of the predictions for a dataset against targets y."""
+        y_pred = self.scaler.inverse_transform(self.model.predict(dataset, verbose=0))
+        y_true = self.scaler.inverse_transform(y.reshape(-1, 1))
+        return float(np.sqrt(np.mean((y_true - y_pred) ** 2)))
+
+    def save_model(self, model_dir="utils/models"):
+        """
+        Saves the trained model atomically, so readers never see a partially written file,
+        and bundles it with the fitted scaler and the training date range (see utils.model_bundle).
+        """
+        from utils.model_bundle import ModelBundle, bundle_path_for
+
+        os.makedirs(model_dir, exist_ok=True)
+        model_path = os.path.join(model_dir, f"lstm_model_{self.ticker}.h5")
+        tmp_path = os.path.join(model_dir, f".tmp-{os.getpid()}-lstm_model_{self.ticker}.h5")
+        self.model.save(tmp_path)
+        os.replace(tmp_path, model_path)
+
+        bundle = ModelBundle.from_h5(model_path, self.data['Date'].to_numpy(), self.data['Close'].to_numpy(),
+                                     self.sequence_length, fit_source='training')
+        bundle.save(bundle_path_for(model_path))
+        return model_path
+
+
+def train_ticker(ticker, model_dir="utils/models", epochs=20, batch_size=32):
+    """
+    Train, evaluate and save the model for one ticker.
+
+    Returns:
+        dict: Ticker, status, wall time, validation and test RMSE and the model path.
+    """
+    start = time.perf_counter()
+    # The exact closes, since the scaler fitted on them is saved in the model's bundle
+    df = data_access.exact_prices_for(ticker, columns=['Close'])
+    if df.empty:
+        return {'ticker': ticker, 'status': 'no data', 'wall_time_s': 0.0}
+
+    predictor = StockPricePredictor(df, ticker)
+    _, _, _, y_test, _, y_val = predictor.preprocess_data()
+    train_ds, test_ds, val_ds = predictor.datasets(batch_size)
+    predictor.train_model(train_ds, val_ds, epochs=epochs)
+    model_path = predictor.save_model(model_dir)
+
+    return {
+        'ticker': ticker,
+        'status': 'ok',
+        'wall_time_s': round(time.perf_counter() - start, 1),
+        'val_rmse': round(predictor.rmse(val_ds, y_val), 4),
+        'test_rmse': round(predictor.rmse(test_ds, y_test), 4),
+        'model_path': model_path,
+    }
+
+
+def train_all(tickers, workers=None, threads_per_worker=1, model_dir="utils/models", epochs=20, batch_size=32):
+    """
+    Train models for several tickers in a process pool.
+
+    Args:
+        tickers (list): Tickers to train.
+        workers (int): Number of processes. Defaults to cpu_count // threads_per_worker.
+        threads_per_worker (int): TensorFlow intra-op threads per process.
+        model_dir (str): Where the lstm_model_<TICKER>.h5 files are written.
+        epochs (int): Training epochs per model.
+        batch_size (int): Training batch size.
+
+    Returns:
+        pd.DataFrame: One summary row per ticker.
+    """
+    workers = workers or max(1, (os.cpu_count() or 1) // threads_per_worker)
+    rows = []
+    start = time.perf_counter()
+    # Spawned workers, since TensorFlow does not survive a fork
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=init_worker, initargs=(threads_per_worker, True)) as pool:
+        futures = {pool.submit(train_ticker, ticker, model_dir, epochs, batch_size): ticker for ticker in tickers}
+        for future in as_completed(futures):
+            try:
+                row = future.result()
+            except Exception as e:
+                row = {'ticker': futures[future], 'status': f"error: {e}", 'wall_time_s': 0.0}
+            print(f"{row['ticker']}: {row['status']} in {row['wall_time_s']}s"
+                  + (f", val RMSE {row['val_rmse']}" if 'val_rmse' in row else ""))
+            rows.append(row)
+
+    summary = pd.DataFrame(rows).sort_values('ticker').reset_index(drop=True)
+    print(f"Trained {len(tickers)} tickers with {workers} workers in {time.perf_counter() - start:.1f}s")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the per-ticker LSTM models.")
+    parser.add_argument('tickers', nargs='*', help="tickers to train, e.g. BMW.DE VOW.DE")
+    parser.add_argument('--all', action='store_true', help="train every ticker in the price store")
+    parser.add_argument('--existing', action='store_true', help="retrain the tickers that already have a model")
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: cores / threads)")
+    parser.add_argument('--threads', type=int, default=1, help="TensorFlow threads per process")
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--model-dir', default="utils/models")
+    parser.add_argument('--summary', default="utils/data/training/summary.csv",
+                        help="where to write the per-ticker summary CSV")
+    args = parser.parse_args()
+
+    if args.all:
+        tickers = sorted(data_access.prices()['Ticker'].unique())
+    elif args.existing:
+        tickers = sorted(os.path.basename(p)[len('lstm_model_'):-len('.h5')]
+                         for p in glob.glob(os.path.join(args.model_dir, 'lstm_model_*.h5')))
+    else:
+        tickers = args.tickers
+    if not tickers:
+        parser.error("give tickers, --all or --existing")
+
+    summary = train_all(tickers, workers=args.workers, threads_per_worker=args.threads,
+                        model_dir=args.model_dir, epochs=args.epochs)
+    os.makedirs(os.path.dirname(args.summary) or '.', exist_ok=True)
+    summary.to_csv(args.summary, index=False)
+    print(summary.to_string(index=False))
@@ -0,0 +1,88 @@
+"""
+Inference for the saved LSTM models in plain NumPy.
+
+The lstm_model_*.h5 files are read with h5py and the LSTM -> Dropout -> LSTM ->
+Dropout -> Dense forward pass runs on the weights directly, so serving a
+forecast never imports TensorFlow.
+"""
+import json
+
+import numpy as np
+
+from utils.lstm_decoder import IncrementalDecoder
+
+SUPPORTED_LAYERS = {'InputLayer', 'LSTM', 'Dropout', 'Dense'}
+
+
+class NumpyLSTM(IncrementalDecoder):
+    """
+    A stacked LSTM forecaster loaded from a Keras .h5 file and run in NumPy.
+
+    It has the parts of the Keras model interface StockPredictor uses
+    (`predict` and `get_weights`), so it can stand in for the Keras model.
+    """
+
+    @classmethod
+    def from_h5(cls, model_path):
+        """
+        Load the weights of a saved Keras model.
+
+        Args:
+            model_path (str): Path to an lstm_model_<TICKER>.h5 file.
+
+        Returns:
+            NumpyLSTM: The model.
+
+        Raises:
+            ValueError: If the model has layers or activations other than the
+                ones the forecaster was built with.
+        """
+        import h5py
+
+        lstm_weights, dense_weights = [], None
+        with h5py.File(model_path, 'r') as f:
+            config = json.loads(f.attrs['model_config'])
+            weights = f['model_weights']
+            for layer in config['config']['layers']:
+                kind, layer_config = layer['class_name'], layer['config']
+                if kind not in SUPPORTED_LAYERS:
+                    raise ValueError(f"{model_path}: unsupported layer {kind}")
+                if kind == 'LSTM':
+                    if (layer_config.get('activation', 'tanh') != 'tanh'
+                            or layer_config.get('recurrent_activation', 'sigmoid') != 'sigmoid'):
+                        raise ValueError(f"{model_path}: unsupported LSTM activations")
+                    lstm_weights.append(cls._layer_weights(weights, layer_config['name']))
+                elif kind == 'Dense':
+                    if layer_config.get('activation', 'linear') != 'linear':
+                        raise ValueError(f"{model_path}: unsupported Dense activation")
+                    dense_weights = cls._layer_weights(weights, layer_config['name'])
+        return cls(lstm_weights, dense_weights)
+
+    @staticmethod
+    def _layer_weights(weights, name):
+        group = weights[name]
+        return [group[weight_name][()] for weight_name in group.attrs['weight_names']]
+
+    def predict(self, x, batch_size=None, verbose=0):
+        """
+        Predict the next scaled close for a batch of windows, like `keras.Model.predict`.
+
+        Args:
+            x (np.ndarray): Scaled inputs, shape (batch, steps, 1).
+            batch_size (int): Windows run through the network at once, which bounds
+                the memory of the intermediate sequences. All at once if None.
+            verbose: Ignored; accepted for compatibility with Keras.
+
+        Returns:
+            np.ndarray: Predictions, shape (batch, 1).
+        """
+        batch_size = batch_size or max(len(x), 1)
+        preds = [self.encode(x[start:start + batch_size])[0] for start in range(0, len(x), batch_size)]
+        return np.concatenate(preds)[:, None] if preds else np.empty((0, 1))
+
+    def get_weights(self):
+        """
+        Return the weight arrays in Keras order.
+        """
+        weights = [w for layer in self.lstm_weights for w in layer]
+        return weights + [self.dense_kernel, self.dense_bias]
@@ -1,6 +1,13 @@
 import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
-from utils.apiclass import SimFinAPI  # Correct import
+
+from utils.downsampling import downsample
+from utils.instrumentation import timed
+
+CHART_WIDTH_PX = 1200  # points kept per trace; roughly one per pixel column of a wide chart
+WEBGL_THRESHOLD = 5000  # above this many points a figure is drawn with WebGL
+MARKER_THRESHOLD = 60  # traces with at most this many points also get markers
 
 def get_stock_price_chart(start_date, end_date, tickers):
     """
@@ -14,6 +21,8 @@ def get_stock_price_chart(start_date, end_date, tickers):
     Returns:
         fig: A Plotly figure object.
     """
+    from utils.apiclass import SimFinAPI
+
     # Create an instance of SimFinAPI
     simfin_api = SimFinAPI()
     
@@ -30,14 +39,40 @@ def get_stock_price_chart(start_date, end_date, tickers):
     else:
         return None
 
+@timed('chart.build')
+def line_chart(series, title, x='Date', y='Close', width_px=CHART_WIDTH_PX, method='lttb',
+               xaxis_title="Date", yaxis_title="Close ($)"):
+    """
+    Builds a line chart of one or more series, downsampled to the chart width.
+
+    Series longer than `width_px` points are reduced with a shape-preserving
+    downsampler; shorter ones, such as a zoomed-in range, keep every point. Once
+    the figure holds more than WEBGL_THRESHOLD points it is drawn with Scattergl.
+
+    Parameters:
+        series (dict): Trace name -> DataFrame sorted by `x`.
+        title (str): Chart title.
+        x (str): x column.
+        y (str): y column.
+        width_px (int): Point budget per trace.
+        method (str): 'lttb' or 'minmax', see utils.downsampling.
+        xaxis_title (str): x axis title.
+        yaxis_title (str): y axis title.
+
+    Returns:
+        fig: A Plotly figure object.
+    """
+    reduced = {name: downsample(df, width_px, x, y, method) for name, df in series.items()}
+    trace = go.Scattergl if sum(len(df) for df in reduced.values()) > WEBGL_THRESHOLD else go.Scatter
+
+    fig = go.Figure()
+    for name, df in reduced.items():
+        mode = 'lines+markers' if len(df) <= MARKER_THRESHOLD else 'lines'
+        fig.add_trace(trace(x=df[x], y=df[y], mode=mode, name=name))
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title=yaxis_title)
+    return fig
+
 def plot_time_series(df, ticker):
-    fig = px.line(
-        df,
-        x='Date',
-        y='Close',
-        title=f"{ticker} Share Price Over Time",
-        labels={'Close': 'Closing Price (EUR)', 'Date': 'Date'}
-    )
-    fig.update_traces(mode="lines+markers")
-    fig.update_layout(margin=dict(t=50, b=40))
+    fig = line_chart({ticker: df}, f"{ticker} Share Price Over Time", yaxis_title='Closing Price (EUR)')
+    fig.update_layout(margin=dict(t=50, b=40), showlegend=False)
     return fig
@@ -0,0 +1,126 @@
+"""
+Per-ticker slice index over the price table.
+
+The table is kept sorted by Ticker and Date, so each ticker's rows are one
+contiguous block. The index stores the [start, end) offsets of every block,
+finds date bounds inside a block by binary search, and answers queries with
+positional slices, which pandas and NumPy return as views. A lookup costs a
+dict access plus O(log n) in the ticker's history, however many tickers the
+table holds.
+"""
+import numpy as np
+import pandas as pd
+
+
+class PriceIndex:
+    """
+    Contiguous, date-ordered per-ticker view of a price DataFrame.
+
+    The slices share memory with the indexed table: treat them as read-only and
+    ``.copy()`` before modifying them.
+    """
+
+    def __init__(self, df):
+        """
+        Index a price table.
+
+        Args:
+            df (pd.DataFrame): Share prices with Ticker, Date and Company Name columns.
+                It is sorted by Ticker and Date first unless it already is.
+        """
+        tickers = df['Ticker'].to_numpy()
+        dates = df['Date'].to_numpy()
+        if len(df) > 1:
+            same = tickers[1:] == tickers[:-1]
+            in_order = (tickers[1:] > tickers[:-1]) | (same & (dates[1:] >= dates[:-1]))
+            if not in_order.all():
+                df = df.sort_values(['Ticker', 'Date'], kind='stable').reset_index(drop=True)
+                tickers = df['Ticker'].to_numpy()
+                dates = df['Date'].to_numpy()
+
+        self.df = df
+        self._dates = dates
+        starts = np.flatnonzero(np.r_[True, tickers[1:] != tickers[:-1]]) if len(df) else np.array([], dtype=int)
+        ends = np.r_[starts[1:], len(df)].astype(int)
+        self._offsets = {ticker: (int(start), int(end)) for ticker, start, end in zip(tickers[starts], starts, ends)}
+        names = df['Company Name'].to_numpy()[starts] if 'Company Name' in df else []
+        self._tickers_by_name = {}
+        for name, ticker in zip(names, tickers[starts]):
+            if isinstance(name, str):
+                self._tickers_by_name.setdefault(name, ticker)
+
+    def __contains__(self, ticker):
+        return ticker in self._offsets
+
+    def tickers(self):
+        """
+        Return the indexed tickers in table order.
+        """
+        return list(self._offsets)
+
+    def ticker_for(self, company_name):
+        """
+        Return the ticker of a company name, or None if it is unknown.
+        """
+        return self._tickers_by_name.get(company_name)
+
+    def bounds(self, ticker, start=None, end=None):
+        """
+        Return the row offsets of a ticker's prices between two dates.
+
+        Args:
+            ticker (str): Ticker symbol.
+            start: Inclusive lower bound on Date. No bound if None.
+            end: Inclusive upper bound on Date. No bound if None.
+
+        Returns:
+            tuple: (first, stop) positions in the indexed table; equal if there are no rows.
+        """
+        if ticker not in self._offsets:
+            return 0, 0
+        block_start, block_end = self._offsets[ticker]
+        dates = self._dates[block_start:block_end]
+        first, stop = 0, len(dates)
+        if start is not None:
+            first = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side='left'))
+        if end is not None:
+            stop = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side='right'))
+        return block_start + first, block_start + max(first, stop)
+
+    def slice(self, ticker, start=None, end=None):
+        """
+        Return a ticker's prices between two dates, sorted by Date.
+
+        Args:
+            ticker (str): Ticker symbol.
+            start: Inclusive lower bound on Date. No bound if None.
+            end: Inclusive upper bound on Date. No bound if None.
+
+        Returns:
+            pd.DataFrame: A view of the indexed table (empty if the ticker is unknown).
+        """
+        first, stop = self.bounds(ticker, start, end)
+        return self.df.iloc[first:stop]
+
+    def tail(self, ticker, n):
+        """
+        Return a ticker's last `n` trading days.
+        """
+        first, stop = self._offsets.get(ticker, (0, 0))
+        return self.df.iloc[max(first, stop - n):stop]
+
+    def last(self, ticker, period):
+        """
+        Return a ticker's prices within `period` of its latest date, e.g. pd.Timedelta(days=30).
+        """
+        if ticker not in self._offsets:
+            return self.df.iloc[0:0]
+        stop = self._offsets[ticker][1]
+        return self.slice(ticker, start=pd.Timestamp(self._dates[stop - 1]) - period)
+
+    def column(self, ticker, column, start=None, end=None):
+        """
+        Return one column of a ticker's prices between two dates as a NumPy view.
+        """
+        first, stop = self.bounds(ticker, start, end)
+        return self.df[column].to_numpy()[first:stop]
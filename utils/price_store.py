@@ -0,0 +1,171 @@
+import os
+import shutil
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+
+class PriceStore:
+    """
+    A columnar (Parquet) store for processed share prices, partitioned by ticker.
+
+    Each ticker lives in its own ``Ticker=<symbol>`` directory, so reads that
+    name a few tickers only open those files, and only the requested columns
+    are decoded.
+
+    Every write replaces a ``_version`` stamp in the root, so readers can tell
+    that the store changed by statting that one file instead of every
+    partition. Parquet dataset discovery skips names starting with '_'.
+    """
+
+    VERSION_FILE = '_version'
+
+    def __init__(self, root='utils/data/processed/de_share_prices_processed'):
+        """
+        Initialize the store.
+
+        Args:
+            root (str): Directory holding the partitioned dataset.
+        """
+        self.root = root
+
+    def exists(self):
+        """
+        Return True if the store has been written.
+        """
+        return os.path.isdir(self.root) and any(
+            name.startswith('Ticker=') for name in os.listdir(self.root)
+        )
+
+    @property
+    def version_path(self):
+        """
+        Path of the stamp file that changes on every write.
+        """
+        return os.path.join(self.root, self.VERSION_FILE)
+
+    def version(self):
+        """
+        Return the store's current version stamp, or None for a store written
+        before stamps were added.
+        """
+        try:
+            with open(self.version_path) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _bump_version(self):
+        tmp_path = f"{self.version_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(uuid.uuid4().hex)
+        os.replace(tmp_path, self.version_path)
+
+    def _dataset(self):
+        return ds.dataset(self.root, format='parquet', partitioning='hive')
+
+    def write(self, df):
+        """
+        Replace the store contents with the given DataFrame.
+
+        Args:
+            df (pd.DataFrame): Processed share prices with a Ticker column.
+        """
+        if os.path.isdir(self.root):
+            shutil.rmtree(self.root)
+        self.append(df)
+
+    def append(self, df, schema=None):
+        """
+        Add rows to the store without rewriting existing files.
+
+        Args:
+            df (pd.DataFrame): Rows to add, with a Ticker column.
+            schema (pa.Schema): Column types to write. Inferred from df if None.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        if df.empty:
+            self._bump_version()
+            return
+        df = df.sort_values(['Ticker', 'Date'], kind='stable')
+        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        # The timestamp keeps parts in write order; the uuid keeps two appends in
+        # the same microsecond (or from two processes) from overwriting each other
+        stamp = pd.Timestamp.now().strftime('%Y%m%d%H%M%S%f')
+        ds.write_dataset(
+            table,
+            self.root,
+            format='parquet',
+            partitioning=ds.partitioning(pa.schema([('Ticker', pa.string())]), flavor='hive'),
+            basename_template=f"part-{stamp}-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+        )
+        self._bump_version()
+
+    def read(self, columns=None, tickers=None, start_date=None, end_date=None):
+        """
+        Read share prices, pushing column, ticker and date filters down to Parquet.
+
+        Args:
+            columns (list): Columns to load. Ticker and Date are always included.
+            tickers (list): Tickers to load. Loads all tickers if None.
+            start_date (str or datetime): Inclusive lower bound on Date.
+            end_date (str or datetime): Inclusive upper bound on Date.
+
+        Returns:
+            pd.DataFrame: Rows sorted by Ticker and Date.
+        """
+        dataset = self._dataset()
+
+        if columns is not None:
+            columns = ['Ticker', 'Date'] + [c for c in columns if c not in ('Ticker', 'Date')]
+
+        date_type = dataset.schema.field('Date').type
+        conditions = []
+        if tickers:
+            conditions.append(ds.field('Ticker').isin(list(tickers)))
+        if start_date is not None:
+            conditions.append(ds.field('Date') >= pa.scalar(pd.Timestamp(start_date), type=date_type))
+        if end_date is not None:
+            conditions.append(ds.field('Date') <= pa.scalar(pd.Timestamp(end_date), type=date_type))
+
+        flt = None
+        for condition in conditions:
+            flt = condition if flt is None else flt & condition
+
+        df = dataset.to_table(columns=columns, filter=flt).to_pandas()
+        df['Ticker'] = df['Ticker'].astype(str)
+        df = df[['Ticker'] + [c for c in df.columns if c != 'Ticker']]
+        return df.sort_values(['Ticker', 'Date'], kind='stable').reset_index(drop=True)
+
+    def tickers(self):
+        """
+        Return the tickers present in the store, read from the partition names.
+        """
+        return sorted(
+            name.split('=', 1)[1] for name in os.listdir(self.root) if name.startswith('Ticker=')
+        )
+
+    @classmethod
+    def from_csv(cls, csv_path='utils/data/processed/de_share_prices_processed.csv', root=None):
+        """
+        Build a store from an existing processed CSV file.
+
+        Args:
+            csv_path (str): Path to the processed CSV.
+            root (str): Store directory. Uses the default location if None.
+
+        Returns:
+            PriceStore: The written store.
+        """
+        store = cls(root) if root else cls()
+        df = pd.read_csv(csv_path, parse_dates=['Date'])
+        store.write(df)
+        return store
+
+
+if __name__ == "__main__":
+    store = PriceStore.from_csv()
+    print(f"Price store written to {store.root}")
@@ -0,0 +1,137 @@
+"""
+Concurrent 2-day forecasts for the tickers of a sector.
+
+Each ticker's forecast runs in a bounded thread pool, and results are yielded
+as soon as they arrive, so a page can render every ticker without waiting for
+the slowest one. A ticker whose forecast raises, or runs longer than its
+timeout, is yielded with an error message instead of a result.
+"""
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utils import data_access
+from utils.forecast_job import ForecastTable
+from utils.model_bundle import bundle_path_for
+
+DEFAULT_WORKERS = int(os.getenv("SECTOR_FORECAST_WORKERS", 4))
+DEFAULT_TIMEOUT_S = float(os.getenv("SECTOR_FORECAST_TIMEOUT_S", 30))
+
+
+def model_path_for(ticker, models_dir='utils/models'):
+    return os.path.join(models_dir, f"lstm_model_{ticker}.h5")
+
+
+def forecast_ticker(ticker, risk_profile, forecast_table=None, models_dir='utils/models'):
+    """
+    Forecast the next two closes of one ticker and recommend an action.
+
+    Uses the nightly batch forecast when it is current, otherwise predicts live.
+
+    Args:
+        ticker (str): Ticker symbol.
+        risk_profile (str): 'high' or 'low'.
+        forecast_table (ForecastTable): Batch forecasts. Uses the default table if None.
+        models_dir (str): Directory holding lstm_model_<TICKER>.h5 files or their .npz bundles.
+
+    Returns:
+        dict: ticker, company_name, history (the last 5 closes), last_date,
+            predicted_closes and recommendation.
+
+    Raises:
+        FileNotFoundError: If the ticker has no model.
+        ValueError: If the ticker has no prices.
+    """
+    model_path = model_path_for(ticker, models_dir)
+    if not (os.path.exists(model_path) or os.path.exists(bundle_path_for(model_path))):
+        raise FileNotFoundError(f"No forecast model has been trained for {ticker} yet.")
+    ticker_df = data_access.prices_for(ticker)
+    if ticker_df.empty:
+        raise ValueError(f"No share prices found for {ticker}.")
+
+    forecast = (forecast_table or ForecastTable()).lookup(ticker, ticker_df['Date'].iloc[-1], model_path)
+    if forecast is not None:
+        predicted_closes = [forecast['Pred_Day1'], forecast['Pred_Day2']]
+        recommendation = forecast[f"Recommendation_{risk_profile}"]
+    else:
+        from utils.lstm_predictor import StockPredictor
+
+        predictor = StockPredictor(model_path, ticker_df)
+        last_actual, predicted_closes = predictor.get_last_actual_and_predictions()
+        recommendation = predictor.recommend(risk_profile, last_actual, predicted_closes)
+
+    return {
+        'ticker': ticker,
+        'company_name': ticker_df['Company Name'].iloc[0],
+        'history': ticker_df[['Date', 'Close']].iloc[-5:],
+        'last_date': ticker_df['Date'].iloc[-1],
+        'predicted_closes': predicted_closes,
+        'recommendation': recommendation,
+    }
+
+
+def forecast_tickers(tickers, risk_profile, workers=None, timeout=None, forecast_table=None):
+    """
+    Forecast several tickers concurrently, yielding each result as it completes.
+
+    Args:
+        tickers (list): Ticker symbols.
+        risk_profile (str): 'high' or 'low'.
+        workers (int): Threads in the pool. Defaults to SECTOR_FORECAST_WORKERS (4).
+        timeout (float): Seconds a ticker may run once it has started. Defaults to
+            SECTOR_FORECAST_TIMEOUT_S (30).
+        forecast_table (ForecastTable): Batch forecasts. Uses the default table if None.
+
+    Yields:
+        tuple: (ticker, result, error). `result` is the dict from `forecast_ticker`
+            and `error` is None, or `result` is None and `error` says what failed.
+    """
+    if not tickers:
+        return
+    workers = max(1, min(workers or DEFAULT_WORKERS, len(tickers)))
+    timeout = timeout or DEFAULT_TIMEOUT_S
+    forecast_table = forecast_table or ForecastTable()
+    started = {}
+    started_lock = threading.Lock()
+
+    def run(ticker):
+        with started_lock:
+            started[ticker] = time.monotonic()
+        return forecast_ticker(ticker, risk_profile, forecast_table)
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sector-forecast')
+    try:
+        pending = {pool.submit(run, ticker): ticker for ticker in tickers}
+        abandoned = []  # timed-out futures whose threads are still busy
+        while pending:
+            # Wake up for the next completion or the next deadline of a running ticker
+            with started_lock:
+                deadlines = [started[t] + timeout for t in pending.values() if t in started]
+            wait_s = max(0.0, min(deadlines) - time.monotonic()) if deadlines else timeout
+            done, _ = wait(pending, timeout=wait_s, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                ticker = pending.pop(future)
+                try:
+                    yield ticker, future.result(), None
+                except Exception as e:
+                    yield ticker, None, str(e)
+
+            now = time.monotonic()
+            for future, ticker in list(pending.items()):
+                with started_lock:
+                    start = started.get(ticker)
+                if start is not None and now - start >= timeout and not future.done():
+                    pending.pop(future)
+                    abandoned.append(future)
+                    yield ticker, None, f"Forecast for {ticker} timed out after {timeout:.0f}s."
+
+            # If every worker is stuck on a timed-out ticker, the queued ones would never start
+            if pending and sum(not f.done() for f in abandoned) >= workers:
+                for ticker in list(pending.values()):
+                    yield ticker, None, f"Forecast for {ticker} did not start: all workers are busy."
+                pending.clear()
+    finally:
+        # Timed-out threads cannot be interrupted; stop waiting for them and drop queued work
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,124 @@
+"""
+Market-cap-weighted sector indices for every sector at once.
+
+Companies are grouped into sectors by the first three digits of their SimFin
+IndustryId (e.g. 103005 -> 103, Consumer Cyclical). Each sector's index starts
+at 100 and moves every day by the return of its constituents weighted by the
+previous day's market cap (Close x Shares Outstanding). Tickers that list or
+delist part-way only count on days when they have a previous close, so the
+index does not jump when the constituents change.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import timed
+
+SECTOR_NAMES = {
+    100: 'Industrials',
+    101: 'Technology',
+    102: 'Consumer Defensive',
+    103: 'Consumer Cyclical',
+    104: 'Financial Services',
+    105: 'Utilities',
+    106: 'Healthcare',
+    107: 'Energy',
+    108: 'Business Services',
+    109: 'Real Estate',
+    110: 'Basic Materials',
+    111: 'Other',
+}
+
+INDEX_COLUMNS = ['Sector', 'Date', 'Index', 'Return', 'Market_Cap', 'Constituents']
+
+
+def sector_of(industry_id):
+    """
+    Return the sector code of an IndustryId (a scalar or a Series).
+    """
+    return industry_id // 1000
+
+
+def sector_name(sector):
+    """
+    Return the display name of a sector code.
+    """
+    return SECTOR_NAMES.get(int(sector), f"Sector {sector}")
+
+
+def sector_members(companies):
+    """
+    Map every company with an IndustryId to its sector.
+
+    Args:
+        companies (pd.DataFrame): The company table, with Ticker, Company Name and IndustryId.
+
+    Returns:
+        pd.DataFrame: Ticker, Company Name and Sector, sorted by Sector and Ticker.
+    """
+    members = companies.dropna(subset=['IndustryId'])[['Ticker', 'Company Name', 'IndustryId']].copy()
+    members['Sector'] = sector_of(members['IndustryId'].astype(np.int64))
+    return members.drop(columns='IndustryId').sort_values(['Sector', 'Ticker']).reset_index(drop=True)
+
+
+@timed('sector.aggregate')
+def compute_sector_indices(prices, companies, base=100.0):
+    """
+    Compute the daily index series of every sector in one pass.
+
+    Args:
+        prices (pd.DataFrame): Share prices with Ticker, Date, Close and Shares Outstanding.
+        companies (pd.DataFrame): The company table, with Ticker and IndustryId.
+        base (float): Index level on each sector's first day.
+
+    Returns:
+        pd.DataFrame: One row per sector and date with the index level, its daily
+            return, the sector's total market cap and its number of constituents,
+            sorted by Sector and Date.
+    """
+    sectors = sector_members(companies).set_index('Ticker')['Sector']
+    df = prices[['Ticker', 'Date', 'Close', 'Shares Outstanding']].copy()
+    df['Sector'] = df['Ticker'].map(sectors)
+    df = df.dropna(subset=['Sector', 'Close']).sort_values(['Ticker', 'Date'], kind='stable')
+    df['Sector'] = df['Sector'].astype(np.int64)
+
+    df['Market_Cap'] = df['Close'] * df['Shares Outstanding']
+    prev_close = df.groupby('Ticker', observed=True)['Close'].shift()
+    prev_cap = df.groupby('Ticker', observed=True)['Market_Cap'].shift()
+    # Each ticker's price return carries its previous market cap as weight; a first day carries none
+    weighted = (df['Close'] / prev_close - 1) * prev_cap
+    df['Weighted_Return'] = weighted.fillna(0.0)
+    df['Prev_Cap'] = prev_cap.where(weighted.notna(), 0.0)
+
+    daily = df.groupby(['Sector', 'Date']).agg(
+        Weighted_Return=('Weighted_Return', 'sum'),
+        Prev_Cap=('Prev_Cap', 'sum'),
+        Market_Cap=('Market_Cap', 'sum'),
+        Constituents=('Ticker', 'size'),
+    ).reset_index()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        daily['Return'] = np.where(daily['Prev_Cap'] > 0, daily['Weighted_Return'] / daily['Prev_Cap'], 0.0)
+    daily['Index'] = base * (1 + daily['Return']).groupby(daily['Sector']).cumprod()
+    return daily[INDEX_COLUMNS]
+
+
+def movement(index, start, end=None):
+    """
+    Return the percentage change of one sector's index between two dates.
+
+    Args:
+        index (pd.DataFrame): One sector's rows of `compute_sector_indices`, sorted by Date.
+        start: The first date of the period; the change is measured from the last
+            index level on or before it.
+        end: The last date of the period. Defaults to the latest date.
+
+    Returns:
+        float: The change in percent, or NaN if the period has no data.
+    """
+    dates = index['Date'].values
+    levels = index['Index'].values
+    end_pos = len(dates) - 1 if end is None else np.searchsorted(dates, np.datetime64(end), side='right') - 1
+    start_pos = max(np.searchsorted(dates, np.datetime64(start), side='right') - 1, 0)
+    if end_pos < 0 or end_pos < start_pos:
+        return float('nan')
+    return (levels[end_pos] / levels[start_pos] - 1) * 100
@@ -0,0 +1,338 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils import indicators
+from utils.price_store import PriceStore
+
+
+def rolling_quantiles(values, window, quantiles):
+    """
+    Rolling quantiles with linear interpolation, matching Series.rolling(window).quantile(q).
+
+    Every window is sorted once and all quantiles are read from the sorted rows.
+    Windows that are incomplete or contain NaN give NaN.
+
+    Args:
+        values (np.ndarray): 1-D float array.
+        window (int): Window size.
+        quantiles (list): Quantiles between 0 and 1.
+
+    Returns:
+        list: One array per quantile, the same length as `values`.
+    """
+    results = [np.full(len(values), np.nan) for _ in quantiles]
+    if len(values) < window:
+        return results
+
+    windows = np.sort(sliding_window_view(values, window), axis=1)
+    has_nan = np.isnan(windows[:, -1])  # NaN sorts last
+    for result, q in zip(results, quantiles):
+        position = q * (window - 1)
+        low = int(np.floor(position))
+        high = min(low + 1, window - 1)
+        fraction = position - low
+        quantile = windows[:, low] + (windows[:, high] - windows[:, low]) * fraction
+        quantile[has_nan] = np.nan
+        result[window - 1:] = quantile
+    return results
+
+
+class SharePriceProcessor:
+    """
+    A class to process, transform, and save share price data.
+    """
+
+    # Rows of processed history per ticker needed to recompute the derived
+    # columns of a new row: one previous close for Price_Change, and the
+    # changes of the 4 rows before it for the 5-day rolling percentiles.
+    TAIL_ROWS = 5
+
+    def __init__(self, filepath='utils/data/raw/de_share_prices_data_RAW.csv', store=None):
+        """
+        Initialize the processor with the path to the raw data.
+
+        Args:
+            filepath (str): Path to the raw share price CSV, or a raw Parquet dataset directory.
+            store (PriceStore): Columnar store the processed data is written to.
+        """
+        self.filepath = filepath
+        self.store = store if store is not None else PriceStore()
+        self.raw_prices = None
+        self.mode_shares = None
+
+    def load_data(self):
+        """
+        Load the raw share price data from the file, or from a Parquet dataset
+        written by SimFinAPI.stream_process_and_save if the path is a directory.
+        """
+        if os.path.isdir(self.filepath):
+            self.raw_prices = PriceStore(self.filepath).read()
+            return
+        self.raw_prices = pd.read_csv(self.filepath)
+        self.raw_prices['Date'] = pd.to_datetime(self.raw_prices['Date'])
+
+    def extract_date_features(self, df):
+        """
+        Extract features from the Date column.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the Date column.
+        """
+        df['Day_of_Week'] = df['Date'].dt.day_name()
+        df['Month'] = df['Date'].dt.month
+        df['Year'] = df['Date'].dt.year
+        df['Day_of_Month'] = df['Date'].dt.day
+
+    def drop_columns(self):
+        """
+        Drop unnecessary columns from the data.
+        """
+        if 'Dividend' in self.raw_prices.columns:
+            self.raw_prices = self.raw_prices.drop(columns=['Dividend'])
+
+    def calculate_mode_shares(self):
+        """
+        Calculate the mode of Shares Outstanding grouped by Ticker, Year, and Month.
+
+        Ties are broken towards the smallest value, as Series.mode() does.
+        """
+        keys = ['Ticker', 'Year', 'Month']
+        counts = (
+            self.raw_prices.groupby(keys + ['Shares Outstanding']).size()
+            .reset_index(name='count')
+            .sort_values(keys + ['count', 'Shares Outstanding'], ascending=[True, True, True, False, True])
+            .drop_duplicates(keys)
+            .set_index(keys)['Shares Outstanding']
+        )
+        # Groups where every value is missing have no mode
+        groups = self.raw_prices.groupby(keys).size().index
+        self.mode_shares = counts.reindex(groups)
+
+    def fill_missing_values(self):
+        """
+        Fill missing values in the DataFrame using forward fill and backward fill.
+        """
+        self.raw_prices.ffill(inplace=True)
+        self.raw_prices.bfill(inplace=True)
+
+    def transform_data(self):
+        """
+        Transforms the data by handling missing values, creating a percentage change
+        column, categorizing price movements, and extracting features from the Date column.
+        """
+        try:
+            # Fill missing values
+            self.fill_missing_values()
+
+            # Extract features from Date
+            self.extract_date_features(self.raw_prices)
+
+            # Initialize rolling window size
+            rolling_window = 5
+
+            # Sort so each ticker's rows are contiguous and in date order
+            df = self.raw_prices.sort_values(['Ticker', 'Date'], kind='stable').reset_index(drop=True)
+            first_of_ticker = df['Ticker'].ne(df['Ticker'].shift())
+
+            # Calculate percentage change, restarting at every ticker
+            close = df['Close']
+            price_change = (close / close.shift(1) - 1) * 100
+            price_change[first_of_ticker] = float('nan')
+            df['Price_Change'] = price_change
+
+            # Calculate rolling percentiles over the whole column at once. Each ticker
+            # starts with a NaN change, so any window that crosses into the previous
+            # ticker is NaN, exactly as a per-ticker rolling window would be.
+            p25, p50, p75 = rolling_quantiles(price_change.to_numpy(), rolling_window, [0.25, 0.50, 0.75])
+            df['25th_Percentile'] = p25
+            df['50th_Percentile'] = p50
+            df['75th_Percentile'] = p75
+
+            # Categorize each change; comparisons with NaN are False, so NaN rows become 'High Fall'
+            df['Category'] = np.select(
+                [
+                    price_change >= p75,
+                    (p50 <= price_change) & (price_change < p75),
+                    (-0.5 <= price_change) & (price_change <= 0.5),
+                    (p25 <= price_change) & (price_change < p50),
+                ],
+                ['High Rise', 'Low Rise', 'Stay', 'Low Fall'],
+                default='High Fall',
+            ).astype(object)
+
+            self.raw_prices = df
+
+        except Exception as e:
+            print(f"Error during transformation: {e}")
+
+    def save_data(self, csv_path='utils/data/processed/de_share_prices_processed.csv'):
+        """
+        Save the transformed data into the columnar price store, with its
+        technical indicators, and optionally a CSV file.
+
+        Args:
+            csv_path (str): Where to also write a CSV export. Skipped if None.
+        """
+        try:
+            self.store.write(self.raw_prices)
+            self.save_state(self.raw_prices)
+            indicators.build_indicators(self.raw_prices, self.store.root)
+            print(f"Transformed data saved to {self.store.root}")
+            if csv_path:
+                self.raw_prices.to_csv(csv_path, index=False)
+                print(f"Transformed data saved to {csv_path}")
+        except Exception as e:
+            print(f"Error during saving: {e}")
+
+    @property
+    def state_path(self):
+        """
+        Path of the file holding the last TAIL_ROWS processed rows of every ticker.
+        """
+        return self.store.root + '_tail.parquet'
+
+    def save_state(self, processed):
+        """
+        Save the last TAIL_ROWS rows of every ticker, used by process_incremental.
+
+        Args:
+            processed (pd.DataFrame): Processed rows, sorted by Ticker and Date.
+        """
+        tail = processed.groupby('Ticker', sort=False).tail(self.TAIL_ROWS)
+        tail.to_parquet(self.state_path, index=False)
+
+    def process_data(self):
+        """
+        Run all processing steps on the raw data and save the transformed data.
+        """
+        self.load_data()
+        self.extract_date_features(self.raw_prices)
+        self.drop_columns()
+        self.calculate_mode_shares()
+        self.fill_missing_values()
+        self.transform_data()
+        self.save_data()
+
+    def process_incremental(self, csv_path='utils/data/processed/de_share_prices_processed.csv'):
+        """
+        Process only the (Ticker, Date) rows that are newer than the last run and
+        append them to the price store and the CSV export. Their technical
+        indicators are streamed from the saved indicator state.
+
+        Each ticker's new rows are transformed together with its saved tail of
+        processed rows, which carries the forward-fill values, the previous close
+        and the rolling window. Falls back to process_data when there is no saved
+        state or the raw data contains a ticker that has not been processed yet.
+
+        Args:
+            csv_path (str): CSV export written by save_data, to append the new rows
+                to. Skipped if None.
+        """
+        if not self.store.exists() or not os.path.exists(self.state_path):
+            print("No previous run found. Running a full rebuild.")
+            self.process_data()
+            return
+
+        self.load_data()
+        self.extract_date_features(self.raw_prices)
+        self.drop_columns()
+
+        state = pd.read_parquet(self.state_path)
+        last_dates = state.groupby('Ticker')['Date'].max()
+        if not self.raw_prices['Ticker'].isin(last_dates.index).all():
+            print("New tickers found. Running a full rebuild.")
+            self.process_data()
+            return
+
+        last_date = self.raw_prices['Ticker'].map(last_dates)
+        new_rows = self.raw_prices[self.raw_prices['Date'] > last_date]
+        if new_rows.empty:
+            print("No new rows to process.")
+            return
+
+        # Prepend each affected ticker's saved tail, without its derived columns
+        context = state[state['Ticker'].isin(new_rows['Ticker'].unique())][new_rows.columns]
+        self.raw_prices = (
+            pd.concat([context, new_rows], ignore_index=True)
+            .sort_values(['Ticker', 'Date'], kind='stable')
+            .reset_index(drop=True)
+        )
+        self.fill_missing_values()
+        self.transform_data()
+
+        processed = self.raw_prices
+        appended = processed[processed['Date'] > processed['Ticker'].map(last_dates)]
+        self.store.append(appended)
+        if os.path.exists(indicators.state_path(self.store.root)):
+            indicators.append_indicators(appended, self.store.root)
+        else:
+            indicators.build_indicators(self.store.read(), self.store.root)
+
+        if csv_path:
+            self.append_csv(appended, csv_path)
+
+        merged_state = pd.concat([state, appended], ignore_index=True).sort_values(['Ticker', 'Date'], kind='stable')
+        self.save_state(merged_state)
+        print(f"Appended {len(appended)} new rows for {appended['Ticker'].nunique()} tickers to {self.store.root}")
+
+    def append_csv(self, rows, csv_path):
+        """
+        Append processed rows to the CSV export, in its column order. The new rows
+        go at the end of the file, after every ticker's older rows. Writes the
+        whole store if the export does not exist yet.
+
+        Args:
+            rows (pd.DataFrame): Processed rows that were just added to the store.
+            csv_path (str): Path of the CSV export.
+        """
+        if not os.path.exists(csv_path):
+            self.store.read().to_csv(csv_path, index=False)
+        else:
+            columns = pd.read_csv(csv_path, nrows=0).columns
+            rows.reindex(columns=columns).to_csv(csv_path, mode='a', header=False, index=False)
+        print(f"Transformed data saved to {csv_path}")
+
+    def check_consistency(self):
+        """
+        Rebuild the processed data from scratch in memory and compare it with the store.
+
+        Returns:
+            bool: True if the store matches a full rebuild exactly.
+        """
+        rebuild = SharePriceProcessor(self.filepath, self.store)
+        rebuild.load_data()
+        rebuild.extract_date_features(rebuild.raw_prices)
+        rebuild.drop_columns()
+        rebuild.fill_missing_values()
+        rebuild.transform_data()
+        expected = rebuild.raw_prices
+
+        stored = self.store.read()[expected.columns]
+        try:
+            pd.testing.assert_frame_equal(stored, expected, check_dtype=False)
+        except AssertionError as e:
+            print(f"Price store differs from a full rebuild: {e}")
+            return False
+        print("Price store matches a full rebuild.")
+        return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process raw share prices into the price store.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only process rows newer than the last run and append them")
+    parser.add_argument('--check', action='store_true',
+                        help="afterwards, compare the store with a full rebuild")
+    args = parser.parse_args()
+
+    processor = SharePriceProcessor()
+    if args.incremental:
+        processor.process_incremental()
+    else:
+        processor.process_data()
+    if args.check:
+        processor.check_consistency()
@@ -0,0 +1,160 @@
+"""
+Sliding-window samples for the LSTM models without copying the price history.
+
+A sample is the `sequence_length` scaled closes before day i (the input) and
+the close of day i (the target). The windows are strided views over the 1-D
+series, and the tf.data pipelines only carry window start offsets, gathering
+each batch's windows from the series when the batch is needed. Neither ever
+builds the full (samples, sequence_length, 1) tensor.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(series, sequence_length=50):
+    """
+    Return every input window and its target as views of the series.
+
+    Args:
+        series (np.ndarray): 1-D scaled closes.
+        sequence_length (int): Window length.
+
+    Returns:
+        tuple: X with shape (n, sequence_length) and y with shape (n,), where
+            n = len(series) - sequence_length. Both share memory with `series`.
+    """
+    series = np.asarray(series).reshape(-1)
+    X = sliding_window_view(series[:-1], sequence_length)
+    y = series[sequence_length:]
+    return X, y
+
+
+def split_bounds(n_samples, train=0.70, test=0.20):
+    """
+    Return the train, test and validation sample ranges, in time order.
+
+    Matches the model generator's split: the first 70% of windows train, the
+    next 20% test and the remaining 10% validate.
+
+    Returns:
+        tuple: Three (start, stop) pairs.
+    """
+    train_size = int(n_samples * train)
+    test_size = int(n_samples * test)
+    return (0, train_size), (train_size, train_size + test_size), (train_size + test_size, n_samples)
+
+
+def split_windows(series, sequence_length=50):
+    """
+    Split the windows of one series 70/20/10 into train, test and validation views.
+
+    Returns:
+        tuple: X_train, y_train, X_test, y_test, X_val, y_val, each X shaped
+            (n, sequence_length, 1). All are views of `series`.
+    """
+    X, y = sliding_windows(series, sequence_length)
+    X = X[..., np.newaxis]
+    out = []
+    for start, stop in split_bounds(len(X)):
+        out.extend([X[start:stop], y[start:stop]])
+    return tuple(out)
+
+
+def window_dataset(series, starts, sequence_length=50, batch_size=32, shuffle=False, seed=None):
+    """
+    Build a tf.data pipeline of (window, target) batches gathered from a 1-D series.
+
+    Args:
+        series (np.ndarray): 1-D scaled closes. Several tickers may be concatenated
+            as long as `starts` never lets a window cross from one into the next.
+        starts (np.ndarray): Index of the first input value of every window to use.
+        sequence_length (int): Window length.
+        batch_size (int): Samples per batch.
+        shuffle (bool): Shuffle the window order every epoch.
+        seed (int): Shuffle seed.
+
+    Returns:
+        tf.data.Dataset: Batches of inputs shaped (batch, sequence_length, 1) and targets shaped (batch,).
+    """
+    import tensorflow as tf
+
+    values = tf.constant(np.asarray(series, dtype=np.float32).reshape(-1))
+    offsets = tf.range(sequence_length, dtype=tf.int64)
+
+    dataset = tf.data.Dataset.from_tensor_slices(np.asarray(starts, dtype=np.int64))
+    if shuffle:
+        dataset = dataset.shuffle(len(starts), seed=seed, reshuffle_each_iteration=True)
+
+    def gather(batch_starts):
+        inputs = tf.gather(values, batch_starts[:, None] + offsets)[..., None]
+        targets = tf.gather(values, batch_starts + sequence_length)
+        return inputs, targets
+
+    return dataset.batch(batch_size).map(gather, num_parallel_calls=tf.data.AUTOTUNE).prefetch(tf.data.AUTOTUNE)
+
+
+def split_starts(n_values, sequence_length=50, offset=0):
+    """
+    Return the window start indices of one series, split 70/20/10.
+
+    Args:
+        n_values (int): Length of the series.
+        sequence_length (int): Window length.
+        offset (int): Position of the series inside a concatenated array.
+
+    Returns:
+        tuple: Train, test and validation start index arrays.
+    """
+    n_samples = max(n_values - sequence_length, 0)
+    return tuple(np.arange(start, stop, dtype=np.int64) + offset
+                 for start, stop in split_bounds(n_samples))
+
+
+def multi_ticker_starts(lengths, sequence_length=50):
+    """
+    Return the window start indices of several series concatenated end to end.
+
+    Each series is split 70/20/10 on its own (see split_starts), so every split
+    covers the same period share of every ticker, and no window spans two series.
+
+    Args:
+        lengths (list): Length of each series, in concatenation order.
+        sequence_length (int): Window length.
+
+    Returns:
+        tuple: Train, test and validation start index arrays into the concatenated series.
+    """
+    splits = ([], [], [])
+    offset = 0
+    for n_values in lengths:
+        for split, starts in zip(splits, split_starts(n_values, sequence_length, offset)):
+            split.append(starts)
+        offset += n_values
+    return tuple(np.concatenate(split) if split else np.empty(0, dtype=np.int64) for split in splits)
+
+
+def multi_ticker_datasets(series_list, sequence_length=50, batch_size=32, seed=None):
+    """
+    Build train, test and validation pipelines over many tickers at once.
+
+    The series are concatenated once (one float32 value per day) and the
+    pipelines carry only window starts, so memory grows with the number of
+    days, not days times window length. The training windows of all tickers
+    are shuffled together, so every batch mixes tickers.
+
+    Args:
+        series_list (list): One 1-D scaled close array per ticker.
+        sequence_length (int): Window length.
+        batch_size (int): Samples per batch.
+        seed (int): Shuffle seed for the training windows.
+
+    Returns:
+        tuple: train, test and validation tf.data.Dataset objects.
+    """
+    series = np.concatenate([np.asarray(s, dtype=np.float32).reshape(-1) for s in series_list])
+    train, test, val = multi_ticker_starts([len(s) for s in series_list], sequence_length)
+    return (
+        window_dataset(series, train, sequence_length, batch_size, shuffle=True, seed=seed),
+        window_dataset(series, test, sequence_length, batch_size),
+        window_dataset(series, val, sequence_length, batch_size),
+    )
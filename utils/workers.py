@@ -0,0 +1,29 @@
+"""
+Setup shared by the process pools of the training, evaluation and backtest jobs.
+"""
+import os
+
+
+def init_worker(threads, tensorflow=False):
+    """
+    Caps the BLAS and TensorFlow threads of a worker process, so the workers do not oversubscribe the cores.
+
+    Use it as the pool's initializer.
+
+    Args:
+        threads (int): Threads each worker may use.
+        tensorflow (bool): Also import TensorFlow and set its thread pools now,
+            for workers that build models. Otherwise only the environment is set,
+            which TensorFlow reads if the worker imports it later.
+    """
+    from threadpoolctl import threadpool_limits
+
+    # NumPy is already loaded in the worker, so its BLAS pool is capped at runtime
+    init_worker.limits = threadpool_limits(limits=threads)
+    os.environ["TF_NUM_INTRAOP_THREADS"] = str(threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    if tensorflow:
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)